@@ -12,6 +12,11 @@ from agents.devops.root_cause_analyst import RootCauseAnalystAgent
 from agents.devops.fix_engineer import FixEngineerAgent
 
 
+# Fixes are validated by a follow-up task once the system has had time to settle
+VALIDATION_DELAY_SECONDS = 120
+HEALING_LOCK_TIMEOUT_SECONDS = 600
+
+
 class AutonomousCoordinator:
     """
     David Chen, CTO - Technical Coordinator
@@ -30,7 +35,25 @@ class AutonomousCoordinator:
         self.fix_engineer = FixEngineerAgent()
 
     def run_autonomous_healing(self) -> Dict:
-        """Execute full autonomous self-healing workflow"""
+        """
+        Execute full autonomous self-healing workflow
+        Only one run at a time across workers and the API - overlapping runs are skipped
+        """
+        # Imported here: tasks.celery_app imports monitoring_tasks, which imports this module
+        from tasks.locks import distributed_lock
+
+        with distributed_lock("autonomous_healing", timeout=HEALING_LOCK_TIMEOUT_SECONDS) as acquired:
+            if not acquired:
+                print(f"⏭️  Autonomous healing already running elsewhere - skipping\n")
+                return {
+                    "status": "skipped",
+                    "reason": "Another healing run is in progress",
+                    "timestamp": datetime.utcnow().isoformat()
+                }
+            return self._run_healing_workflow()
+
+    def _run_healing_workflow(self) -> Dict:
+        """Health check -> error analysis -> root cause -> fixes (caller holds the healing lock)"""
         print(f"\n{'*'*80}")
         print(f"🤖 AUTONOMOUS SELF-HEALING SYSTEM")
         print(f"   Coordinator: {self.name}, CTO")
@@ -96,8 +119,8 @@ class AutonomousCoordinator:
                         # Log the fix details
                         self._log_fix_details(root_cause, fix, apply_result)
 
-                        # Monitor for 2 minutes
-                        validation = self._validate_fix(fix, apply_result)
+                        # Validate in a follow-up task once the system has settled
+                        validation = self._schedule_validation(fix, apply_result)
 
                         fix_results.append({
                             "root_cause": root_cause,
@@ -144,16 +167,33 @@ class AutonomousCoordinator:
             "timestamp": datetime.utcnow().isoformat()
         }
 
-    def _validate_fix(self, fix: Dict, apply_result: Dict) -> Dict:
-        """Validate fix after application"""
-        print(f"\n   ⏳ Validating fix for 2 minutes...")
+    def _schedule_validation(self, fix: Dict, apply_result: Dict) -> Dict:
+        """Queue validation of an applied fix instead of sleeping in this worker"""
+        try:
+            from tasks.celery_app import celery_app  # Lazy: see run_autonomous_healing
+            task = celery_app.send_task(
+                'tasks.monitoring_tasks.validate_fix_task',
+                args=[fix, apply_result],
+                countdown=VALIDATION_DELAY_SECONDS
+            )
+        except Exception as e:
+            print(f"   ⚠️  Could not schedule fix validation: {str(e)}")
+            return {"status": "not_scheduled", "error": str(e)}
+
+        print(f"\n   ⏳ Validation scheduled in {VALIDATION_DELAY_SECONDS // 60} minutes (task {task.id})")
+        return {
+            "status": "scheduled",
+            "task_id": task.id,
+            "validate_after_seconds": VALIDATION_DELAY_SECONDS
+        }
 
-        # Wait 2 minutes for system to stabilize
+    def validate_fix(self, fix: Dict, apply_result: Dict) -> Dict:
+        """Validate fix after application (runs once the validation delay has passed)"""
+        print(f"\n   ⏳ Validating fix: {fix.get('fix_type', 'unknown')}...")
         validation_start = time.time()
-        time.sleep(120)
 
-        # Check for new errors
-        health_check = self.health_monitor.perform_health_check()
+        # Check for new errors - peek only, the next healing run still has to see them
+        health_check = self.health_monitor.perform_health_check(consume_logs=False)
 
         # Compare error counts
         new_error_count = len(health_check["errors"]["errors"])
@@ -2,10 +2,11 @@
 Sarah Mitchell, MS - Error Detection Specialist Agent
 Analyzes error patterns and categorizes issues
 """
-import re
 from typing import Dict, List
 from datetime import datetime
 
+from monitoring.error_clusters import ErrorClusterStore
+
 
 class ErrorDetectorAgent:
     """
@@ -17,6 +18,7 @@ class ErrorDetectorAgent:
     def __init__(self):
         self.name = "Sarah Mitchell"
         self.role = "Error Detection Specialist"
+        self.error_clusters = ErrorClusterStore()
 
     def analyze_errors(self, errors: List[Dict]) -> Dict:
         """Analyze and categorize errors"""
@@ -265,46 +267,29 @@ class ErrorDetectorAgent:
         return {k: len(v) for k, v in categories.items() if v}
 
     def _find_patterns(self, errors: List[Dict]) -> List[Dict]:
-        """Find recurring error patterns"""
+        """
+        Find recurring error patterns
+        Each error is folded into the persisted template clusters, so patterns
+        recur across runs: a cluster is reported when it appears 3+ times in this
+        batch, or when it was already known and shows up again.
+        """
         patterns = []
 
-        # Group by error message similarity
-        message_groups = {}
-        for error in errors:
-            # Extract key parts of error message
-            msg = error.get("message", "")
-
-            # Find base pattern
-            base_pattern = self._extract_base_pattern(msg)
-
-            if base_pattern not in message_groups:
-                message_groups[base_pattern] = []
-
-            message_groups[base_pattern].append(error)
-
-        # Find patterns that occur multiple times
-        for pattern, occurrences in message_groups.items():
-            if len(occurrences) >= 3:  # Pattern appears 3+ times
+        for entry in self.error_clusters.ingest(errors):
+            cluster, batch_count = entry["cluster"], entry["batch_count"]
+            if batch_count >= 3 or (cluster["count"] >= 3 and cluster["count"] > batch_count):
                 patterns.append({
-                    "pattern": pattern,
-                    "occurrences": len(occurrences),
-                    "severity": occurrences[0].get("severity", "error"),
-                    "first_seen": occurrences[0].get("timestamp"),
-                    "last_seen": occurrences[-1].get("timestamp")
+                    "cluster_id": cluster["id"],
+                    "pattern": " ".join(cluster["template"])[:100],
+                    "occurrences": batch_count,
+                    "total_occurrences": cluster["count"],
+                    "severity": cluster.get("severity", "error"),
+                    "first_seen": cluster.get("first_seen"),
+                    "last_seen": cluster.get("last_seen")
                 })
 
         return sorted(patterns, key=lambda x: x["occurrences"], reverse=True)
 
-    def _extract_base_pattern(self, message: str) -> str:
-        """Extract base error pattern from message"""
-        # Remove specific values (numbers, URLs, etc.)
-        pattern = re.sub(r'\d+', 'N', message)
-        pattern = re.sub(r'http[s]?://\S+', 'URL', pattern)
-        pattern = re.sub(r'/[/\w\-\.]+', 'PATH', pattern)
-
-        # Keep first 100 chars
-        return pattern[:100]
-
     def _prioritize_issues(self, categories: Dict, patterns: List[Dict]) -> List[Dict]:
         """Prioritize issues that need fixing"""
         priority_issues = []
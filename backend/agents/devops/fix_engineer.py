@@ -6,9 +6,16 @@ import os
 import shutil
 import re
 import requests
+import threading
 from typing import Dict, List
 from datetime import datetime
 
+from monitoring.docker_client import get_docker_client
+
+
+# Restarted after a fix that changes code; the Celery worker applying the fix restarts itself, so it is last
+RESTART_CONTAINERS = ["product-trend-backend", "product-trend-celery"]
+
 
 class FixEngineerAgent:
     """
@@ -135,15 +142,9 @@ class FixEngineerAgent:
     def _detect_short_column(self) -> dict:
         """Detect which column is too short from PostgreSQL logs"""
         try:
-            import subprocess
-            result = subprocess.run(
-                ["docker", "logs", "--tail", "100", "product-trend-db"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            stdout, stderr = get_docker_client().logs("product-trend-db", tail=100)
 
-            logs = result.stdout + result.stderr
+            logs = stdout + stderr
 
             # Look for "value too long for type character varying(50)"
             import re
@@ -245,15 +246,9 @@ class FixEngineerAgent:
         """Detect which model is deprecated from error logs"""
         try:
             # Read recent celery logs
-            import subprocess
-            result = subprocess.run(
-                ["docker", "logs", "--tail", "200", "product-trend-celery"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            stdout, stderr = get_docker_client().logs("product-trend-celery", tail=200)
 
-            logs = result.stdout + result.stderr
+            logs = stdout + stderr
 
             # Look for model deprecation patterns
             patterns = [
@@ -785,16 +780,14 @@ class FixEngineerAgent:
             print(f"      {old_length} → {new_length} characters")
 
             # Run ALTER TABLE via docker exec psql
-            import subprocess
             alter_sql = f"ALTER TABLE {table} ALTER COLUMN {column} TYPE VARCHAR({new_length});"
 
-            result = subprocess.run([
-                "docker", "exec", "product-trend-db",
+            exit_code, _, stderr = get_docker_client().exec_run("product-trend-db", [
                 "psql", "-U", "postgres", "-d", "product_trends",
                 "-c", alter_sql
-            ], capture_output=True, text=True, timeout=30)
+            ], timeout=30)
 
-            if result.returncode == 0:
+            if exit_code == 0:
                 print(f"   ✓ Column altered successfully!")
 
                 return {
@@ -807,10 +800,10 @@ class FixEngineerAgent:
                     "restart_required": False  # Database schema changes don't require Celery restart
                 }
             else:
-                print(f"   ❌ ALTER TABLE failed: {result.stderr}")
+                print(f"   ❌ ALTER TABLE failed: {stderr}")
                 return {
                     "status": "error",
-                    "reason": result.stderr[:200]
+                    "reason": stderr[:200]
                 }
 
         except Exception as e:
@@ -1008,23 +1001,30 @@ class FixEngineerAgent:
         print(f"   ⏰ Restart will occur in 3 minutes (after validation)")
 
         try:
-            # Schedule delayed restart using 'at' command or background process
-            # This allows the current task to complete logging and validation first
-            import subprocess
-
-            # Run restart in background with 180 second delay (3 minutes)
-            # This gives time for:
+            # Delayed restart on a background timer so the current task can
+            # finish logging and validation first:
             # - Logging (instant)
             # - Validation (120 seconds)
             # - Buffer (60 seconds)
-            restart_cmd = "sleep 180 && docker restart product-trend-celery product-trend-backend &"
-            subprocess.Popen(restart_cmd, shell=True)
+            timer = threading.Timer(180, self._restart_containers, args=(RESTART_CONTAINERS,))
+            timer.daemon = True
+            timer.start()
 
             print(f"   ✓ Delayed restart scheduled")
 
         except Exception as e:
             print(f"   ⚠️  Service restart scheduling failed: {str(e)}")
 
+    @staticmethod
+    def _restart_containers(containers: List[str]):
+        """Restart containers via the Docker API (this worker's own container goes last)"""
+        client = get_docker_client()
+        for container in containers:
+            try:
+                client.restart(container)
+            except Exception as e:
+                print(f"   ⚠️  Restart of {container} failed: {str(e)}")
+
     def _print_fix(self, fix: Dict):
         """Print fix details"""
         print(f"💡 Fix Generated:")
@@ -6,6 +6,8 @@ from typing import Dict, List
 from datetime import datetime
 from monitoring.health_checker import HealthChecker
 from monitoring.log_parser import LogParser
+from monitoring.log_tailer import LogIngester
+from monitoring.error_rates import get_error_rate_tracker
 from monitoring.metrics_collector import MetricsCollector
 
 
@@ -21,10 +23,15 @@ class HealthMonitorAgent:
         self.role = "System Health Monitor"
         self.health_checker = HealthChecker()
         self.log_parser = LogParser()
+        self.log_ingester = LogIngester()
         self.metrics_collector = MetricsCollector()
 
-    def perform_health_check(self) -> Dict:
-        """Perform comprehensive health check"""
+    def perform_health_check(self, consume_logs: bool = True) -> Dict:
+        """
+        Perform comprehensive health check
+        consume_logs=False reads new log errors without advancing the shared cursors
+        (fix validation must not hide errors from the next healing run)
+        """
         print(f"\n{'='*70}")
         print(f"🔍 [{self.role}] {self.name}, PhD")
         print(f"   Performing system health check...")
@@ -33,7 +40,7 @@ class HealthMonitorAgent:
         # Collect all data
         health_status = self.health_checker.check_all()
         metrics = self.metrics_collector.collect_all_metrics()
-        errors = self.log_parser.get_all_errors(since_minutes=5)
+        errors = self._collect_new_errors(consume_logs)
 
         # Analyze
         analysis = self._analyze_system_state(health_status, metrics, errors)
@@ -53,6 +60,29 @@ class HealthMonitorAgent:
 
         return report
 
+    def _collect_new_errors(self, consume: bool = True) -> Dict:
+        """Errors from log lines written since the previous check (cursor-based, no overlap)"""
+        new_errors = self.log_ingester.poll() if consume else self.log_ingester.peek()
+        # A committing poll fed these errors into the shared counters; use their history when
+        # they are shared across processes, otherwise judge the batch on its own
+        tracker = get_error_rate_tracker()
+        return {
+            "errors": new_errors,
+            "analysis": self.log_parser.analyze_error_patterns(
+                new_errors, tracker if consume and tracker.shared else None
+            ),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+    def get_recent_errors(self, since_minutes: int = 5) -> Dict:
+        """Errors from the ingest ring buffer for the last N minutes (does not read logs)"""
+        errors = self.log_ingester.recent_errors(since_minutes)
+        return {
+            "errors": errors,
+            "analysis": self.log_parser.analyze_error_patterns(errors),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
     def _analyze_system_state(self, health: Dict, metrics: Dict, errors: Dict) -> Dict:
         """Analyze overall system state"""
         issues = []
@@ -76,6 +106,16 @@ class HealthMonitorAgent:
             })
             severity = "critical"
 
+        # Error types running well above their hourly baseline
+        for spike in errors["analysis"].get("spikes", [])[:3]:
+            issues.append({
+                "type": "error_spike",
+                "severity": "warning",
+                "message": f"Error spike: {spike['error_type']} in {spike['source']} at "
+                           f"{spike['per_minute_5m']}/min (baseline {spike['per_minute_baseline']}/min)",
+                "error_type": spike["error_type"]
+            })
+
         # Check metrics
         threshold_check = self.metrics_collector.check_thresholds(metrics)
         if threshold_check["has_alerts"]:
@@ -1,13 +1,79 @@
 """
 Learning engine that improves fix confidence over time
 Tracks success/failure of applied fixes
+
+The JSONL knowledge base is append-only; an aggregated index of
+(issue_type, fix_type) -> counters is built from it once per process and then
+only advanced over lines appended since, so scoring a fix is O(1) however long
+the history is. Old records are periodically compacted into summary lines.
 """
+import fcntl
 import json
 import os
-from typing import Dict, List
+from typing import Dict, Tuple
 from datetime import datetime
 
 
+# Compact once the log grows past this many lines, keeping the newest raw records
+COMPACT_THRESHOLD_LINES = 5000
+COMPACT_KEEP_RECENT = 500
+
+
+class _KnowledgeIndex:
+    """Counters per (issue_type, fix_type), advanced incrementally from a file offset"""
+
+    def __init__(self):
+        self.counters: Dict[Tuple[str, str], Dict[str, int]] = {}
+        self.lines = 0
+        self.offset = 0
+        self.inode = None
+
+    def reset(self) -> None:
+        self.__init__()
+
+    def add(self, record: Dict) -> None:
+        key = (record.get("issue_type"), record.get("fix_type"))
+        counter = self.counters.setdefault(key, {"total": 0, "successes": 0})
+        if record.get("compacted"):
+            counter["total"] += record["total"]
+            counter["successes"] += record["successes"]
+        else:
+            counter["total"] += 1
+            counter["successes"] += 1 if record.get("success") else 0
+
+    def refresh(self, path: str) -> None:
+        """Read only what was appended since the last refresh (rebuild after compaction)"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.reset()
+            return
+
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            self.reset()
+            self.inode = stat.st_ino
+        if stat.st_size == self.offset:
+            return
+
+        with open(path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(stat.st_size - self.offset)
+
+        # A partially written last line is picked up next time
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].decode("utf-8", errors="replace").splitlines():
+            try:
+                self.add(json.loads(line))
+            except ValueError:
+                continue
+            self.lines += 1
+        self.offset += end
+
+
+# Shared by every LearningEngine in the process
+_indexes: Dict[str, _KnowledgeIndex] = {}
+
+
 class LearningEngine:
     """
     Learn from past fixes to improve future confidence scores
@@ -15,7 +81,9 @@ class LearningEngine:
 
     def __init__(self):
         self.knowledge_base_file = "/app/logs/fix_knowledge_base.jsonl"
+        self.lock_file = "/app/logs/fix_knowledge_base.lock"
         os.makedirs(os.path.dirname(self.knowledge_base_file), exist_ok=True)
+        self.index = _indexes.setdefault(self.knowledge_base_file, _KnowledgeIndex())
 
     def record_fix_result(self, fix: Dict, result: Dict, validation: Dict):
         """Record outcome of a fix"""
@@ -31,27 +99,74 @@ class LearningEngine:
         }
 
         # Append to knowledge base
-        with open(self.knowledge_base_file, "a") as f:
-            f.write(json.dumps(record) + "\n")
+        with open(self.lock_file, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                with open(self.knowledge_base_file, "a") as f:
+                    f.write(json.dumps(record) + "\n")
+
+                self.index.refresh(self.knowledge_base_file)
+                if self.index.lines > COMPACT_THRESHOLD_LINES:
+                    self._compact()
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _compact(self):
+        """
+        Fold all but the newest raw records into one summary line per
+        (issue_type, fix_type); the aggregated counts are unchanged
+        Caller holds the knowledge base lock.
+        """
+        with open(self.knowledge_base_file, "r") as f:
+            lines = f.readlines()
+
+        older, recent = lines[:-COMPACT_KEEP_RECENT], lines[-COMPACT_KEEP_RECENT:]
+        summary = _KnowledgeIndex()
+        for line in older:
+            try:
+                summary.add(json.loads(line))
+            except ValueError:
+                continue
+
+        tmp_path = f"{self.knowledge_base_file}.tmp"
+        with open(tmp_path, "w") as f:
+            for (issue_type, fix_type), counter in summary.counters.items():
+                f.write(json.dumps({
+                    "timestamp": datetime.utcnow().isoformat(),
+                    "compacted": True,
+                    "issue_type": issue_type,
+                    "fix_type": fix_type,
+                    "total": counter["total"],
+                    "successes": counter["successes"]
+                }) + "\n")
+            f.writelines(recent)
+        os.replace(tmp_path, self.knowledge_base_file)
+
+        self.index.refresh(self.knowledge_base_file)
+        print(f"🧹 Compacted fix knowledge base: {len(lines)} -> {self.index.lines} lines")
+
+    def _refresh_index(self):
+        """
+        Catch the index up with the knowledge base under a shared lock, so a
+        compaction in another process can't swap the file mid-read
+        """
+        with open(self.lock_file, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_SH)
+            try:
+                self.index.refresh(self.knowledge_base_file)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
 
     def get_historical_success_rate(self, issue_type: str, fix_type: str) -> float:
         """Get historical success rate for a fix type"""
-        if not os.path.exists(self.knowledge_base_file):
-            return 0.5  # Default 50% if no history
+        self._refresh_index()
 
-        records = []
-        with open(self.knowledge_base_file, "r") as f:
-            for line in f:
-                record = json.loads(line)
-                if record["issue_type"] == issue_type and record["fix_type"] == fix_type:
-                    records.append(record)
-
-        if not records:
-            return 0.5
+        counter = self.index.counters.get((issue_type, fix_type))
+        if not counter or not counter["total"]:
+            return 0.5  # Default 50% if no history
 
         # Calculate success rate
-        successes = sum(1 for r in records if r["success"])
-        return successes / len(records)
+        return counter["successes"] / counter["total"]
 
     def adjust_confidence(self, fix: Dict) -> int:
         """Adjust confidence based on historical data"""
@@ -75,30 +190,25 @@ class LearningEngine:
 
     def get_fix_statistics(self) -> Dict:
         """Get overall fix statistics"""
-        if not os.path.exists(self.knowledge_base_file):
+        self._refresh_index()
+
+        if not self.index.counters:
             return {
                 "total_fixes": 0,
                 "success_rate": 0,
                 "by_type": {}
             }
 
-        records = []
-        with open(self.knowledge_base_file, "r") as f:
-            for line in f:
-                records.append(json.loads(line))
-
-        total = len(records)
-        successes = sum(1 for r in records if r["success"])
-
         # Group by fix type
         by_type = {}
-        for record in records:
-            fix_type = record["fix_type"]
+        for (_, fix_type), counter in self.index.counters.items():
             if fix_type not in by_type:
                 by_type[fix_type] = {"total": 0, "successes": 0}
-            by_type[fix_type]["total"] += 1
-            if record["success"]:
-                by_type[fix_type]["successes"] += 1
+            by_type[fix_type]["total"] += counter["total"]
+            by_type[fix_type]["successes"] += counter["successes"]
+
+        total = sum(t["total"] for t in by_type.values())
+        successes = sum(t["successes"] for t in by_type.values())
 
         # Calculate success rates
         for fix_type in by_type:
@@ -1,19 +1,29 @@
 """
 Main FastAPI application
 """
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, status, Response, Request
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
+import time
 
 from config.settings import settings
-from models.database import get_db, init_db, Product, ProductStatus, PlatformListing, TrendSource
+from models.database import get_db, init_db, SessionLocal, Product, ProductStatus, PlatformListing, TrendSource, AuditLog
 from services.trend_discovery.trend_scanner import TrendScanner
+from services.trend_discovery import source_scheduler
 from services.ai_analysis.product_analyzer import ProductAnalyzer
 from services.platform_integrations.platform_manager import PlatformManager
 from services.ml.approval_predictor import ml_predictor
 from routes.monitoring_routes import router as monitoring_router
+from monitoring.prometheus_metrics import (
+    metrics_response, HTTP_REQUEST_LATENCY, HTTP_REQUESTS_IN_PROGRESS, ANALYSIS_BACKLOG
+)
+from services.ai_analysis.llm_telemetry import percentiles
+
+# Statuses counted as analysis backlog on /metrics
+BACKLOG_STATUSES = [ProductStatus.DISCOVERED, ProductStatus.ANALYZING, ProductStatus.PENDING_REVIEW]
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -35,6 +45,27 @@ app.add_middleware(
 app.include_router(monitoring_router)
 
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Request latency per route template (not raw path, to keep label cardinality bounded)"""
+    start = time.perf_counter()
+    in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method=request.method)
+    in_progress.inc()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        in_progress.dec()
+        route = request.scope.get("route")
+        HTTP_REQUEST_LATENCY.labels(
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status_code=str(status_code)
+        ).observe(time.perf_counter() - start)
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize database on startup"""
@@ -52,6 +83,32 @@ async def root():
     }
 
 
+@app.get("/metrics")
+def prometheus_metrics():
+    """
+    Prometheus scrape endpoint
+    Sync handler (runs in the threadpool) so the backlog query never blocks the event loop
+    """
+    refresh_backlog_gauge()
+    payload, content_type = metrics_response()
+    return Response(content=payload, media_type=content_type)
+
+
+def refresh_backlog_gauge():
+    """Backlog depth is read at scrape time; if the database is down the other metrics are still served"""
+    db = SessionLocal()
+    try:
+        backlog = dict(db.query(Product.status, func.count(Product.id)).filter(
+            Product.status.in_(BACKLOG_STATUSES)
+        ).group_by(Product.status).all())
+        for product_status in BACKLOG_STATUSES:
+            ANALYSIS_BACKLOG.labels(status=product_status.value).set(backlog.get(product_status, 0))
+    except Exception as e:
+        print(f"⚠️  Analysis backlog gauge not refreshed: {str(e)[:100]}")
+    finally:
+        db.close()
+
+
 # ==================== PRODUCT ENDPOINTS ====================
 
 @app.get("/api/products", response_model=List[dict])
@@ -127,6 +184,24 @@ async def get_product(product_id: int, db: Session = Depends(get_db)):
     }
 
 
+@app.get("/api/products/{product_id}/analysis-metrics")
+async def get_product_analysis_metrics(product_id: int, db: Session = Depends(get_db)):
+    """Per-agent latency, token and cost breakdown of each analysis run for a product"""
+    records = db.query(AuditLog).filter(
+        AuditLog.action == "product_analysis_metrics",
+        AuditLog.entity_type == "product",
+        AuditLog.entity_id == product_id
+    ).order_by(AuditLog.created_at.desc()).all()
+
+    return [
+        {
+            "analyzed_at": r.created_at.isoformat() if r.created_at else None,
+            "metrics": r.details
+        }
+        for r in records
+    ]
+
+
 @app.post("/api/products/{product_id}/approve")
 async def approve_product(product_id: int, db: Session = Depends(get_db)):
     """Approve a product for posting"""
@@ -325,6 +400,17 @@ async def scan_trends(db: Session = Depends(get_db)):
         )
 
 
+@app.post("/api/trends/discover")
+async def discover_trends(category: Optional[str] = None):
+    """Queue Perplexity trend discovery - all configured categories, or re-run a single one"""
+    try:
+        from tasks.trend_tasks import perplexity_discovery_task
+        task = perplexity_discovery_task.delay(category)
+        return {"message": "Trend discovery queued", "task_id": task.id, "category": category or "all"}
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Could not queue discovery: {str(e)}")
+
+
 @app.get("/api/trends/sources")
 async def get_trend_sources(db: Session = Depends(get_db)):
     """Get all trend sources and their status"""
@@ -337,7 +423,8 @@ async def get_trend_sources(db: Session = Depends(get_db)):
             "source_type": s.source_type,
             "enabled": s.enabled,
             "products_found": s.products_found,
-            "last_scan": s.last_scan.isoformat() if s.last_scan else None
+            "last_scan": s.last_scan.isoformat() if s.last_scan else None,
+            **source_scheduler.describe(s)
         }
         for s in sources
     ]
@@ -382,6 +469,49 @@ async def get_dashboard_analytics(db: Session = Depends(get_db)):
     }
 
 
+@app.get("/api/analytics/agent-performance")
+async def get_agent_performance(limit: int = 100, db: Session = Depends(get_db)):
+    """
+    Aggregate agent latency/tokens/cost over recent analyses
+    Shows which agent dominates product analysis time
+    """
+    records = db.query(AuditLog).filter(
+        AuditLog.action == "product_analysis_metrics"
+    ).order_by(AuditLog.created_at.desc()).limit(limit).all()
+
+    agents = {}
+    for record in records:
+        for agent, stats in (record.details or {}).get("agents", {}).items():
+            entry = agents.setdefault(agent, {
+                "latencies": [], "prompt_tokens": 0, "completion_tokens": 0,
+                "cost_usd": 0.0, "rate_limited": 0, "retries": 0, "parse_failures": 0
+            })
+            entry["latencies"].append(stats.get("latency_seconds", 0))
+            entry["prompt_tokens"] += stats.get("prompt_tokens", 0)
+            entry["completion_tokens"] += stats.get("completion_tokens", 0)
+            entry["cost_usd"] += stats.get("cost_usd", 0)
+            entry["rate_limited"] += stats.get("rate_limited", 0)
+            entry["retries"] += stats.get("retries", 0)
+            entry["parse_failures"] += stats.get("parse_failures", 0)
+
+    total_time = sum(sum(e["latencies"]) for e in agents.values())
+    result = {}
+    for agent, entry in agents.items():
+        latencies = entry.pop("latencies")
+        result[agent] = dict(
+            entry,
+            analyses=len(latencies),
+            latency_seconds=percentiles(latencies),
+            share_of_time=round(sum(latencies) / total_time, 3) if total_time else 0,
+            cost_usd=round(entry["cost_usd"], 4)
+        )
+
+    return {
+        "analyses": len(records),
+        "agents": dict(sorted(result.items(), key=lambda item: item[1]["share_of_time"], reverse=True))
+    }
+
+
 @app.get("/api/analytics/rejections")
 async def get_rejection_analytics(db: Session = Depends(get_db)):
     """Analyze rejection patterns for AI improvement"""
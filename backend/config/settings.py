@@ -52,6 +52,19 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Monitoring
+    CELERY_METRICS_PORT: int = 9808  # Prometheus exporter started by each Celery worker
+    ANALYSIS_CONSUMER_METRICS_PORT: int = 9809  # Prometheus exporter of the analysis stream consumer
+
+    # AI Analysis
+    ANALYSIS_LEASE_MINUTES: int = 15  # Products ANALYZING without a checkpoint heartbeat this long are reclaimed
+
+    # Perplexity Discovery - one request per category, run concurrently within the rate budget
+    PERPLEXITY_DISCOVERY_CATEGORIES: str = "beauty & personal care,electronics,home & kitchen,health & fitness,pet supplies,toys & games,fashion accessories,outdoor & garden"
+    PERPLEXITY_MAX_CONCURRENCY: int = 3
+    PERPLEXITY_REQUESTS_PER_MINUTE: int = 20
+    PERPLEXITY_SHARD_MAX_TOKENS: int = 1500
+
     # Rate Limiting
     TREND_SCAN_INTERVAL_MINUTES: int = 60
     MAX_PRODUCTS_PER_SCAN: int = 50
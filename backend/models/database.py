@@ -1,7 +1,7 @@
 """
 Database models and schema
 """
-from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, DateTime, JSON, Text, Enum
+from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, DateTime, JSON, Text, Enum, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
@@ -131,6 +131,12 @@ class TrendingKeyword(Base):
     last_seen = Column(DateTime, default=datetime.utcnow)  # Last time seen trending
     first_discovered = Column(DateTime, default=datetime.utcnow)
 
+    # Momentum (see services.trend_discovery.keyword_trends)
+    daily_counts = Column(JSON)  # {"YYYY-MM-DD": observations} for the last 28 days
+    decayed_score = Column(Float)  # Observations with a 3-day half-life, as of score_updated_at
+    score_updated_at = Column(DateTime)
+    velocity = Column(Float)  # Recent observations/day minus baseline, at last discovery
+
     # Related Data
     related_products = Column(JSON)  # List of products using this keyword
     source_urls = Column(JSON)  # Where this trend was discovered
@@ -167,6 +173,25 @@ class PlatformListing(Base):
     error_message = Column(Text)
 
 
+class ProductAnalysisStep(Base):
+    """
+    Checkpointed result of one agent for a product's in-progress analysis
+    Lets an interrupted analysis resume by re-running only the missing agents
+    """
+    __tablename__ = "product_analysis_steps"
+    __table_args__ = (UniqueConstraint("product_id", "agent", name="uq_analysis_step_product_agent"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    product_id = Column(Integer, nullable=False, index=True)
+    agent = Column(String(100), nullable=False)  # scanner, trend, ..., coordinator
+    status = Column(String(50))  # completed, fallback, failed
+
+    result = Column(JSON)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class AuditLog(Base):
     """Audit log for compliance and debugging"""
     __tablename__ = "audit_logs"
@@ -191,6 +216,71 @@ def get_db():
         db.close()
 
 
+# Substring search over trending_keywords.keyword (ILIKE '%q%' can't use the btree index):
+# a pg_trgm GIN index on PostgreSQL, an FTS5 trigram table kept in sync by triggers on SQLite
+KEYWORD_SEARCH_DDL = {
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_trending_keywords_keyword_trgm "
+        "ON trending_keywords USING gin (keyword gin_trgm_ops)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS trending_keywords_fts USING fts5("
+        "keyword, content='trending_keywords', content_rowid='id', tokenize='trigram')",
+        "CREATE TRIGGER IF NOT EXISTS trending_keywords_fts_ai AFTER INSERT ON trending_keywords BEGIN "
+        "INSERT INTO trending_keywords_fts(rowid, keyword) VALUES (new.id, new.keyword); END",
+        "CREATE TRIGGER IF NOT EXISTS trending_keywords_fts_ad AFTER DELETE ON trending_keywords BEGIN "
+        "INSERT INTO trending_keywords_fts(trending_keywords_fts, rowid, keyword) VALUES ('delete', old.id, old.keyword); END",
+        "CREATE TRIGGER IF NOT EXISTS trending_keywords_fts_au AFTER UPDATE OF keyword ON trending_keywords BEGIN "
+        "INSERT INTO trending_keywords_fts(trending_keywords_fts, rowid, keyword) VALUES ('delete', old.id, old.keyword); "
+        "INSERT INTO trending_keywords_fts(rowid, keyword) VALUES (new.id, new.keyword); END",
+        "INSERT INTO trending_keywords_fts(trending_keywords_fts) VALUES ('rebuild')",
+    ],
+}
+
+
+def create_keyword_search_index():
+    """Create the trending keyword substring index for this database (idempotent)"""
+    from sqlalchemy import text
+
+    statements = KEYWORD_SEARCH_DDL.get(engine.dialect.name, [])
+    try:
+        with engine.begin() as conn:
+            for statement in statements:
+                conn.execute(text(statement))
+        if statements:
+            print(f"✓ Keyword search index ready ({engine.dialect.name})")
+    except Exception as e:
+        # Searches fall back to a plain scan - never block startup on this
+        print(f"⚠️  Keyword search index not created: {str(e)[:100]}")
+
+
+def add_missing_columns():
+    """
+    ALTER TABLE ... ADD COLUMN for nullable model columns an existing table lacks
+    create_all only creates missing tables, so columns added to a model later would
+    otherwise never reach a database created before them.
+    """
+    from sqlalchemy import inspect, text
+
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                print(f"✓ Added column {table.name}.{column.name} ({column_type})")
+            except Exception as e:
+                print(f"⚠️  Could not add column {table.name}.{column.name}: {str(e)[:100]}")
+
+
 def init_db():
     """Initialize database tables"""
     print("\n" + "="*60)
@@ -207,6 +297,8 @@ def init_db():
 
         # Create all tables
         Base.metadata.create_all(bind=engine)
+        add_missing_columns()
+        create_keyword_search_index()
 
         # Verify tables were created
         from sqlalchemy import inspect
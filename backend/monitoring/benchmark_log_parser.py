@@ -0,0 +1,91 @@
+"""
+LogParser throughput benchmark
+Builds a synthetic docker log (default 100 MB, ~2% error lines) and compares the
+compiled single-pass matcher against the previous per-line, per-pattern re.search loop.
+
+Usage (from backend/):
+    python -m monitoring.benchmark_log_parser
+    python -m monitoring.benchmark_log_parser --size-mb 20 --skip-legacy
+"""
+import argparse
+import random
+import re
+import time
+
+from monitoring.log_parser import LogParser
+
+
+NORMAL_LINES = [
+    "INFO:     172.18.0.1:51234 - \"GET /api/products?status=pending_review HTTP/1.1\" 200 OK",
+    "[2025-01-01 12:00:00,000: INFO/MainProcess] Task tasks.trend_tasks.scan_trends_task succeeded in 42.1s",
+    "   ✅ Analysis complete (Llama-3.3 70B via Groq)",
+    "      ⏱️  Groq API response time: 1.84s",
+    "📦 [3/5] Analyzing: Portable Blender USB Rechargeable...",
+    "[2025-01-01 12:00:00,000: INFO/ForkPoolWorker-2] Scanning Amazon Best Sellers",
+    "    💰 Suggested Price: $49.99",
+]
+
+ERROR_LINES = [
+    "requests.exceptions.HTTPError: 429 Client Error: Too Many Requests for url: https://api.groq.com",
+    "Traceback (most recent call last):",
+    "KeyError: 'category'",
+    "sqlalchemy.exc.OperationalError: (psycopg2.OperationalError) connection refused",
+    "      ❌ Groq API error: 503 Server Error",
+    "AttributeError: 'NoneType' object has no attribute 'title'",
+    "The model `mixtral-8x7b-32768` has been decommissioned",
+]
+
+
+def build_log(size_mb: int, error_ratio: float = 0.02, seed: int = 7) -> str:
+    """Synthetic log of roughly size_mb megabytes"""
+    rng = random.Random(seed)
+    target = size_mb * 1024 * 1024
+    lines = []
+    size = 0
+    while size < target:
+        line = rng.choice(ERROR_LINES) if rng.random() < error_ratio else rng.choice(NORMAL_LINES)
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def legacy_extract(log_text: str) -> int:
+    """Previous implementation: re.search for every pattern on every line"""
+    matches = 0
+    for line in log_text.split("\n"):
+        for pattern in LogParser.ERROR_PATTERNS.values():
+            if re.search(pattern, line, re.IGNORECASE):
+                matches += 1
+    return matches
+
+
+def run(label: str, func, log_text: str, line_count: int) -> int:
+    start = time.perf_counter()
+    matches = func(log_text)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<10} {elapsed:>8.2f}s  {line_count / elapsed:>12,.0f} lines/sec  ({matches:,} matches)")
+    return matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LogParser error extraction")
+    parser.add_argument("--size-mb", type=int, default=100)
+    parser.add_argument("--skip-legacy", action="store_true", help="Only time the compiled matcher")
+    args = parser.parse_args()
+
+    print(f"Building {args.size_mb} MB synthetic log...")
+    log_text = build_log(args.size_mb)
+    line_count = log_text.count("\n") + 1
+    print(f"  {line_count:,} lines, {len(LogParser.ERROR_PATTERNS)} patterns\n")
+
+    log_parser = LogParser()
+    compiled_matches = run("compiled", lambda text: len(log_parser._extract_errors(text, "benchmark")), log_text, line_count)
+
+    if not args.skip_legacy:
+        legacy_matches = run("legacy", legacy_extract, log_text, line_count)
+        if legacy_matches != compiled_matches:
+            print(f"\n  ⚠️  Match counts differ: compiled={compiled_matches:,} legacy={legacy_matches:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Docker Engine API client over the unix socket
+Replaces forking the `docker` CLI for every health check, stats sample and log read:
+- One persistent HTTP/1.1 connection per client for request/response calls
+- Container stats are streamed (one long-lived request per container) and the
+  latest sample kept in memory, instead of `docker stats --no-stream` polling;
+  a container has no stats until its stream delivers the first sample
+- Log and exec output is demultiplexed from Docker's framed stdout/stderr stream
+The socket path comes from DOCKER_SOCKET, so a fake server can stand in for the daemon.
+"""
+import calendar
+import http.client
+import json
+import os
+import socket
+import struct
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+
+DEFAULT_SOCKET = "/var/run/docker.sock"
+API_VERSION = "v1.41"
+STATS_RETRY_SECONDS = 5
+
+
+class DockerError(Exception):
+    """Docker API request failed"""
+
+    def __init__(self, message: str, status_code: int = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection to a unix domain socket"""
+
+    def __init__(self, socket_path: str, timeout: float = 10):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+def demultiplex(data: bytes) -> Tuple[str, str]:
+    """
+    Split Docker's multiplexed stream into (stdout, stderr)
+    Frames are [stream(1) 0 0 0 size(4, big-endian)] + payload; TTY containers send raw bytes
+    """
+    if not data or data[0] not in (0, 1, 2) or data[1:4] != b"\x00\x00\x00":
+        return data.decode("utf-8", errors="replace"), ""
+
+    out, err = [], []
+    pos = 0
+    while pos + 8 <= len(data):
+        stream, size = data[pos], struct.unpack(">I", data[pos + 4:pos + 8])[0]
+        payload = data[pos + 8:pos + 8 + size]
+        (err if stream == 2 else out).append(payload)
+        pos += 8 + size
+    return b"".join(out).decode("utf-8", errors="replace"), b"".join(err).decode("utf-8", errors="replace")
+
+
+def since_param(since: str) -> str:
+    """
+    CLI-style --since value -> API value (unix seconds, optionally .nanoseconds)
+    Accepts relative durations ("5m", "2h", "30s") and RFC3339 timestamps ("...T12:00:00.123456789Z")
+    """
+    units = {"s": 1, "m": 60, "h": 3600}
+    if since[-1:] in units and since[:-1].isdigit():
+        return str(int(time.time()) - int(since[:-1]) * units[since[-1]])
+
+    seconds, _, fraction = since.rstrip("Z").partition(".")
+    epoch = calendar.timegm(datetime.strptime(seconds, "%Y-%m-%dT%H:%M:%S").timetuple())
+    return f"{epoch}.{fraction.ljust(9, '0')[:9]}" if fraction else str(epoch)
+
+
+def summarize_stats(stats: Dict) -> Dict:
+    """Raw stats sample -> CPU/memory figures as `docker stats` reports them"""
+    cpu, precpu = stats.get("cpu_stats", {}), stats.get("precpu_stats", {})
+    cpu_delta = cpu.get("cpu_usage", {}).get("total_usage", 0) - precpu.get("cpu_usage", {}).get("total_usage", 0)
+    system_delta = cpu.get("system_cpu_usage", 0) - precpu.get("system_cpu_usage", 0)
+    online_cpus = cpu.get("online_cpus") or len(cpu.get("cpu_usage", {}).get("percpu_usage") or []) or 1
+    cpu_percent = cpu_delta / system_delta * online_cpus * 100 if system_delta > 0 and cpu_delta > 0 else 0.0
+
+    memory = stats.get("memory_stats", {})
+    # Page cache is not counted as used memory (cgroup v1 "cache", v2 "inactive_file")
+    cache = memory.get("stats", {}).get("cache", memory.get("stats", {}).get("inactive_file", 0))
+    used = max(memory.get("usage", 0) - cache, 0)
+    limit = memory.get("limit", 0)
+
+    return {
+        "cpu_percent": f"{cpu_percent:.2f}",
+        "memory_percent": f"{used / limit * 100:.2f}" if limit else "0.00",
+        "memory_usage": f"{used / 1024 ** 2:.1f}MiB / {limit / 1024 ** 3:.2f}GiB",
+        "read_at": stats.get("read")
+    }
+
+
+class DockerClient:
+    """Minimal Docker Engine API client"""
+
+    def __init__(self, socket_path: str = None, timeout: float = 10):
+        self.socket_path = socket_path or os.getenv("DOCKER_SOCKET", DEFAULT_SOCKET)
+        self.timeout = timeout
+        self._connection: Optional[UnixHTTPConnection] = None
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict] = {}
+        self._stat_streams: Dict[str, threading.Thread] = {}
+
+    def _request(self, method: str, path: str, params: Dict = None, body: Dict = None,
+                 timeout: float = None) -> Tuple[int, bytes]:
+        """Send one request over the persistent connection (reconnecting once if it went stale)"""
+        url = f"/{API_VERSION}{path}" + (f"?{urlencode(params)}" if params else "")
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        payload = json.dumps(body) if body is not None else None
+
+        with self._lock:
+            for attempt in range(2):
+                if self._connection is None:
+                    self._connection = UnixHTTPConnection(self.socket_path, self.timeout)
+                # HTTPConnection.timeout only applies on connect(); a reused socket needs it set directly
+                self._connection.timeout = timeout or self.timeout
+                if self._connection.sock is not None:
+                    self._connection.sock.settimeout(self._connection.timeout)
+                try:
+                    self._connection.request(method, url, body=payload, headers=headers)
+                    response = self._connection.getresponse()
+                    data = response.read()
+                    if response.will_close:
+                        self._connection.close()
+                        self._connection = None
+                    break
+                except (http.client.HTTPException, ConnectionError, BrokenPipeError, socket.timeout) as e:
+                    self._connection.close()
+                    self._connection = None
+                    if attempt or isinstance(e, socket.timeout):
+                        raise DockerError(f"Docker API {method} {path} failed: {str(e)}")
+                except OSError as e:
+                    self._connection = None
+                    raise DockerError(f"Docker socket unavailable ({self.socket_path}): {str(e)}")
+
+        if response.status >= 400:
+            try:
+                message = json.loads(data).get("message", "")
+            except ValueError:
+                message = data.decode("utf-8", errors="replace")
+            raise DockerError(f"Docker API {method} {path}: {response.status} {message}", response.status)
+        return response.status, data
+
+    def list_containers(self, all: bool = False) -> List[Dict]:
+        """Containers as {"name", "state", "status"} dicts"""
+        _, data = self._request("GET", "/containers/json", {"all": int(all)})
+        return [
+            {"name": c["Names"][0].lstrip("/"), "state": c.get("State"), "status": c.get("Status", "")}
+            for c in json.loads(data)
+        ]
+
+    def logs(self, container: str, since: str = None, tail: int = None, timestamps: bool = False) -> Tuple[str, str]:
+        """Container log output as (stdout, stderr)"""
+        params = {"stdout": 1, "stderr": 1, "timestamps": int(timestamps)}
+        if since:
+            params["since"] = since_param(since)
+        if tail is not None:
+            params["tail"] = tail
+        _, data = self._request("GET", f"/containers/{quote(container)}/logs", params)
+        return demultiplex(data)
+
+    def restart(self, container: str, timeout: int = 10) -> None:
+        self._request("POST", f"/containers/{quote(container)}/restart", {"t": timeout}, timeout=timeout + 30)
+
+    def exec_run(self, container: str, cmd: List[str], timeout: float = 30) -> Tuple[int, str, str]:
+        """Run a command in a container; returns (exit code, stdout, stderr)"""
+        _, data = self._request("POST", f"/containers/{quote(container)}/exec", body={
+            "Cmd": cmd, "AttachStdout": True, "AttachStderr": True
+        })
+        exec_id = json.loads(data)["Id"]
+        _, output = self._request("POST", f"/exec/{exec_id}/start", body={"Detach": False, "Tty": False},
+                                  timeout=timeout)
+        _, info = self._request("GET", f"/exec/{exec_id}/json")
+        stdout, stderr = demultiplex(output)
+        return json.loads(info).get("ExitCode", -1), stdout, stderr
+
+    def container_stats(self, container: str) -> Optional[Dict]:
+        """
+        Latest CPU/memory figures for a container, None until its first sample
+        Starts a background stats stream on first use. Never blocks: a one-shot
+        /stats call takes 1-2s and would hold up every other request on the connection.
+        """
+        self._ensure_stats_stream(container)
+        return self._stats.get(container)
+
+    def _ensure_stats_stream(self, container: str) -> None:
+        with self._lock:
+            thread = self._stat_streams.get(container)
+            if thread is not None and thread.is_alive():
+                return
+            thread = threading.Thread(target=self._stream_stats, args=(container,),
+                                      name=f"docker-stats-{container}", daemon=True)
+            self._stat_streams[container] = thread
+            thread.start()
+
+    def _stream_stats(self, container: str) -> None:
+        """Follow /stats (one JSON sample per second) on a dedicated connection"""
+        while True:
+            connection = UnixHTTPConnection(self.socket_path, timeout=30)
+            try:
+                connection.request("GET", f"/{API_VERSION}/containers/{quote(container)}/stats")
+                response = connection.getresponse()
+                if response.status == 404:
+                    self._stats.pop(container, None)
+                    return  # Container is gone; a later lookup starts a new stream
+                while True:
+                    line = response.readline()
+                    if not line:
+                        break
+                    if line.strip():
+                        self._stats[container] = summarize_stats(json.loads(line))
+            except (OSError, ValueError, http.client.HTTPException):
+                pass
+            finally:
+                connection.close()
+            time.sleep(STATS_RETRY_SECONDS)
+
+
+_client: Optional[DockerClient] = None
+
+
+def get_docker_client() -> DockerClient:
+    """Process-wide client (shares the connection and the stats streams)"""
+    global _client
+    if _client is None:
+        _client = DockerClient()
+    return _client
@@ -0,0 +1,170 @@
+"""
+Streaming error fingerprinting (Drain-style template mining)
+Each error message is routed through a fixed-depth tree (token count, then the
+first tokens) to a small leaf of clusters and merged into the most similar
+template, so classifying a new line costs the same no matter how much history
+exists. Variable tokens (numbers, ids, URLs, paths) become <*>.
+
+Cluster state (template, counts, first/last seen) is persisted to
+/app/logs/error_clusters.json so recurring issues are recognised across runs
+and restarts.
+"""
+import fcntl
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+
+WILDCARD = "<*>"
+
+
+def tokenize(message: str, max_tokens: int = 64) -> List[str]:
+    """Split a message into tokens, masking obviously variable ones"""
+    tokens = []
+    for token in message.split()[:max_tokens]:
+        if any(ch.isdigit() for ch in token) or token.startswith(("http://", "https://")) or (
+            "/" in token and len(token) > 1
+        ):
+            tokens.append(WILDCARD)
+        else:
+            tokens.append(token)
+    return tokens
+
+
+class DrainClusterer:
+    """Fixed-depth parse tree over error templates"""
+
+    def __init__(self, depth: int = 2, similarity_threshold: float = 0.5, max_children: int = 100,
+                 max_clusters: int = 2000):
+        self.depth = depth
+        self.similarity_threshold = similarity_threshold
+        self.max_children = max_children
+        self.max_clusters = max_clusters
+        self.clusters: Dict[int, Dict] = {}
+        self._leaves: Dict[Tuple, List[int]] = {}
+        self._children: Dict[int, int] = {}  # token count -> number of leaves
+        self._next_id = 1
+
+    def _route(self, tokens: List[str]) -> Tuple:
+        """Leaf key: token count plus the first `depth` tokens"""
+        prefix = tuple(tokens[:self.depth])
+        key = (len(tokens),) + prefix
+        if key not in self._leaves and self._children.get(len(tokens), 0) >= self.max_children:
+            # Bound fan-out: overflow prefixes share a wildcard leaf
+            key = (len(tokens),) + tuple(WILDCARD for _ in prefix)
+        return key
+
+    def _leaf(self, key: Tuple) -> List[int]:
+        if key not in self._leaves:
+            self._leaves[key] = []
+            self._children[key[0]] = self._children.get(key[0], 0) + 1
+        return self._leaves[key]
+
+    @staticmethod
+    def _similarity(template: List[str], tokens: List[str]) -> float:
+        """Share of positions that match; a template wildcard matches anything (as in Drain)"""
+        same = sum(1 for t, m in zip(template, tokens) if t == m or t == WILDCARD)
+        return same / len(tokens) if tokens else 1.0
+
+    def add(self, message: str, timestamp: Optional[str] = None, **attrs) -> Dict:
+        """Assign a message to a cluster (creating one if needed) and return it"""
+        tokens = tokenize(message)
+        key = self._route(tokens)
+        leaf = self._leaf(key)
+
+        best, best_similarity = None, -1.0
+        for cluster_id in leaf:
+            similarity = self._similarity(self.clusters[cluster_id]["template"], tokens)
+            if similarity > best_similarity:
+                best, best_similarity = self.clusters[cluster_id], similarity
+
+        if best is not None and best_similarity >= self.similarity_threshold:
+            best["template"] = [t if t == m else WILDCARD for t, m in zip(best["template"], tokens)]
+            best["count"] += 1
+            if timestamp:
+                best["first_seen"] = min(filter(None, [best.get("first_seen"), timestamp]))
+                best["last_seen"] = max(filter(None, [best.get("last_seen"), timestamp]))
+            return best
+
+        cluster = dict(attrs, id=self._next_id, template=tokens, route=list(key), count=1,
+                       first_seen=timestamp, last_seen=timestamp, sample=message[:300])
+        self._next_id += 1
+        self.clusters[cluster["id"]] = cluster
+        leaf.append(cluster["id"])
+        self._evict()
+        return cluster
+
+    def _evict(self) -> None:
+        """Drop the least recently seen clusters beyond max_clusters"""
+        if len(self.clusters) <= self.max_clusters:
+            return
+        oldest = sorted(self.clusters.values(), key=lambda c: c.get("last_seen") or "")
+        for cluster in oldest[:len(self.clusters) - self.max_clusters]:
+            del self.clusters[cluster["id"]]
+            self._leaves[tuple(cluster["route"])].remove(cluster["id"])
+
+    def to_state(self) -> Dict:
+        return {"next_id": self._next_id, "clusters": list(self.clusters.values())}
+
+    def load_state(self, state: Dict) -> None:
+        self.clusters = {}
+        self._leaves = {}
+        self._children = {}
+        for cluster in state.get("clusters", []):
+            self.clusters[cluster["id"]] = cluster
+            self._leaf(tuple(cluster["route"])).append(cluster["id"])
+        self._next_id = state.get("next_id", len(self.clusters) + 1)
+
+
+class ErrorClusterStore:
+    """DrainClusterer persisted in /app/logs, shared by all processes under a file lock"""
+
+    def __init__(self, state_dir: str = "/app/logs"):
+        self.state_file = os.path.join(state_dir, "error_clusters.json")
+        self.lock_file = os.path.join(state_dir, "error_clusters.lock")
+        self.clusterer = DrainClusterer()
+        os.makedirs(state_dir, exist_ok=True)
+
+    def ingest(self, errors: List[Dict]) -> List[Dict]:
+        """
+        Cluster a batch of errors and persist the updated state
+        Returns one entry per cluster touched: the cluster plus its count in this batch
+        """
+        touched: Dict[int, Dict] = {}
+        with open(self.lock_file, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                self._load()
+                for error in errors:
+                    message = error.get("message") or error.get("error") or ""
+                    cluster = self.clusterer.add(
+                        message, error.get("timestamp"),
+                        error_type=error.get("type", "unknown"), severity=error.get("severity", "error")
+                    )
+                    entry = touched.setdefault(cluster["id"], {"cluster": cluster, "batch_count": 0})
+                    entry["batch_count"] += 1
+                self._save()
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+        # Evicted clusters are not reported
+        return [entry for cluster_id, entry in touched.items() if cluster_id in self.clusterer.clusters]
+
+    def top_clusters(self, limit: int = 20) -> List[Dict]:
+        """Most frequent clusters from the persisted state"""
+        self._load()
+        clusters = sorted(self.clusterer.clusters.values(), key=lambda c: c["count"], reverse=True)
+        return [dict(c, template=" ".join(c["template"])) for c in clusters[:limit]]
+
+    def _load(self) -> None:
+        try:
+            with open(self.state_file, "r") as f:
+                self.clusterer.load_state(json.load(f))
+        except (OSError, ValueError):
+            pass
+
+    def _save(self) -> None:
+        tmp_path = f"{self.state_file}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.clusterer.to_state(), f)
+        os.replace(tmp_path, self.state_file)
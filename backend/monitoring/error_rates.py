@@ -0,0 +1,220 @@
+"""
+Windowed error-rate counters
+Errors are counted into one-minute buckets keyed by error type and source,
+using the timestamp of the log line (not the time it was parsed):
+- O(1) updates, constant-time (<= 60 bucket) reads for 1m / 5m / 1h rates
+- Spike detection: last-5-minute rate against the rest of the hour, once the
+  tracker has seen errors in enough of the hour to have a baseline at all
+- MemoryBucketStore for a single process, RedisBucketStore shared by
+  the API and Celery processes (buckets and the key index expire after two hours)
+"""
+import os
+from datetime import datetime
+from typing import Dict, List, Iterable, Optional, Set
+
+
+BUCKET_SECONDS = 60
+WINDOW_BUCKETS = 60  # One hour of one-minute buckets
+REDIS_BUCKET_TTL_SECONDS = 2 * 3600
+ALL = "*"
+
+# Spike: last 5 minutes running at >= SPIKE_RATIO x the hour's baseline rate
+SPIKE_RATIO = 3.0
+SPIKE_MIN_COUNT = 10
+# Baseline minutes (of the 55 before the last 5) that must hold some error, of any type.
+# A fresh in-memory tracker (worker restart) has none, so its first busy minute is no spike
+SPIKE_MIN_BASELINE_BUCKETS = 5
+
+
+def _minute(timestamp: str) -> Optional[int]:
+    """Epoch minute of an ISO timestamp (naive timestamps are UTC)"""
+    try:
+        parsed = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is not None:
+        return int(parsed.timestamp() // BUCKET_SECONDS)
+    return int((parsed - datetime(1970, 1, 1)).total_seconds() // BUCKET_SECONDS)
+
+
+def _current_minute() -> int:
+    return int((datetime.utcnow() - datetime(1970, 1, 1)).total_seconds() // BUCKET_SECONDS)
+
+
+class MemoryBucketStore:
+    """Per-key ring of WINDOW_BUCKETS one-minute slots"""
+
+    def __init__(self):
+        self._slots: Dict[str, List[int]] = {}   # slot -> epoch minute it holds
+        self._counts: Dict[str, List[int]] = {}
+
+    def incr(self, key: str, minute: int, amount: int = 1) -> None:
+        slots = self._slots.setdefault(key, [-1] * WINDOW_BUCKETS)
+        counts = self._counts.setdefault(key, [0] * WINDOW_BUCKETS)
+        slot = minute % WINDOW_BUCKETS
+        if slots[slot] != minute:
+            if slots[slot] > minute:
+                return  # Older than the window
+            slots[slot] = minute
+            counts[slot] = 0
+        counts[slot] += amount
+
+    def counts(self, key: str, minutes: List[int]) -> List[int]:
+        slots = self._slots.get(key)
+        if slots is None:
+            return [0] * len(minutes)
+        counts = self._counts[key]
+        return [counts[m % WINDOW_BUCKETS] if slots[m % WINDOW_BUCKETS] == m else 0 for m in minutes]
+
+    def keys(self) -> Set[str]:
+        return set(self._slots)
+
+
+class RedisBucketStore:
+    """One Redis counter per key and minute, shared across processes"""
+
+    def __init__(self, client, prefix: str = "error_rate"):
+        self.client = client
+        self.prefix = prefix
+
+    def _bucket(self, key: str, minute: int) -> str:
+        return f"{self.prefix}:{key}:{minute}"
+
+    @property
+    def _index(self) -> str:
+        # Sorted set: key -> last minute it was counted, so idle keys can be trimmed
+        return f"{self.prefix}:active_keys"
+
+    def incr_many(self, increments: Dict[tuple, int]) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        for (key, minute), amount in increments.items():
+            bucket = self._bucket(key, minute)
+            pipe.incrby(bucket, amount)
+            pipe.expire(bucket, REDIS_BUCKET_TTL_SECONDS)
+            pipe.zadd(self._index, {key: minute}, gt=True)
+        if increments:
+            oldest = _current_minute() - REDIS_BUCKET_TTL_SECONDS // BUCKET_SECONDS
+            pipe.zremrangebyscore(self._index, "-inf", oldest)
+            pipe.expire(self._index, REDIS_BUCKET_TTL_SECONDS)
+        pipe.execute()
+
+    def incr(self, key: str, minute: int, amount: int = 1) -> None:
+        self.incr_many({(key, minute): amount})
+
+    def counts(self, key: str, minutes: List[int]) -> List[int]:
+        values = self.client.mget([self._bucket(key, m) for m in minutes])
+        return [int(v) if v else 0 for v in values]
+
+    def keys(self) -> Set[str]:
+        oldest = _current_minute() - WINDOW_BUCKETS
+        members = self.client.zrangebyscore(self._index, oldest, "+inf")
+        return {k.decode() if isinstance(k, bytes) else k for k in members}
+
+
+class ErrorRateTracker:
+    """Error counts per (type, source) in one-minute buckets"""
+
+    def __init__(self, store=None):
+        self.store = store or MemoryBucketStore()
+
+    @property
+    def shared(self) -> bool:
+        """True when counts are shared across processes (Redis), not just this one"""
+        return isinstance(self.store, RedisBucketStore)
+
+    @classmethod
+    def from_errors(cls, errors: Iterable[Dict]) -> "ErrorRateTracker":
+        """Throwaway in-memory tracker holding only the given errors"""
+        tracker = cls()
+        tracker.record(errors)
+        return tracker
+
+    @staticmethod
+    def key(error_type: str = ALL, source: str = ALL) -> str:
+        return f"{error_type}|{source}"
+
+    def record(self, errors: Iterable[Dict]) -> int:
+        """Count parsed errors by their log timestamp; returns how many were counted"""
+        increments: Dict[tuple, int] = {}
+        counted = 0
+        for error in errors:
+            if "type" not in error:
+                continue
+            minute = _minute(error.get("timestamp"))
+            if minute is None:
+                continue
+            error_type, source = error["type"], error.get("source", "unknown")
+            for key in (self.key(error_type, source), self.key(error_type), self.key(source=source), self.key()):
+                increments[(key, minute)] = increments.get((key, minute), 0) + 1
+            counted += 1
+
+        if hasattr(self.store, "incr_many"):
+            self.store.incr_many(increments)
+        else:
+            for (key, minute), amount in increments.items():
+                self.store.incr(key, minute, amount)
+        return counted
+
+    def rates(self, error_type: str = ALL, source: str = ALL, now_minute: int = None) -> Dict[str, float]:
+        """Error counts over the last minute, 5 minutes and hour (current minute included)"""
+        now_minute = now_minute if now_minute is not None else _current_minute()
+        minutes = list(range(now_minute - WINDOW_BUCKETS + 1, now_minute + 1))
+        counts = self.store.counts(self.key(error_type, source), minutes)
+
+        last_hour = sum(counts)
+        last_5 = sum(counts[-5:])
+        # Baseline: per-minute rate over the rest of the hour
+        baseline = (last_hour - last_5) / (WINDOW_BUCKETS - 5)
+
+        return {
+            "last_minute": counts[-1],
+            "last_5_minutes": last_5,
+            "last_hour": last_hour,
+            "per_minute_5m": round(last_5 / 5, 2),
+            "per_minute_baseline": round(baseline, 2)
+        }
+
+    def detect_spikes(self, now_minute: int = None) -> List[Dict]:
+        """Type/source pairs whose 5-minute rate jumped against their hourly baseline"""
+        now_minute = now_minute if now_minute is not None else _current_minute()
+        baseline_minutes = list(range(now_minute - WINDOW_BUCKETS + 1, now_minute - 4))
+        populated = sum(1 for count in self.store.counts(self.key(), baseline_minutes) if count)
+        if populated < SPIKE_MIN_BASELINE_BUCKETS:
+            return []  # No history to compare against
+
+        spikes = []
+        for key in self.store.keys():
+            error_type, _, source = key.partition("|")
+            if ALL in (error_type, source):
+                continue
+            rates = self.rates(error_type, source, now_minute)
+            if rates["last_5_minutes"] < SPIKE_MIN_COUNT:
+                continue
+            baseline = rates["per_minute_baseline"]
+            if baseline == 0 or rates["per_minute_5m"] >= SPIKE_RATIO * baseline:
+                spikes.append(dict(rates, error_type=error_type, source=source))
+        return sorted(spikes, key=lambda s: s["last_5_minutes"], reverse=True)
+
+
+_tracker: Optional[ErrorRateTracker] = None
+
+
+def get_error_rate_tracker() -> ErrorRateTracker:
+    """
+    Shared tracker - Redis-backed when REDIS_URL is reachable so the API and
+    Celery processes see the same counts, in-memory otherwise
+    """
+    global _tracker
+    if _tracker is None:
+        store = None
+        redis_url = os.getenv("REDIS_URL")
+        if redis_url:
+            try:
+                import redis
+                client = redis.Redis.from_url(redis_url, socket_timeout=2)
+                client.ping()
+                store = RedisBucketStore(client)
+            except Exception as e:
+                print(f"⚠️  Error-rate counters falling back to memory: {str(e)[:80]}")
+        _tracker = ErrorRateTracker(store)
+    return _tracker
@@ -3,11 +3,20 @@ Health checker for system components
 Checks Docker containers, API endpoints, database, Redis
 """
 import requests
-import subprocess
+import time
 from typing import Dict, List
 from datetime import datetime
 from sqlalchemy import text
 from models.database import engine
+from monitoring.docker_client import get_docker_client
+from monitoring.probes import probe_runner
+
+
+API_ENDPOINTS = [
+    "http://localhost:8000/",
+    "http://localhost:8000/api/products",
+    "http://localhost:8000/api/analytics/dashboard",
+]
 
 
 class HealthChecker:
@@ -17,28 +26,34 @@ class HealthChecker:
         self.checks = []
 
     def check_all(self) -> Dict:
-        """Run all health checks"""
+        """
+        Run all health checks
+        Probes run concurrently under one deadline; results are cached briefly
+        (see monitoring.probes) so repeated snapshots stay well under a second.
+        """
         results = {
             "timestamp": datetime.utcnow().isoformat(),
             "overall_status": "healthy",
             "checks": {}
         }
 
-        # Check database
-        db_health = self.check_database()
-        results["checks"]["database"] = db_health
-
-        # Check Docker containers
-        docker_health = self.check_docker_containers()
-        results["checks"]["docker"] = docker_health
+        probes = {
+            "health.database": self.check_database,
+            "health.docker": self.check_docker_containers,
+            "health.redis": self.check_redis,
+        }
+        # Each endpoint is its own probe so one slow endpoint doesn't hold up the others
+        for endpoint in API_ENDPOINTS:
+            probes[f"health.api:{endpoint}"] = lambda endpoint=endpoint: self.check_endpoint(endpoint)
 
-        # Check API endpoints
-        api_health = self.check_api_endpoints()
-        results["checks"]["api"] = api_health
+        probe_results = probe_runner.run(probes)
 
-        # Check Redis
-        redis_health = self.check_redis()
-        results["checks"]["redis"] = redis_health
+        results["checks"]["database"] = probe_results["health.database"]
+        results["checks"]["docker"] = probe_results["health.docker"]
+        results["checks"]["api"] = self._combine_endpoints(
+            {endpoint: probe_results[f"health.api:{endpoint}"] for endpoint in API_ENDPOINTS}
+        )
+        results["checks"]["redis"] = probe_results["health.redis"]
 
         # Determine overall status
         if any(check.get("status") == "critical" for check in results["checks"].values()):
@@ -51,13 +66,14 @@ class HealthChecker:
     def check_database(self) -> Dict:
         """Check database connection"""
         try:
+            start = time.perf_counter()
             conn = engine.connect()
             conn.execute(text("SELECT 1"))
             conn.close()
             return {
                 "status": "healthy",
                 "message": "Database connection successful",
-                "response_time_ms": 50
+                "response_time_ms": int((time.perf_counter() - start) * 1000)
             }
         except Exception as e:
             return {
@@ -69,22 +85,13 @@ class HealthChecker:
     def check_docker_containers(self) -> Dict:
         """Check Docker container status"""
         try:
-            result = subprocess.run(
-                ["docker", "ps", "--format", "{{.Names}}\t{{.Status}}"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-
             containers = {}
-            for line in result.stdout.strip().split("\n"):
-                if line:
-                    name, status = line.split("\t")
-                    is_healthy = "Up" in status
-                    containers[name] = {
-                        "status": "healthy" if is_healthy else "critical",
-                        "details": status
-                    }
+            for container in get_docker_client().list_containers():
+                is_healthy = container["state"] == "running"
+                containers[container["name"]] = {
+                    "status": "healthy" if is_healthy else "critical",
+                    "details": container["status"]
+                }
 
             all_healthy = all(c["status"] == "healthy" for c in containers.values())
 
@@ -102,33 +109,27 @@ class HealthChecker:
 
     def check_api_endpoints(self) -> Dict:
         """Check critical API endpoints"""
-        endpoints = [
-            "http://localhost:8000/",
-            "http://localhost:8000/api/products",
-            "http://localhost:8000/api/analytics/dashboard",
-        ]
-
-        results = {}
-        all_healthy = True
-
-        for endpoint in endpoints:
-            try:
-                response = requests.get(endpoint, timeout=5)
-                is_healthy = response.status_code < 500
-                results[endpoint] = {
-                    "status": "healthy" if is_healthy else "warning",
-                    "status_code": response.status_code,
-                    "response_time_ms": int(response.elapsed.total_seconds() * 1000)
-                }
-                if not is_healthy:
-                    all_healthy = False
-            except Exception as e:
-                results[endpoint] = {
-                    "status": "critical",
-                    "error": str(e)
-                }
-                all_healthy = False
+        return self._combine_endpoints({endpoint: self.check_endpoint(endpoint) for endpoint in API_ENDPOINTS})
+
+    def check_endpoint(self, endpoint: str) -> Dict:
+        """Check a single API endpoint"""
+        try:
+            response = requests.get(endpoint, timeout=5)
+            is_healthy = response.status_code < 500
+            return {
+                "status": "healthy" if is_healthy else "warning",
+                "status_code": response.status_code,
+                "response_time_ms": int(response.elapsed.total_seconds() * 1000)
+            }
+        except Exception as e:
+            return {
+                "status": "critical",
+                "error": str(e)
+            }
 
+    @staticmethod
+    def _combine_endpoints(results: Dict[str, Dict]) -> Dict:
+        all_healthy = all(r.get("status") == "healthy" for r in results.values())
         return {
             "status": "healthy" if all_healthy else "critical",
             "endpoints": results
@@ -3,11 +3,71 @@ Log parser for error detection
 Parses Docker logs, application logs, and Celery logs
 """
 import re
-import subprocess
-from typing import List, Dict
-from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Tuple
+from datetime import datetime
 from collections import Counter
 
+from monitoring.docker_client import get_docker_client
+from monitoring.error_rates import ErrorRateTracker
+
+try:  # Python 3.11+
+    from re import _parser as sre_parse
+    from re._constants import LITERAL, SUBPATTERN, BRANCH
+except ImportError:
+    import sre_parse
+    from sre_constants import LITERAL, SUBPATTERN, BRANCH
+
+
+MIN_LITERAL_LENGTH = 3
+
+# Leading timestamps written by uvicorn/celery/python logging, e.g.
+# "[2025-01-01 12:00:00,123: ERROR/..." or "2025-01-01T12:00:00.123Z ..."
+LINE_TIMESTAMP_RE = re.compile(r"^\[?(\d{4}-\d{2}-\d{2})[ T](\d{2}:\d{2}:\d{2})(?:[.,](\d{1,6}))?")
+
+
+def parse_line_timestamp(line: str) -> Optional[str]:
+    """ISO timestamp at the start of a log line, if it has one"""
+    match = LINE_TIMESTAMP_RE.match(line)
+    if not match:
+        return None
+    date, time_of_day, fraction = match.groups()
+    return f"{date}T{time_of_day}" + (f".{fraction.ljust(6, '0')}" if fraction else "")
+
+
+def required_literals(pattern: str) -> Optional[List[str]]:
+    """
+    Casefolded literals of which at least one must appear in any line the pattern matches
+    e.g. r"(DNSError|Name or service not known)" -> ["dnserror", "name or service not known"]
+    Returns None when no literal of MIN_LITERAL_LENGTH is guaranteed
+    """
+    def scan(items) -> Optional[List[str]]:
+        candidates = []
+        run = ""
+        for op, av in items:
+            if op == LITERAL:
+                run += chr(av)
+                continue
+            if len(run) >= MIN_LITERAL_LENGTH:
+                candidates.append([run])
+            run = ""
+            if op == SUBPATTERN:
+                found = scan(av[-1])
+                if found:
+                    candidates.append(found)
+            elif op == BRANCH:
+                branches = [scan(branch) for branch in av[1]]
+                if all(branches):
+                    candidates.append([literal for branch in branches for literal in branch])
+        if len(run) >= MIN_LITERAL_LENGTH:
+            candidates.append([run])
+        if not candidates:
+            return None
+        # Most selective requirement: the one whose shortest literal is longest
+        return max(candidates, key=lambda literals: min(len(literal) for literal in literals))
+
+    found = scan(sre_parse.parse(pattern))
+    return [literal.casefold() for literal in found] if found else None
+
 
 class LogParser:
     """Parse logs from various sources"""
@@ -79,23 +139,47 @@ class LogParser:
 
     def __init__(self):
         self.errors_detected = []
+        self._compile_patterns()
+
+    @classmethod
+    def _compile_patterns(cls) -> None:
+        """
+        Compile ERROR_PATTERNS once per class
+        Each pattern gets its required literals; lines are only regex-checked when a
+        literal prefilter over the whole buffer finds one of them
+        """
+        if getattr(cls, "_compiled", None) is not None:
+            return
+
+        compiled = []
+        prefilter = set()
+        unfiltered = []
+        for error_type, pattern in cls.ERROR_PATTERNS.items():
+            literals = required_literals(pattern)
+            compiled.append((error_type, re.compile(pattern, re.IGNORECASE), literals))
+            if literals:
+                prefilter.update(literals)
+            else:
+                unfiltered.append(pattern)
+
+        # A literal containing another prefilter literal finds no additional lines
+        cls._prefilter_literals = [
+            literal for literal in prefilter
+            if not any(other != literal and other in literal for other in prefilter)
+        ]
+        cls._unfiltered_pattern = (
+            re.compile("|".join(f"(?:{p})" for p in unfiltered), re.IGNORECASE | re.MULTILINE)
+            if unfiltered else None
+        )
+        cls._compiled = compiled
 
     def parse_docker_logs(self, container_name: str, since_minutes: int = 5) -> List[Dict]:
         """Parse Docker container logs for errors"""
         try:
             # Get logs from last N minutes
-            result = subprocess.run(
-                [
-                    "docker", "logs",
-                    "--since", f"{since_minutes}m",
-                    container_name
-                ],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            stdout, stderr = get_docker_client().logs(container_name, since=f"{since_minutes}m")
 
-            logs = result.stdout + result.stderr
+            logs = stdout + stderr
             return self._extract_errors(logs, source=container_name)
 
         except Exception as e:
@@ -105,26 +189,81 @@ class LogParser:
                 "severity": "warning"
             }]
 
-    def _extract_errors(self, log_text: str, source: str) -> List[Dict]:
-        """Extract errors from log text"""
+    def _extract_errors(self, log_text: str, source: str, line_timestamps: List[Optional[str]] = None) -> List[Dict]:
+        """
+        Extract errors from log text
+        A line matching several patterns yields one error per matching type
+        Errors carry the log line's own timestamp (line_timestamps, e.g. from
+        docker --timestamps, or a leading timestamp in the line), falling back
+        to the parse time
+        """
         errors = []
         lines = log_text.split("\n")
-
-        for i, line in enumerate(lines):
-            for error_type, pattern in self.ERROR_PATTERNS.items():
-                if re.search(pattern, line, re.IGNORECASE):
-                    error = {
-                        "type": error_type,
-                        "message": line.strip(),
-                        "source": source,
-                        "timestamp": datetime.utcnow().isoformat(),
-                        "severity": self._determine_severity(error_type),
-                        "context": self._get_context(lines, i)
-                    }
-                    errors.append(error)
+        parsed_at = datetime.utcnow().isoformat()
+
+        for i in self._candidate_line_indexes(log_text):
+            line = lines[i]
+            error_types = self.classify_line(line)
+            if not error_types:
+                continue
+            timestamp = (
+                (line_timestamps[i] if line_timestamps and i < len(line_timestamps) else None)
+                or parse_line_timestamp(line)
+                or parsed_at
+            )
+            for error_type in error_types:
+                errors.append({
+                    "type": error_type,
+                    "message": line.strip(),
+                    "source": source,
+                    "timestamp": timestamp,
+                    "severity": self._determine_severity(error_type),
+                    "context": self._get_context(lines, i)
+                })
 
         return errors
 
+    def _candidate_line_indexes(self, log_text: str) -> List[int]:
+        """
+        Indexes of lines that may match an error pattern, in order
+        Literals are located with str.find over the casefolded buffer (C speed);
+        casefolding never adds or removes newlines, so line indexes carry over
+        """
+        folded = log_text.casefold()
+        line_starts = set()
+
+        for literal in self._prefilter_literals:
+            pos = folded.find(literal)
+            while pos != -1:
+                line_start = folded.rfind("\n", 0, pos) + 1
+                line_starts.add(line_start)
+                line_end = folded.find("\n", pos)
+                if line_end == -1:
+                    break
+                pos = folded.find(literal, line_end)
+
+        if self._unfiltered_pattern is not None:
+            for match in self._unfiltered_pattern.finditer(folded):
+                line_starts.add(folded.rfind("\n", 0, match.start()) + 1)
+
+        indexes = []
+        line_index = 0
+        previous = 0
+        for line_start in sorted(line_starts):
+            line_index += folded.count("\n", previous, line_start)
+            previous = line_start
+            indexes.append(line_index)
+        return indexes
+
+    def classify_line(self, line: str) -> List[str]:
+        """All error types whose pattern matches a line (in ERROR_PATTERNS order)"""
+        folded = line.casefold()
+        return [
+            error_type
+            for error_type, pattern, literals in self._compiled
+            if (literals is None or any(literal in folded for literal in literals)) and pattern.search(line)
+        ]
+
     def _determine_severity(self, error_type: str) -> str:
         """Determine error severity"""
         critical_errors = ["database_error", "database_column_length", "model_deprecation", "memory_error", "500"]
@@ -143,8 +282,12 @@ class LogParser:
         end = min(len(lines), index + context_lines + 1)
         return lines[start:end]
 
-    def analyze_error_patterns(self, errors: List[Dict]) -> Dict:
-        """Analyze error patterns to identify recurring issues"""
+    def analyze_error_patterns(self, errors: List[Dict], tracker: ErrorRateTracker = None) -> Dict:
+        """
+        Analyze error patterns to identify recurring issues
+        Rates and spikes are computed from `errors` alone unless a tracker is passed;
+        pass the shared (Redis) tracker, already fed with these errors, for hour-long history.
+        """
         if not errors:
             return {"pattern": "no_errors", "count": 0}
 
@@ -162,9 +305,15 @@ class LogParser:
             "most_common_count": most_common[1],
             "error_distribution": dict(error_counts),
             "severity_breakdown": self._get_severity_breakdown(errors),
-            "requires_immediate_action": self._requires_immediate_action(errors)
         }
 
+        tracker = tracker or ErrorRateTracker.from_errors(errors)
+        pattern_analysis["error_rates"] = tracker.rates()
+        pattern_analysis["spikes"] = tracker.detect_spikes()
+        pattern_analysis["requires_immediate_action"] = self._requires_immediate_action(
+            pattern_analysis["severity_breakdown"], pattern_analysis["error_rates"], pattern_analysis["spikes"]
+        )
+
         return pattern_analysis
 
     def _get_severity_breakdown(self, errors: List[Dict]) -> Dict:
@@ -172,32 +321,22 @@ class LogParser:
         severity_counts = Counter(e.get("severity", "unknown") for e in errors)
         return dict(severity_counts)
 
-    def _requires_immediate_action(self, errors: List[Dict]) -> bool:
-        """Determine if errors require immediate action"""
+    def _requires_immediate_action(self, severity_breakdown: Dict, rates: Dict, spikes: List[Dict]) -> bool:
+        """Determine if errors require immediate action (rates come from the windowed counters)"""
         # Check for critical errors
-        critical_count = sum(1 for e in errors if e.get("severity") == "critical")
-        if critical_count > 0:
+        if severity_breakdown.get("critical", 0) > 0:
             return True
 
         # Check for high error rate
-        if len(errors) > 50:  # More than 50 errors in 5 minutes
+        if rates["last_5_minutes"] > 50:  # More than 50 errors in 5 minutes
             return True
 
         # Check for error rate increase
-        recent_errors = [e for e in errors if self._is_recent(e, minutes=1)]
-        if len(recent_errors) > 20:  # Spike in last minute
+        if rates["last_minute"] > 20:  # Spike in last minute
             return True
 
-        return False
-
-    def _is_recent(self, error: Dict, minutes: int = 1) -> bool:
-        """Check if error is recent"""
-        try:
-            error_time = datetime.fromisoformat(error["timestamp"])
-            cutoff = datetime.utcnow() - timedelta(minutes=minutes)
-            return error_time > cutoff
-        except:
-            return False
+        # Error type running well above its hourly baseline
+        return bool(spikes)
 
     def get_celery_errors(self, since_minutes: int = 5) -> List[Dict]:
         """Get errors from Celery worker logs"""
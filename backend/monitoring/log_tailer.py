@@ -0,0 +1,181 @@
+"""
+Incremental log ingestion for the health monitor
+Follows docker container logs and log files with persisted cursors, so each
+health check parses only the lines written since the previous one:
+- Docker sources resume from the timestamp of the last line read (--timestamps/--since)
+- File sources resume from a byte offset (rotation/truncation restarts at 0)
+- Parsed errors go into a bounded ring buffer for windowed queries
+Cursors and the buffer live in /app/logs so every process (Celery, API) shares them.
+"""
+import fcntl
+import json
+import os
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from monitoring.docker_client import get_docker_client
+from monitoring.error_rates import get_error_rate_tracker
+from monitoring.log_parser import LogParser
+
+
+DEFAULT_CONTAINERS = ["product-trend-celery", "product-trend-backend"]
+RING_BUFFER_SIZE = 1000
+INITIAL_LOOKBACK_MINUTES = 5
+MAX_FILE_READ_BYTES = 50 * 1024 * 1024  # Skip ahead rather than parse a huge backlog at once
+
+
+def docker_timestamp_to_iso(timestamp: str) -> Optional[str]:
+    """
+    Docker RFC3339Nano timestamp -> naive UTC ISO timestamp (microseconds)
+    e.g. "2025-01-01T12:00:00.123456789Z" -> "2025-01-01T12:00:00.123456"
+    """
+    if not timestamp.endswith("Z"):
+        return None
+    seconds, _, fraction = timestamp[:-1].partition(".")
+    return f"{seconds}.{fraction[:6].ljust(6, '0')}" if fraction else seconds
+
+
+class DockerLogSource:
+    """Container stdout/stderr, resumed by log timestamp"""
+
+    def __init__(self, container_name: str):
+        self.name = container_name
+        self.key = f"docker:{container_name}"
+
+    def read_new(self, cursor: Dict) -> Tuple[str, List[Optional[str]], Dict]:
+        """Return (new log text, per-line ISO timestamps, updated cursor)"""
+        since = cursor.get("since") or f"{INITIAL_LOOKBACK_MINUTES}m"
+        stdout, stderr = get_docker_client().logs(self.name, since=since, timestamps=True)
+
+        last_seen = cursor.get("since")
+        lines = []
+        timestamps = []
+        # stdout and stderr are separate streams - merge them back by timestamp
+        for raw in sorted(stdout.splitlines() + stderr.splitlines()):
+            timestamp, _, message = raw.partition(" ")
+            # --since is inclusive: drop the line(s) already consumed last time
+            if last_seen and timestamp <= cursor["since"]:
+                continue
+            lines.append(message)
+            timestamps.append(docker_timestamp_to_iso(timestamp))
+            last_seen = timestamp
+
+        return "\n".join(lines), timestamps, ({"since": last_seen} if last_seen else cursor)
+
+
+class FileLogSource:
+    """Plain log file, resumed by byte offset"""
+
+    def __init__(self, path: str):
+        self.name = os.path.basename(path)
+        self.path = path
+        self.key = f"file:{path}"
+
+    def read_new(self, cursor: Dict) -> Tuple[str, Optional[List[str]], Dict]:
+        """Return (new complete lines, None - timestamps come from the lines, updated cursor)"""
+        if not os.path.exists(self.path):
+            return "", None, cursor
+
+        stat = os.stat(self.path)
+        if "offset" not in cursor:
+            offset = stat.st_size  # New source: only lines written from now on
+        elif cursor.get("inode") != stat.st_ino or stat.st_size < cursor["offset"]:
+            offset = 0  # Rotated or truncated
+        else:
+            offset = cursor["offset"]
+        offset = max(offset, stat.st_size - MAX_FILE_READ_BYTES)
+
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            data = f.read(stat.st_size - offset)
+
+        # Only consume complete lines; a partial last line is read next time
+        end = data.rfind(b"\n") + 1
+        text = data[:end].decode("utf-8", errors="replace")
+        return text, None, {"offset": offset + end, "inode": stat.st_ino}
+
+
+class LogIngester:
+    """Polls log sources from their cursors and buffers the parsed errors"""
+
+    def __init__(self, sources: List = None, state_dir: str = "/app/logs"):
+        self.sources = sources if sources is not None else self._default_sources()
+        self.log_parser = LogParser()
+        self.cursor_file = os.path.join(state_dir, "log_cursors.json")
+        self.buffer_file = os.path.join(state_dir, "recent_errors.json")
+        self.lock_file = os.path.join(state_dir, "log_ingest.lock")
+        self.buffer = deque(maxlen=RING_BUFFER_SIZE)
+        os.makedirs(state_dir, exist_ok=True)
+
+    @staticmethod
+    def _default_sources() -> List:
+        sources = [DockerLogSource(name) for name in DEFAULT_CONTAINERS]
+        for path in filter(None, os.getenv("MONITORED_LOG_FILES", "").split(",")):
+            sources.append(FileLogSource(path.strip()))
+        return sources
+
+    def poll(self, commit: bool = True) -> List[Dict]:
+        """
+        Read every source from its cursor and return only the new errors
+        Holds an exclusive lock so concurrent checks never consume the same lines.
+        commit=False peeks: cursors, buffer and error rates are left untouched, so
+        the lines are still reported to the next committing poll.
+        """
+        new_errors = []
+        with open(self.lock_file, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                cursors = self._load_json(self.cursor_file, {})
+                self._load_buffer()
+
+                for source in self.sources:
+                    try:
+                        text, timestamps, cursors[source.key] = source.read_new(cursors.get(source.key, {}))
+                    except Exception as e:
+                        new_errors.append({
+                            "error": f"Failed to read logs: {str(e)}",
+                            "source": source.name,
+                            "severity": "warning"
+                        })
+                        continue
+                    if text:
+                        new_errors.extend(self.log_parser._extract_errors(text, source=source.name, line_timestamps=timestamps))
+
+                if commit:
+                    self.buffer.extend(e for e in new_errors if "type" in e)
+                    get_error_rate_tracker().record(new_errors)
+                    self._save_json(self.cursor_file, cursors)
+                    self._save_json(self.buffer_file, list(self.buffer))
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+        return new_errors
+
+    def peek(self) -> List[Dict]:
+        """Errors written since the last poll, without consuming them"""
+        return self.poll(commit=False)
+
+    def recent_errors(self, since_minutes: int = 5) -> List[Dict]:
+        """Buffered errors from the last N minutes (no log re-reading)"""
+        self._load_buffer()
+        cutoff = (datetime.utcnow() - timedelta(minutes=since_minutes)).isoformat()
+        return [e for e in self.buffer if e.get("timestamp", "") >= cutoff]
+
+    def _load_buffer(self) -> None:
+        self.buffer = deque(self._load_json(self.buffer_file, []), maxlen=RING_BUFFER_SIZE)
+
+    @staticmethod
+    def _load_json(path: str, default):
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return default
+
+    @staticmethod
+    def _save_json(path: str, data) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
@@ -2,32 +2,56 @@
 Metrics collector for system performance
 Tracks CPU, memory, response times, error rates
 """
-import subprocess
 import psutil
 from typing import Dict
 from datetime import datetime
-from sqlalchemy import text
+from sqlalchemy import text, func
 from models.database import SessionLocal, Product, ProductStatus
+from monitoring.docker_client import get_docker_client
+from monitoring.probes import probe_runner
+from monitoring.timeseries import MetricsTimeSeries
+
+
+psutil.cpu_percent(interval=None)  # First non-blocking reading is meaningless - take it now
 
 
 class MetricsCollector:
     """Collect system metrics"""
 
+    def __init__(self):
+        self.timeseries = MetricsTimeSeries()
+
     def collect_all_metrics(self) -> Dict:
         """Collect all system metrics"""
-        return {
+        # Collected concurrently under the shared probe deadline; docker stats come from
+        # the in-memory stats streams, a probe that misses the deadline returns its last result
+        results = probe_runner.run({
+            "metrics.system": self.get_system_metrics,
+            "metrics.docker": self.get_docker_metrics,
+            "metrics.application": self.get_application_metrics,
+            "metrics.database": self.get_database_metrics
+        })
+        metrics = {
             "timestamp": datetime.utcnow().isoformat(),
-            "system": self.get_system_metrics(),
-            "docker": self.get_docker_metrics(),
-            "application": self.get_application_metrics(),
-            "database": self.get_database_metrics()
+            "system": results["metrics.system"],
+            "docker": results["metrics.docker"],
+            "application": results["metrics.application"],
+            "database": results["metrics.database"]
         }
 
+        try:
+            self.timeseries.record(metrics)
+        except Exception as e:
+            print(f"⚠️  Could not record metrics history: {str(e)}")
+
+        return metrics
+
     def get_system_metrics(self) -> Dict:
         """Get system resource usage"""
         try:
             return {
-                "cpu_percent": psutil.cpu_percent(interval=1),
+                # Non-blocking: usage since the previous call (primed at import)
+                "cpu_percent": psutil.cpu_percent(interval=None),
                 "memory_percent": psutil.virtual_memory().percent,
                 "memory_available_mb": psutil.virtual_memory().available / (1024 * 1024),
                 "disk_percent": psutil.disk_usage('/').percent,
@@ -42,26 +66,20 @@ class MetricsCollector:
     def get_docker_metrics(self) -> Dict:
         """Get Docker container metrics"""
         try:
-            # Get container stats
-            result = subprocess.run(
-                ["docker", "stats", "--no-stream", "--format",
-                 "{{.Name}}\t{{.CPUPerc}}\t{{.MemPerc}}\t{{.MemUsage}}"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-
+            # Latest samples from the streamed container stats
+            client = get_docker_client()
             containers = {}
-            for line in result.stdout.strip().split("\n"):
-                if line:
-                    parts = line.split("\t")
-                    if len(parts) >= 4:
-                        name = parts[0]
-                        containers[name] = {
-                            "cpu_percent": parts[1].replace("%", ""),
-                            "memory_percent": parts[2].replace("%", ""),
-                            "memory_usage": parts[3]
-                        }
+            for container in client.list_containers():
+                stats = client.container_stats(container["name"])
+                if stats is None:
+                    # Stream just started - its first sample lands within about a second
+                    containers[container["name"]] = {"status": "pending"}
+                    continue
+                containers[container["name"]] = {
+                    "cpu_percent": stats["cpu_percent"],
+                    "memory_percent": stats["memory_percent"],
+                    "memory_usage": stats["memory_usage"]
+                }
 
             return {
                 "status": "healthy",
@@ -77,23 +95,18 @@ class MetricsCollector:
         """Get application-specific metrics"""
         db = SessionLocal()
         try:
-            # Count products by status
-            total_products = db.query(Product).count()
-            discovered = db.query(Product).filter(Product.status == ProductStatus.DISCOVERED).count()
-            analyzing = db.query(Product).filter(Product.status == ProductStatus.ANALYZING).count()
-            pending_review = db.query(Product).filter(Product.status == ProductStatus.PENDING_REVIEW).count()
-            approved = db.query(Product).filter(Product.status == ProductStatus.APPROVED).count()
-            rejected = db.query(Product).filter(Product.status == ProductStatus.REJECTED).count()
+            # Count products by status (one grouped query)
+            counts = dict(db.query(Product.status, func.count(Product.id)).group_by(Product.status).all())
 
             return {
                 "status": "healthy",
                 "products": {
-                    "total": total_products,
-                    "discovered": discovered,
-                    "analyzing": analyzing,
-                    "pending_review": pending_review,
-                    "approved": approved,
-                    "rejected": rejected
+                    "total": sum(counts.values()),
+                    "discovered": counts.get(ProductStatus.DISCOVERED, 0),
+                    "analyzing": counts.get(ProductStatus.ANALYZING, 0),
+                    "pending_review": counts.get(ProductStatus.PENDING_REVIEW, 0),
+                    "approved": counts.get(ProductStatus.APPROVED, 0),
+                    "rejected": counts.get(ProductStatus.REJECTED, 0)
                 }
             }
         except Exception as e:
@@ -0,0 +1,82 @@
+"""
+Concurrent health probes with a deadline and a short result cache
+Every probe runs on a shared thread pool; a snapshot waits at most `deadline`
+seconds for all of them together, so one slow probe (docker) never holds it up.
+A probe that is still running keeps going in the background and its result is
+cached when it lands, so the next snapshot can use it. Until then the last known
+result is returned (marked stale), or "unknown" (marked pending) if it has never completed.
+"""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict
+
+
+PROBE_TTL_SECONDS = 10
+PROBE_DEADLINE_SECONDS = 0.8
+
+
+class ProbeRunner:
+    """Runs named probes concurrently, reusing fresh or in-flight results"""
+
+    def __init__(self, max_workers: int = 8, ttl_seconds: float = PROBE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="probe")
+        self._results: Dict[str, tuple] = {}     # name -> (completed_at, result)
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.RLock()  # add_done_callback may call _store inline
+
+    @staticmethod
+    def _outcome(future: Future) -> Dict:
+        try:
+            return future.result()
+        except Exception as e:
+            return {"status": "critical", "message": f"Probe failed: {str(e)}", "error": str(e)}
+
+    def _store(self, name: str, future: Future) -> None:
+        result = self._outcome(future)
+        with self._lock:
+            self._results[name] = (time.monotonic(), result)
+            self._inflight.pop(name, None)
+
+    def run(self, probes: Dict[str, Callable[[], Dict]], deadline: float = PROBE_DEADLINE_SECONDS) -> Dict[str, Dict]:
+        """Results for every probe, returned within `deadline` seconds"""
+        now = time.monotonic()
+        results: Dict[str, Dict] = {}
+        pending: Dict[str, Future] = {}
+
+        with self._lock:
+            for name, probe in probes.items():
+                cached = self._results.get(name)
+                if cached and now - cached[0] < self.ttl_seconds:
+                    results[name] = cached[1]
+                    continue
+                future = self._inflight.get(name)
+                if future is None:
+                    future = self._executor.submit(probe)
+                    self._inflight[name] = future
+                    future.add_done_callback(lambda f, name=name: self._store(name, f))
+                pending[name] = future
+
+        if pending:
+            wait(pending.values(), timeout=deadline)
+
+        with self._lock:
+            for name, future in pending.items():
+                cached = self._results.get(name)
+                if future.done():
+                    results[name] = self._outcome(future)
+                elif cached:
+                    results[name] = dict(cached[1], stale=True)
+                else:
+                    results[name] = {
+                        "status": "unknown",
+                        "pending": True,
+                        "message": f"No response within {deadline}s (still running)"
+                    }
+
+        return results
+
+
+# Shared by the health checker and metrics collector
+probe_runner = ProbeRunner()
@@ -0,0 +1,172 @@
+"""
+Prometheus metrics registry
+Shared metric definitions exposed on /metrics (FastAPI) and by the Celery
+worker and analysis stream consumer exporters. When PROMETHEUS_MULTIPROC_DIR is set (Celery prefork),
+samples from all child processes are aggregated at scrape time.
+"""
+import os
+import shutil
+from typing import Tuple
+
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram, CONTENT_TYPE_LATEST,
+    generate_latest, start_http_server, REGISTRY
+)
+from prometheus_client import multiprocess
+
+
+# ==================== LLM AGENT METRICS ====================
+
+LLM_LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 3, 5, 8, 12, 20, 30, 45, 60)
+
+LLM_REQUEST_LATENCY = Histogram(
+    "llm_request_latency_seconds",
+    "Latency of LLM API calls per agent and model",
+    ["agent", "model", "provider"],
+    buckets=LLM_LATENCY_BUCKETS
+)
+
+LLM_REQUESTS = Counter(
+    "llm_requests_total",
+    "LLM API calls by outcome",
+    ["agent", "model", "provider", "status"]
+)
+
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens consumed by LLM calls",
+    ["agent", "model", "kind"]  # kind: prompt | completion
+)
+
+LLM_COST = Counter(
+    "llm_cost_usd_total",
+    "Estimated LLM spend in USD",
+    ["agent", "model"]
+)
+
+LLM_RATE_LIMITED = Counter(
+    "llm_rate_limited_total",
+    "HTTP 429 responses from LLM providers",
+    ["agent", "model", "provider"]
+)
+
+LLM_RETRIES = Counter(
+    "llm_retries_total",
+    "Retried LLM API calls",
+    ["agent", "model", "provider"]
+)
+
+LLM_PARSE_FAILURES = Counter(
+    "llm_parse_failures_total",
+    "Agent responses that could not be parsed as JSON",
+    ["agent", "model"]
+)
+
+LLM_HEDGED_REQUESTS = Counter(
+    "llm_hedged_requests_total",
+    "Backup requests sent after a call exceeded its p95 latency",
+    ["agent", "model", "outcome"]  # outcome: won | lost
+)
+
+LLM_CACHE_HITS = Counter(
+    "llm_cache_hits_total",
+    "Agent results served without calling the model",
+    ["agent"]
+)
+
+
+# ==================== API METRICS ====================
+
+HTTP_REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "FastAPI request latency by route template",
+    ["method", "route", "status_code"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "FastAPI requests currently being served",
+    ["method"],
+    multiprocess_mode="livesum"
+)
+
+
+# ==================== CELERY METRICS ====================
+
+CELERY_TASK_DURATION = Histogram(
+    "celery_task_duration_seconds",
+    "Celery task (and analysis stream message) run time by final state",
+    ["task", "state"],
+    buckets=(0.1, 0.5, 1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600)
+)
+
+
+# ==================== PIPELINE METRICS ====================
+
+SCANNER_FETCH_DURATION = Histogram(
+    "scanner_source_fetch_seconds",
+    "Time to fetch products from one trend source",
+    ["source"],
+    buckets=(0.1, 0.5, 1, 2, 5, 10, 20, 30, 60, 120)
+)
+
+SCANNER_SOURCE_ERRORS = Counter(
+    "scanner_source_errors_total",
+    "Trend source scans that raised",
+    ["source"]
+)
+
+PRODUCTS_INGESTED = Counter(
+    "products_ingested_total",
+    "Scanned products by outcome",
+    ["source", "result"]  # result: created | updated | skipped | filtered
+)
+
+ANALYSIS_BACKLOG = Gauge(
+    "analysis_backlog_products",
+    "Products waiting in each pipeline status",
+    ["status"],
+    multiprocess_mode="livemax"
+)
+
+
+# ==================== EXPOSITION ====================
+
+def _multiprocess_dir() -> str:
+    return os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
+
+
+def _collection_registry() -> CollectorRegistry:
+    """Registry to scrape - aggregates per-process files in multiprocess mode"""
+    if _multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def metrics_response() -> Tuple[bytes, str]:
+    """Render all metrics in Prometheus text format"""
+    return generate_latest(_collection_registry()), CONTENT_TYPE_LATEST
+
+
+def reset_multiprocess_dir() -> None:
+    """Clear stale per-process metric files (call once before workers fork)"""
+    path = _multiprocess_dir()
+    if not path:
+        return
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def start_exporter(port: int) -> None:
+    """Serve /metrics from a standalone HTTP server (Celery workers, analysis stream consumer)"""
+    start_http_server(port, registry=_collection_registry())
+    print(f"📈 Prometheus exporter listening on :{port}")
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop live gauges of an exited worker child in multiprocess mode"""
+    if _multiprocess_dir():
+        multiprocess.mark_process_dead(pid)
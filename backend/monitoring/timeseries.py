@@ -0,0 +1,171 @@
+"""
+Time-series store for collected metrics
+Each numeric metric (e.g. "system.cpu_percent", "docker.product-trend-celery.memory_percent")
+is kept as fixed-size ring buffers at three resolutions:
+- 1m buckets for the last 6 hours
+- 5m buckets for the last 2 days
+- 1h buckets for the last 30 days
+A bucket holds count/sum/min/max, so every resolution is updated in O(1) per sample
+and ranges are read without touching the raw monitoring reports. Each series is one
+fixed-size file under /app/logs/metrics_timeseries/, memory-mapped: recording a
+sample rewrites three slots of that series' file only, and a query maps only the
+series it reads.
+"""
+import fcntl
+import math
+import mmap
+import os
+import struct
+import time
+from typing import Dict, List, Optional
+from urllib.parse import quote, unquote
+
+
+# resolution -> (bucket seconds, slots)
+RESOLUTIONS = {
+    "1m": (60, 360),
+    "5m": (300, 576),
+    "1h": (3600, 720),
+}
+
+# One slot: bucket number, count, sum, min, max
+SLOT = struct.Struct("<qqddd")
+SERIES_FILE_SIZE = sum(slots for _, slots in RESOLUTIONS.values()) * SLOT.size
+SERIES_SUFFIX = ".series"
+
+
+def flatten_metrics(metrics: Dict, prefix: str = "") -> Dict[str, float]:
+    """Numeric leaves of a collect_all_metrics() dict as {"a.b.c": value}"""
+    values = {}
+    for key, value in metrics.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            if not value.get("stale"):  # Cached probe result - already recorded
+                values.update(flatten_metrics(value, f"{name}."))
+        elif isinstance(value, bool):
+            continue
+        elif isinstance(value, (int, float)):
+            values[name] = float(value)
+        elif isinstance(value, str):
+            try:
+                values[name] = float(value)
+            except ValueError:
+                continue
+    return values
+
+
+class RingSeries:
+    """One metric at one resolution: a region of `slots` slots in a series file, indexed by bucket % slots"""
+
+    def __init__(self, buffer, offset: int, bucket_seconds: int, slots: int):
+        self.buffer = buffer
+        self.offset = offset
+        self.bucket_seconds = bucket_seconds
+        self.slots = slots
+
+    def _position(self, bucket: int) -> int:
+        return self.offset + (bucket % self.slots) * SLOT.size
+
+    def add(self, timestamp: float, value: float) -> None:
+        bucket = int(timestamp // self.bucket_seconds)
+        position = self._position(bucket)
+        stored, count, total, low, high = SLOT.unpack_from(self.buffer, position)
+        if stored != bucket or not count:
+            if count and stored > bucket:
+                return  # Older than the retained window
+            count, total, low, high = 0, 0.0, value, value
+        SLOT.pack_into(self.buffer, position, bucket, count + 1, total + value, min(low, value), max(high, value))
+
+    def points(self, start: float, end: float) -> List[Dict]:
+        first, last = int(start // self.bucket_seconds), int(end // self.bucket_seconds)
+        first = max(first, last - self.slots + 1)
+        points = []
+        for bucket in range(first, last + 1):
+            stored, count, total, low, high = SLOT.unpack_from(self.buffer, self._position(bucket))
+            if stored == bucket and count:
+                points.append({
+                    "timestamp": bucket * self.bucket_seconds,
+                    "avg": round(total / count, 4),
+                    "min": low,
+                    "max": high,
+                    "count": count
+                })
+        return points
+
+
+def _rings(buffer) -> Dict[str, RingSeries]:
+    """The three resolutions laid out back to back in one series file"""
+    rings, offset = {}, 0
+    for res, (seconds, slots) in RESOLUTIONS.items():
+        rings[res] = RingSeries(buffer, offset, seconds, slots)
+        offset += slots * SLOT.size
+    return rings
+
+
+class MetricsTimeSeries:
+    """Ring-buffered metric series, shared by all processes through /app/logs"""
+
+    def __init__(self, state_dir: str = "/app/logs"):
+        self.series_dir = os.path.join(state_dir, "metrics_timeseries")
+        os.makedirs(self.series_dir, exist_ok=True)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.series_dir, quote(name, safe="") + SERIES_SUFFIX)
+
+    def record(self, metrics: Dict, timestamp: float = None) -> int:
+        """Add every numeric value of a metrics snapshot; returns how many series were updated"""
+        values = flatten_metrics(metrics)
+        timestamp = timestamp or time.time()
+
+        for name, value in values.items():
+            if not math.isfinite(value):
+                continue
+            fd = os.open(self._path(name), os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                if os.fstat(fd).st_size != SERIES_FILE_SIZE:
+                    os.ftruncate(fd, 0)  # New series, or the resolutions changed
+                    os.ftruncate(fd, SERIES_FILE_SIZE)
+                with mmap.mmap(fd, SERIES_FILE_SIZE) as buffer:
+                    for ring in _rings(buffer).values():
+                        ring.add(timestamp, value)
+            finally:
+                os.close(fd)  # Releases the lock
+        return len(values)
+
+    def names(self) -> List[str]:
+        return sorted(
+            unquote(filename[:-len(SERIES_SUFFIX)])
+            for filename in os.listdir(self.series_dir) if filename.endswith(SERIES_SUFFIX)
+        )
+
+    def query(self, name: str, minutes: int = 60, resolution: Optional[str] = None, end: float = None) -> Dict:
+        """Points for one series over the last `minutes` (resolution picked from the range if not given)"""
+        end = end or time.time()
+        if resolution is None:
+            resolution = next(
+                (res for res, (seconds, slots) in RESOLUTIONS.items() if minutes * 60 <= seconds * slots),
+                "1h"
+            )
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown resolution '{resolution}' (use {', '.join(RESOLUTIONS)})")
+
+        points = []
+        try:
+            fd = os.open(self._path(name), os.O_RDONLY)
+        except FileNotFoundError:
+            fd = None
+        if fd is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_SH)
+                if os.fstat(fd).st_size == SERIES_FILE_SIZE:
+                    with mmap.mmap(fd, SERIES_FILE_SIZE, access=mmap.ACCESS_READ) as buffer:
+                        points = _rings(buffer)[resolution].points(end - minutes * 60, end)
+            finally:
+                os.close(fd)
+
+        return {
+            "name": name,
+            "resolution": resolution,
+            "points": points
+        }
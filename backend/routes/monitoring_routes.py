@@ -2,12 +2,14 @@
 API routes for autonomous monitoring system
 """
 from fastapi import APIRouter, HTTPException
-from typing import Dict
+from typing import Dict, Optional
 from datetime import datetime
 
 from agents.devops.autonomous_coordinator import AutonomousCoordinator
 from agents.devops.health_monitor import HealthMonitorAgent
 from agents.devops.learning_engine import LearningEngine
+from monitoring.error_clusters import ErrorClusterStore
+from monitoring.timeseries import MetricsTimeSeries
 from safety.backup_manager import BackupManager
 
 router = APIRouter(prefix="/api/monitoring", tags=["monitoring"])
@@ -28,6 +30,59 @@ def get_system_health():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/errors/recent")
+def get_recent_errors(minutes: int = 5):
+    """Get errors ingested from container logs in the last N minutes"""
+    try:
+        monitor = HealthMonitorAgent()
+        errors = monitor.get_recent_errors(since_minutes=minutes)
+
+        return {
+            "status": "success",
+            "data": errors
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/errors/clusters")
+def get_error_clusters(limit: int = 20):
+    """Get the most frequent error templates seen across monitoring runs"""
+    try:
+        return {
+            "status": "success",
+            "data": ErrorClusterStore().top_clusters(limit=limit)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/metrics/series")
+def list_metric_series():
+    """List recorded metric series names"""
+    try:
+        return {
+            "status": "success",
+            "data": MetricsTimeSeries().names()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/metrics/series/{name}")
+def get_metric_series(name: str, minutes: int = 60, resolution: Optional[str] = None):
+    """Get a metric's history over the last N minutes (resolution: 1m, 5m or 1h)"""
+    try:
+        return {
+            "status": "success",
+            "data": MetricsTimeSeries().query(name, minutes=minutes, resolution=resolution)
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/status")
 def get_autonomous_status():
     """Get autonomous system status"""
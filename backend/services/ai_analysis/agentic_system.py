@@ -10,17 +10,66 @@ Each agent has specialized responsibilities:
 import json
 import requests
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, Callable, List, Tuple
 from datetime import datetime
 import asyncio
+import threading
 import time
 
+from services.ai_analysis.json_stream import IncrementalJSONParser, parse_json_response
+from services.ai_analysis.llm_telemetry import llm_telemetry, AnalysisTelemetry, estimate_tokens
+from services.ai_analysis.retry_policy import groq_retry_policy, perplexity_retry_policy, RETRYABLE_STATUS_CODES
+from services.ai_analysis.model_router import model_router
+
+
+class GroqCallError(Exception):
+    """Failed Groq call against one model (status_code is None for network errors)"""
+
+    def __init__(self, message: str, status_code: int = None):
+        super().__init__(message)
+        self.status_code = status_code
+
 
 class AgenticAISystem:
     """
     Multi-agent system for comprehensive product analysis
     """
 
+    # Groq models that accept response_format={"type": "json_object"}
+    # JSON mode cannot be streamed, so other models stream through the incremental parser
+    JSON_MODE_MODELS = {"llama-3.3-70b-versatile", "llama-3.1-8b-instant"}
+
+    # Top-level fields each agent must return - streaming stops once all are present
+    AGENT_REQUIRED_FIELDS = {
+        "scanner": ["ai_category", "ai_keywords", "ai_description", "key_features",
+                    "target_audience", "product_positioning"],
+        "trend": ["trend_strength", "demand_trajectory", "seasonal_factor", "seasonal_pattern",
+                  "trend_confidence", "trend_insights", "hype_cycle_phase", "risk_assessment",
+                  "forecast_horizon", "data_quality_score"],
+        "research": ["competition_level", "competitive_dynamics", "suggested_price", "pricing_strategy",
+                     "profit_margin_estimate_percent", "profit_margin_estimate_dollars", "cost_breakdown",
+                     "market_risks", "financial_scenarios", "profit_potential_score", "opportunity_score",
+                     "market_saturation", "barriers_to_entry", "recommendation"],
+        "quality": ["quality_score", "return_rate_prediction", "supplier_reliability",
+                    "manufacturing_concerns", "quality_risks"],
+        "pricing": ["optimal_price", "profit_margin_percent", "price_elasticity",
+                    "psychological_price", "pricing_strategy"],
+        "viral": ["virality_score", "best_platform", "viral_triggers", "influencer_potential", "trend_lifecycle"],
+        "competition": ["market_saturation", "competitor_count", "competitive_advantage",
+                        "market_entry_difficulty", "blue_ocean_potential"],
+        "supply_chain": ["sourcing_difficulty", "lead_time_days", "shipping_cost_estimate",
+                         "fulfillment_method", "supplier_availability"],
+        "psychology": ["product_market_fit", "customer_pain_point", "emotional_triggers",
+                       "target_demographic", "purchase_intent_score"],
+        "data_science": ["30_day_forecast", "60_day_forecast", "90_day_forecast", "peak_season", "demand_score"],
+        # Coordinator: only the fields consumed by final_analysis (next_steps etc. are not needed)
+        "coordinator": ["recommendation", "confidence_score", "ai_category", "ai_keywords", "ai_description",
+                        "suggested_price", "profit_potential_score", "competition_level", "reasoning"],
+    }
+
+    # Pause before re-running an agent that was still throttled after HTTP-level retries
+    AGENT_RETRY_DELAY_SECONDS = 5.0
+
     def __init__(self, groq_api_key: str = None, huggingface_api_key: str = None, perplexity_api_key: str = None):
         self.groq_api_key = groq_api_key or os.getenv("GROQ_API_KEY")
         self.hf_api_key = huggingface_api_key or os.getenv("HUGGINGFACE_API_KEY")
@@ -54,6 +103,14 @@ class AgenticAISystem:
         # PERPLEXITY - Real-time Web Search & Market Research
         self.perplexity_model = "sonar"  # Updated to valid Perplexity model
 
+        # Telemetry for the analysis in progress (reset per product)
+        self._analysis_telemetry = AnalysisTelemetry()
+        self._last_call = {"agent": None, "model": None}
+        self._throttled_agents = set()
+
+        # Hedged requests: backup call to the next candidate model past the p95 deadline
+        self.hedged_requests = os.getenv("LLM_HEDGED_REQUESTS", "false").lower() == "true"
+
         print(f"[AgenticAI] 🎓 EXPANDED EXPERT TEAM - 12 Professional Specialists")
         print(f"  🚀 ALL MODELS NOW USING GROQ (100% FREE & FAST)")
         print(f"  🧠 UPGRADED: Qwen3 32B for ADVANCED REASONING (replaces deprecated QwQ)")
@@ -79,12 +136,16 @@ class AgenticAISystem:
         print(f"")
         print(f"  ✅ All 12 agents: GROQ (11) + PERPLEXITY (1) - Minimal API costs!")
 
-    async def analyze_product_multi_agent(self, product) -> Dict[str, Any]:
+    async def analyze_product_multi_agent(self, product, checkpoint=None) -> Dict[str, Any]:
         """
         Orchestrate multi-agent analysis of a product
         Agents run sequentially with 0.8s delays to respect Groq free tier rate limits
+        With a checkpoint (AnalysisCheckpoint), each agent result is persisted as it
+        completes and agents already completed by an interrupted run are not re-run
         """
         analysis_start = time.time()
+        self._analysis_telemetry = AnalysisTelemetry()
+        self._throttled_agents = set()
 
         print(f"\n{'='*60}")
         print(f"🚀 [MULTI-AGENT AI] Starting analysis")
@@ -92,79 +153,44 @@ class AgenticAISystem:
         print(f"   System: 12-Agent Architecture (Sequential - Rate Limit Optimized)")
         print(f"{'='*60}\n")
 
+        # Completed agent results survive a later failure (partial-result preservation)
+        agent_results: Dict[str, Dict[str, Any]] = self._load_checkpoint(checkpoint)
+        coordinator_result = agent_results.pop("coordinator", None)
+
         try:
             # Step 1: Run ALL 11 specialist agents SEQUENTIALLY (to avoid rate limits)
             print("📋 [PHASE 1] Deploying 11 specialist agents sequentially...")
             print("   ⏱️  Rate-limit friendly: 0.8s delay between agents")
             phase1_start = time.time()
 
-            # Core team (3 agents) - Run sequentially with delays
-            scanner_result = await self._run_scanner_agent(product)
-            await asyncio.sleep(0.8)  # Delay to respect Groq rate limits
-
-            trend_result = await self._run_trend_agent(product)
-            await asyncio.sleep(0.8)
-
-            research_result = await self._run_research_agent(product)
-            await asyncio.sleep(0.8)
-
-            # Quality & Pricing team (2 agents)
-            quality_result = await self._run_quality_agent(product)
-            await asyncio.sleep(0.8)
-
-            pricing_result = await self._run_pricing_agent(product)
-            await asyncio.sleep(0.8)
-
-            # Market specialists (2 agents)
-            viral_result = await self._run_viral_agent(product)
-            await asyncio.sleep(0.8)
-
-            competition_result = await self._run_competition_agent(product)
-            await asyncio.sleep(0.8)
-
-            # Operations team (3 agents)
-            supply_result = await self._run_supply_chain_agent(product)
-            await asyncio.sleep(0.8)
-
-            psychology_result = await self._run_psychology_agent(product)
-            await asyncio.sleep(0.8)
-
-            data_science_result = await self._run_data_science_agent(product)
-            await asyncio.sleep(0.8)
+            agents = [(name, runner) for name, runner in self._specialist_agents() if name not in agent_results]
+            for index, (agent_name, runner) in enumerate(agents):
+                agent_results[agent_name] = await self._run_agent_safely(agent_name, runner, product)
+                if checkpoint:
+                    checkpoint.save(agent_name, agent_results[agent_name])
+                if index < len(agents) - 1:
+                    await asyncio.sleep(0.8)  # Delay to respect Groq rate limits
 
-            # Web search team (1 agent)
-            perplexity_result = await self._run_perplexity_agent(product)
-            # No delay after last agent
+            # Agents that fell back because of throttling get one more try - only they are re-run
+            for agent_name in await self._retry_throttled_agents(product, agent_results):
+                if checkpoint:
+                    checkpoint.save(agent_name, agent_results[agent_name])
 
             phase1_time = time.time() - phase1_start
 
-            # Handle exceptions for all agents
-            agent_results = {
-                "scanner": scanner_result,
-                "trend": trend_result,
-                "research": research_result,
-                "quality": quality_result,
-                "pricing": pricing_result,
-                "viral": viral_result,
-                "competition": competition_result,
-                "supply_chain": supply_result,
-                "psychology": psychology_result,
-                "data_science": data_science_result,
-                "perplexity": perplexity_result
-            }
-
-            for agent_name, result in agent_results.items():
-                if isinstance(result, Exception):
-                    print(f"\n❌ [{agent_name.title()} Agent] Error: {result}")
-                    agent_results[agent_name] = {"status": "failed", "error": str(result)}
-
             print(f"\n✅ [PHASE 1] All 11 specialist agents completed sequentially in {phase1_time:.2f}s\n")
 
             # Step 2: Coordinator agent synthesizes results from all 11 agents
             print("📋 [PHASE 2] Coordinator synthesizing results from 11 agents...")
             phase2_start = time.time()
 
-            final_analysis = await self._run_coordinator_agent(product, agent_results)
+            if coordinator_result:
+                print("   ♻️  Coordinator decision restored from checkpoint")
+                final_analysis = coordinator_result
+            else:
+                final_analysis = await self._run_coordinator_agent(product, agent_results)
+                if checkpoint:
+                    checkpoint.save("coordinator", final_analysis)
 
             phase2_time = time.time() - phase2_start
             total_time = time.time() - analysis_start
@@ -175,8 +201,10 @@ class AgenticAISystem:
             print(f"   Total Time: {total_time:.2f}s (Phase 1: {phase1_time:.2f}s, Phase 2: {phase2_time:.2f}s)")
             print(f"   Agents Deployed: 10 Specialists + 1 Coordinator = 11 Total")
             print(f"   Analysis Depth: MAXIMUM (All specialist teams)")
+            self._print_agent_timings()
             print(f"{'='*60}\n")
 
+            final_analysis["agent_metrics"] = self._analysis_telemetry.summary()
             return final_analysis
 
         except Exception as e:
@@ -184,9 +212,91 @@ class AgenticAISystem:
             print(f"\n{'='*60}")
             print(f"❌ [MULTI-AGENT AI] ERROR after {total_time:.2f}s")
             print(f"   Error: {str(e)[:100]}")
-            print(f"   Falling back to rule-based analysis...")
+            print(f"   Falling back to rule-based analysis ({len(agent_results)} agent results preserved)...")
             print(f"{'='*60}\n")
-            return self._fallback_analysis(product)
+            fallback = self._fallback_analysis(product, agent_results)
+            fallback["agent_metrics"] = self._analysis_telemetry.summary()
+            return fallback
+
+    def _specialist_agents(self) -> List[Tuple[str, Callable]]:
+        """Specialist agents in execution order"""
+        return [
+            # Core team (3 agents)
+            ("scanner", self._run_scanner_agent),
+            ("trend", self._run_trend_agent),
+            ("research", self._run_research_agent),
+            # Quality & Pricing team (2 agents)
+            ("quality", self._run_quality_agent),
+            ("pricing", self._run_pricing_agent),
+            # Market specialists (2 agents)
+            ("viral", self._run_viral_agent),
+            ("competition", self._run_competition_agent),
+            # Operations team (3 agents)
+            ("supply_chain", self._run_supply_chain_agent),
+            ("psychology", self._run_psychology_agent),
+            ("data_science", self._run_data_science_agent),
+            # Web search team (1 agent)
+            ("perplexity", self._run_perplexity_agent),
+        ]
+
+    async def _run_agent_safely(self, agent_name: str, runner: Callable, product) -> Dict[str, Any]:
+        """Run one agent; an unexpected error only fails that agent"""
+        try:
+            return await runner(product)
+        except Exception as e:
+            print(f"\n❌ [{agent_name.title()} Agent] Error: {e}")
+            return {"status": "failed", "error": str(e)}
+
+    async def _retry_throttled_agents(self, product, agent_results: Dict[str, Dict[str, Any]]) -> List[str]:
+        """
+        Re-run agents whose API calls were still throttled after the HTTP-level retries
+        Results of every other agent are kept as-is; returns the agents that recovered
+        """
+        throttled = [
+            name for name, result in agent_results.items()
+            if result.get("status") in ("fallback", "failed") and name in self._throttled_agents
+        ]
+        recovered = []
+        if not throttled:
+            return recovered
+
+        runners = dict(self._specialist_agents())
+        print(f"   🔁 Retrying throttled agents: {', '.join(throttled)}")
+        for agent_name in throttled:
+            self._throttled_agents.discard(agent_name)
+            await asyncio.sleep(self.AGENT_RETRY_DELAY_SECONDS)
+            result = await self._run_agent_safely(agent_name, runners[agent_name], product)
+            if result.get("status") not in ("fallback", "failed"):
+                print(f"   ✅ [{agent_name}] recovered on retry")
+                agent_results[agent_name] = result
+                recovered.append(agent_name)
+        return recovered
+
+    def _load_checkpoint(self, checkpoint) -> Dict[str, Dict[str, Any]]:
+        """Agent results completed by an earlier, interrupted run of this analysis"""
+        if not checkpoint:
+            return {}
+        try:
+            completed = checkpoint.completed()
+        except Exception as e:
+            print(f"   ⚠️  Could not load analysis checkpoint: {str(e)[:80]}")
+            return {}
+
+        if completed:
+            print(f"♻️  Resuming analysis - reusing {len(completed)} checkpointed agent results: {', '.join(sorted(completed))}")
+            for agent in completed:
+                llm_telemetry.record_cache_hit(agent, analysis=self._analysis_telemetry)
+        return completed
+
+    def _print_agent_timings(self):
+        """Print per-agent time share for the analysis just completed"""
+        summary = self._analysis_telemetry.summary()
+        if not summary["agents"]:
+            return
+        print(f"   LLM Time by Agent (tokens in/out, est. cost ${summary['total_cost_usd']:.4f}):")
+        for agent, stats in summary["agents"].items():
+            print(f"     • {agent:<13} {stats['latency_seconds']:>6.2f}s ({stats['share_of_time']*100:>4.1f}%)"
+                  f"  {stats['prompt_tokens']}/{stats['completion_tokens']} tokens")
 
     async def _run_scanner_agent(self, product) -> Dict[str, Any]:
         """
@@ -325,7 +435,7 @@ Think like a PhD researcher who analyzed 50,000+ products at Google. Use data-dr
             # Try Groq first (faster)
             try:
                 print("   📡 Calling Groq API (Llama-3.3 70B)...")
-                result = await self._call_groq_model(self.groq_scanner_model, prompt)
+                result = await self._call_groq_model(self.groq_scanner_model, prompt, agent="scanner")
                 parsed = self._parse_json_response(result)
                 print("   ✅ Analysis complete (Llama-3.3 70B via Groq)")
                 print(f"   📊 Extracted: {len(parsed.get('ai_keywords', []))} keywords, category: {parsed.get('ai_category', 'N/A')}")
@@ -333,7 +443,7 @@ Think like a PhD researcher who analyzed 50,000+ products at Google. Use data-dr
             except Exception as groq_err:
                 print(f"   ⚠️ Primary Groq model failed: {str(groq_err)[:80]}")
                 print(f"   📡 Falling back to Llama-3.1 8B (Groq)...")
-                result = await self._call_groq_model(self.hf_scanner_model, prompt)  # Now also Groq model
+                result = await self._call_groq_model(self.hf_scanner_model, prompt, agent="scanner")  # Now also Groq model
                 parsed = self._parse_json_response(result)
                 print("   ✅ Analysis complete (Llama-3.1 8B via Groq)")
                 print(f"   📊 Extracted: {len(parsed.get('ai_keywords', []))} keywords, category: {parsed.get('ai_category', 'N/A')}")
@@ -534,7 +644,7 @@ Think like a PhD data scientist who forecasted 1000+ product trends at Nielsen a
             # Try Qwen3 32B via Groq first (advanced reasoning)
             try:
                 print("   📡 Calling Groq API (Qwen3 32B)...")
-                result = await self._call_groq_model(self.groq_trend_model, prompt)
+                result = await self._call_groq_model(self.groq_trend_model, prompt, agent="trend")
                 parsed = self._parse_json_response(result)
                 print("   ✅ Trend analysis complete (Qwen3 32B via Groq)")
                 print(f"   📊 Result: {parsed.get('trend_strength', 'N/A')} trend, {parsed.get('demand_trajectory', 'N/A')} demand")
@@ -543,7 +653,7 @@ Think like a PhD data scientist who forecasted 1000+ product trends at Nielsen a
             except Exception as groq_err:
                 print(f"   ⚠️ Qwen3 32B failed: {str(groq_err)[:80]}")
                 print(f"   📡 Falling back to Llama-3.1 8B (Groq)...")
-                result = await self._call_groq_model("llama-3.1-8b-instant", prompt)
+                result = await self._call_groq_model("llama-3.1-8b-instant", prompt, agent="trend")
                 parsed = self._parse_json_response(result)
                 print("   ✅ Trend analysis complete (Llama-3.1 8B fallback)")
                 print(f"   📊 Result: {parsed.get('trend_strength', 'N/A')} trend, {parsed.get('demand_trajectory', 'N/A')} demand")
@@ -834,7 +944,7 @@ Think like a CFA analyzing an e-commerce investment with your own money on the l
 
         try:
             print("   📡 Calling Groq API (Qwen3 32B)...")
-            result = await self._call_groq_model(self.hf_research_model, prompt)  # Now Qwen Qwen3 32B
+            result = await self._call_groq_model(self.hf_research_model, prompt, agent="research")  # Now Qwen Qwen3 32B
             parsed = self._parse_json_response(result)
             print("   ✅ Market research complete (Qwen Qwen3 32B)")
             print(f"   📊 Profit Score: {parsed.get('profit_potential_score', 0)}/100")
@@ -917,7 +1027,7 @@ QUALITY STANDARDS:
 Think: Would I buy this for myself? What could go wrong?"""
 
         try:
-            result = await self._call_groq_model(self.hf_quality_model, prompt)  # Now Groq model
+            result = await self._call_groq_model(self.hf_quality_model, prompt, agent="quality")  # Now Groq model
             parsed = self._parse_json_response(result)
             print(f"   ✅ Quality assessment complete: {parsed.get('quality_score', 0)}/100")
             return parsed
@@ -980,7 +1090,7 @@ QUALITY STANDARDS:
 Think: What price makes the most total profit?"""
 
         try:
-            result = await self._call_groq_model(self.hf_pricing_model, prompt)  # Now Groq model
+            result = await self._call_groq_model(self.hf_pricing_model, prompt, agent="pricing")  # Now Groq model
             parsed = self._parse_json_response(result)
             print(f"   ✅ Pricing complete: ${parsed.get('optimal_price', 0):.2f}")
             return parsed
@@ -1039,7 +1149,7 @@ REQUIRED OUTPUT (JSON):
 Think: Would I share this with friends? Why or why not?"""
 
         try:
-            result = await self._call_groq_model(self.hf_viral_model, prompt)  # Now Groq model
+            result = await self._call_groq_model(self.hf_viral_model, prompt, agent="viral")  # Now Groq model
             parsed = self._parse_json_response(result)
             print(f"   ✅ Viral analysis: {parsed.get('virality_score', 0)}/100")
             return parsed
@@ -1097,7 +1207,7 @@ REQUIRED OUTPUT (JSON):
 Think: Is this a profitable niche or a crowded mess?"""
 
         try:
-            result = await self._call_groq_model(self.hf_competition_model, prompt)  # Now Groq model
+            result = await self._call_groq_model(self.hf_competition_model, prompt, agent="competition")  # Now Groq model
             parsed = self._parse_json_response(result)
             print(f"   ✅ Competition: {parsed.get('market_saturation', 'medium')}")
             return parsed
@@ -1153,7 +1263,7 @@ REQUIRED OUTPUT (JSON):
 Think: Can we actually execute this operationally?"""
 
         try:
-            result = await self._call_groq_model(self.hf_supply_model, prompt)  # Now Groq model
+            result = await self._call_groq_model(self.hf_supply_model, prompt, agent="supply_chain")  # Now Groq model
             parsed = self._parse_json_response(result)
             print(f"   ✅ Supply chain: {parsed.get('lead_time_days', 0)} days lead time")
             return parsed
@@ -1213,7 +1323,7 @@ REQUIRED OUTPUT (JSON):
 Think: Would I buy this? Why or why not? Be honest."""
 
         try:
-            result = await self._call_groq_model(self.hf_psychology_model, prompt)  # Now Groq model
+            result = await self._call_groq_model(self.hf_psychology_model, prompt, agent="psychology")  # Now Groq model
             parsed = self._parse_json_response(result)
             print(f"   ✅ Psychology: {parsed.get('product_market_fit', 0)}/100 fit")
             return parsed
@@ -1273,7 +1383,7 @@ REQUIRED OUTPUT (JSON):
 Think: Will this still be relevant in 90 days?"""
 
         try:
-            result = await self._call_groq_model(self.hf_data_science_model, prompt)  # Now Groq model
+            result = await self._call_groq_model(self.hf_data_science_model, prompt, agent="data_science")  # Now Groq model
             parsed = self._parse_json_response(result)
             print(f"   ✅ Forecast: {parsed.get('30_day_forecast', 'stable')}")
             return parsed
@@ -1466,16 +1576,29 @@ Think like a PhD market researcher with real-time web access. Use current data t
                 "max_tokens": 2000
             }
 
-            response = requests.post(
+            call_start = time.time()
+            self._last_call = {"agent": "perplexity", "model": self.perplexity_model, "retries": 0}
+            response, retries = perplexity_retry_policy.post(
                 self.perplexity_url,
+                on_retry=self._on_retry("perplexity", self._last_call),
                 headers=headers,
                 json=payload,
                 timeout=30
             )
+            call_latency = time.time() - call_start
 
             if response.status_code == 200:
                 result = response.json()
                 content = result['choices'][0]['message']['content']
+                usage = result.get("usage") or {}
+                llm_telemetry.record_call(
+                    "perplexity", self.perplexity_model, "perplexity", call_latency, "success",
+                    status_code=200,
+                    prompt_tokens=usage.get("prompt_tokens", estimate_tokens(prompt)),
+                    completion_tokens=usage.get("completion_tokens", estimate_tokens(content)),
+                    retries=retries,
+                    analysis=self._analysis_telemetry
+                )
                 parsed = self._parse_json_response(content)
 
                 market_score = parsed.get('recommendation', {}).get('market_entry_score', 50)
@@ -1487,10 +1610,17 @@ Think like a PhD market researcher with real-time web access. Use current data t
                 return parsed
             else:
                 print(f"   ⚠️ Perplexity API error: {response.status_code}")
+                llm_telemetry.record_call(
+                    "perplexity", self.perplexity_model, "perplexity", call_latency, "error",
+                    status_code=response.status_code, retries=retries, analysis=self._analysis_telemetry
+                )
+                if response.status_code in RETRYABLE_STATUS_CODES:
+                    self._throttled_agents.add("perplexity")
                 raise Exception(f"Perplexity API returned {response.status_code}")
 
         except Exception as e:
             print(f"   ❌ Perplexity Agent failed: {str(e)[:80]}")
+            self._note_transient_failure("perplexity", e)
             print("   🔄 Using fallback analysis (no web search)...")
             return {
                 "market_validation": {
@@ -1803,11 +1933,71 @@ Think like a CPO managing a $100M P&L who will be held accountable for this deci
                 "confidence_score": 60
             }
 
-    async def _call_groq_model(self, model: str, prompt: str, system_msg: str = "You are an expert AI assistant. Always respond with valid JSON.") -> str:
+    async def _call_groq_model(self, model: str, prompt: str, system_msg: str = "You are an expert AI assistant. Always respond with valid JSON.", agent: str = None) -> str:
+        """
+        Call Groq API for an agent, routed through the model router
+        The agent's configured model is tried first while healthy; on failure the
+        next candidate for the agent's role is used (automatic failover)
+        """
+        candidates = model_router.route(agent, model) if agent else [model]
+        if candidates[0] != model:
+            print(f"      🔀 Routing {agent} to {candidates[0]} ({model} unhealthy)")
+
+        last_error = None
+        for index, candidate in enumerate(candidates):
+            try:
+                return await self._call_groq_hedged(candidate, candidates, prompt, system_msg, agent)
+            except GroqCallError as e:
+                last_error = e
+                if e.status_code in (401, 403) or index == len(candidates) - 1:
+                    break
+                print(f"      ↪️  {candidate} failed - failing over to {candidates[index + 1]}")
+
+        raise Exception(f"Groq API error: {last_error}")
+
+    async def _call_groq_hedged(self, model: str, candidates: List[str], prompt: str, system_msg: str, agent: str = None) -> str:
         """
-        Call Groq API with any model
+        Single routed call; with hedging enabled, a backup request is sent to the next
+        healthy candidate once the call runs past its p95 latency and the first to succeed wins
+        """
+        deadline = model_router.hedge_deadline(agent, model) if (self.hedged_requests and agent) else None
+        primary = asyncio.ensure_future(self._call_groq_once(model, prompt, system_msg, agent))
+        if deadline is None:
+            return await primary
+
+        done, _ = await asyncio.wait({primary}, timeout=deadline)
+        if done:
+            return primary.result()
+
+        hedge_model = next((m for m in candidates if m != model and not model_router.in_cooldown(m)), model)
+        print(f"      🪁 {agent} exceeded p95 ({deadline:.1f}s) - hedging with {hedge_model}")
+        hedge = asyncio.ensure_future(self._call_groq_once(hedge_model, prompt, system_msg, agent))
+        winners = {primary: model, hedge: hedge_model}
+
+        pending = {primary, hedge}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    llm_telemetry.record_hedge(agent, hedge_model, won=task is hedge)
+                    self._last_call = {"agent": agent, "model": winners[task]}
+                    return task.result()
+
+        llm_telemetry.record_hedge(agent, hedge_model, won=False)
+        return primary.result()  # Both failed - surface the primary's error
+
+    async def _call_groq_once(self, model: str, prompt: str, system_msg: str, agent: str = None) -> str:
+        """
+        One Groq call against one model
+        JSON-mode models return a validated JSON object in one response;
+        other models are streamed and cut off once the agent's required fields are complete
         """
         start_time = time.time()
+        call = {"agent": agent, "model": model, "retries": 0}
+        self._last_call = call
+        cancelled = threading.Event()
         try:
             headers = {
                 "Authorization": f"Bearer {self.groq_api_key}",
@@ -1826,21 +2016,145 @@ Think like a CPO managing a $100M P&L who will be held accountable for this deci
                 "max_tokens": 1500
             }
 
-            response = requests.post(self.groq_url, headers=headers, json=data, timeout=30)
-            response.raise_for_status()
-
-            result = response.json()
-            content = result["choices"][0]["message"]["content"]
+            # Blocking HTTP runs in a worker thread so a hedged request can race it
+            if model in self.JSON_MODE_MODELS:
+                content, usage = await asyncio.to_thread(self._request_groq_json_mode, headers, data, call)
+            else:
+                content, usage = await asyncio.to_thread(
+                    self._request_groq_streaming, headers, data, self.AGENT_REQUIRED_FIELDS.get(agent), call, cancelled
+                )
 
             elapsed = time.time() - start_time
             print(f"      ⏱️  Groq API response time: {elapsed:.2f}s")
 
+            # Streams stopped early carry no usage block - estimate from text
+            usage = usage or {}
+            llm_telemetry.record_call(
+                agent, model, "groq", elapsed, "success",
+                status_code=200,
+                prompt_tokens=usage.get("prompt_tokens", estimate_tokens(system_msg + prompt)),
+                completion_tokens=usage.get("completion_tokens", estimate_tokens(content)),
+                retries=call["retries"],
+                analysis=self._analysis_telemetry
+            )
+
             return content
 
+        except asyncio.CancelledError:
+            # Lost a hedged race - stop reading the stream in the worker thread
+            cancelled.set()
+            raise
+
         except Exception as e:
             elapsed = time.time() - start_time
             print(f"      ⏱️  Groq API failed after: {elapsed:.2f}s")
-            raise Exception(f"Groq API error: {str(e)}")
+            response = getattr(e, "response", None)
+            status_code = getattr(response, "status_code", None)
+            llm_telemetry.record_call(
+                agent, model, "groq", elapsed, "error",
+                status_code=status_code, retries=call["retries"],
+                analysis=self._analysis_telemetry
+            )
+            try:
+                error_text = response.text if response is not None else str(e)
+            except Exception:
+                error_text = str(e)  # Body unreadable; streamed errors carry it in the message
+            model_router.report_failure(model, status_code, error_text)
+            self._note_transient_failure(agent, e, status_code)
+            raise GroqCallError(str(e), status_code) from e
+
+    def _on_retry(self, provider: str, call: Dict[str, Any]):
+        """Retry callback for RetryPolicy - counts retries for the call in progress"""
+        def record(attempt: int, delay: float, status_code: int = None):
+            call["retries"] = call.get("retries", 0) + 1
+            llm_telemetry.record_retry(call["agent"], call["model"], provider, status_code)
+        return record
+
+    def _note_transient_failure(self, agent: str, error: Exception, status_code: int = None):
+        """Remember agents whose call failed on throttling/transient errors so they can be re-run"""
+        transient = (
+            status_code in RETRYABLE_STATUS_CODES
+            or (status_code is None and isinstance(error, (requests.ConnectionError, requests.Timeout)))
+        )
+        if agent and transient:
+            self._throttled_agents.add(agent)
+
+    def _request_groq_json_mode(self, headers: Dict[str, str], data: Dict[str, Any], call: Dict[str, Any]) -> Tuple[str, Dict[str, int]]:
+        """
+        Non-streamed request with JSON mode enabled
+        If Groq rejects the generation as invalid JSON it returns the failed text,
+        which is handed to the repair pass instead of paying for another call
+        """
+        data = dict(data, response_format={"type": "json_object"})
+        response, _ = groq_retry_policy.post(
+            self.groq_url, on_retry=self._on_retry("groq", call), headers=headers, json=data, timeout=30
+        )
+
+        if response.status_code == 400:
+            try:
+                error = response.json().get("error", {})
+            except ValueError:
+                error = {}
+            if error.get("code") == "json_validate_failed" and error.get("failed_generation"):
+                print("      🩹 JSON mode validation failed - repairing failed generation")
+                return error["failed_generation"], {}
+
+        response.raise_for_status()
+        result = response.json()
+        return result["choices"][0]["message"]["content"], result.get("usage") or {}
+
+    def _request_groq_streaming(
+        self,
+        headers: Dict[str, str],
+        data: Dict[str, Any],
+        required_fields: List[str] = None,
+        call: Dict[str, Any] = None,
+        cancelled: threading.Event = None
+    ) -> Tuple[str, Dict[str, int]]:
+        """
+        Streamed request parsed incrementally
+        Closes the connection as soon as the JSON object is closed or every required
+        field is complete (or the call lost a hedged race), so trailing prose and
+        unused fields are never generated
+        """
+        parser = IncrementalJSONParser(required_fields)
+        usage = {}
+        data = dict(data, stream=True)
+
+        response, _ = groq_retry_policy.post(
+            self.groq_url, on_retry=self._on_retry("groq", call or {"agent": None, "model": data["model"]}),
+            headers=headers, json=data, timeout=30, stream=True
+        )
+        with response:
+            if not response.ok:
+                # Read the error body while the stream is open - the caller hands it to
+                # model_router, which looks for "decommissioned" in it
+                error_body = response.text
+                raise requests.HTTPError(
+                    f"{response.status_code} Error for url: {response.url}: {error_body[:500]}", response=response
+                )
+
+            for line in response.iter_lines(decode_unicode=True):
+                if cancelled is not None and cancelled.is_set():
+                    break
+                if not line or not line.startswith("data:"):
+                    continue
+                payload = line[len("data:"):].strip()
+                if payload == "[DONE]":
+                    break
+
+                chunk = json.loads(payload)
+                # Groq reports usage on the final chunk
+                usage = (chunk.get("x_groq") or {}).get("usage") or usage
+                choices = chunk.get("choices") or [{}]
+                parser.feed(choices[0].get("delta", {}).get("content") or "")
+
+                if parser.is_satisfied():
+                    if not parser.is_complete():
+                        print(f"      ✂️  Required fields complete - stopping generation early")
+                    break
+
+        return parser.document(), usage
 
     async def _call_groq_qwen(self, prompt: str) -> str:
         """
@@ -1849,7 +2163,8 @@ Think like a CPO managing a $100M P&L who will be held accountable for this deci
         return await self._call_groq_model(
             self.coordinator_model,
             prompt,
-            "You are an expert AI coordinator with advanced reasoning capabilities. Always respond with valid JSON."
+            "You are an expert AI coordinator with advanced reasoning capabilities. Always respond with valid JSON.",
+            agent="coordinator"
         )
 
     async def _call_huggingface(self, model: str, prompt: str, max_retries: int = 2) -> str:
@@ -1903,44 +2218,30 @@ Think like a CPO managing a $100M P&L who will be held accountable for this deci
 
     def _parse_json_response(self, response: str) -> Dict[str, Any]:
         """
-        Parse JSON from AI response (handles markdown code blocks)
+        Parse JSON from AI response (handles markdown code blocks, reasoning
+        blocks and truncated output via a single repair pass)
         """
         try:
-            # Remove markdown code blocks if present
-            if "```json" in response:
-                response = response.split("```json")[1].split("```")[0]
-            elif "```" in response:
-                response = response.split("```")[1].split("```")[0]
-
-            # Clean up response
-            response = response.strip()
-
-            # Try to find JSON object
-            start_idx = response.find("{")
-            end_idx = response.rfind("}") + 1
-
-            if start_idx != -1 and end_idx > start_idx:
-                json_str = response[start_idx:end_idx]
-                return json.loads(json_str)
-
-            # Fallback: try parsing entire response
-            return json.loads(response)
-
+            return parse_json_response(response)
         except Exception as e:
             print(f"  JSON parsing error: {str(e)}")
+            llm_telemetry.record_parse_failure(
+                self._last_call["agent"], self._last_call["model"], analysis=self._analysis_telemetry
+            )
             # Return empty dict if parsing fails
             return {"status": "parse_failed", "raw_response": response[:200]}
 
-    def _fallback_analysis(self, product) -> Dict[str, Any]:
+    def _fallback_analysis(self, product, agent_results: Dict[str, Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Basic rule-based analysis when all agents fail
+        Fields from agents that did complete (scanner, research) override the rule-based values
         """
         print("[Fallback] Using rule-based analysis")
 
         keywords = [word for word in product.title.split() if len(word) > 3][:8]
         suggested_price = (product.estimated_cost or 50) * 2.5
 
-        return {
+        analysis = {
             "ai_category": product.category or "General",
             "ai_keywords": keywords,
             "ai_description": product.description or f"High-quality {product.title}",
@@ -1952,6 +2253,26 @@ Think like a CPO managing a $100M P&L who will be held accountable for this deci
             "confidence_score": 50
         }
 
+        completed = {
+            name: result for name, result in (agent_results or {}).items()
+            if isinstance(result, dict) and result.get("status") not in ("fallback", "failed", "parse_failed")
+        }
+        if not completed:
+            return analysis
+
+        scanner = completed.get("scanner", {})
+        research = completed.get("research", {})
+        for field, source in (
+            ("ai_category", scanner), ("ai_keywords", scanner), ("ai_description", scanner),
+            ("profit_potential_score", research), ("competition_level", research), ("suggested_price", research)
+        ):
+            if source.get(field) is not None:
+                analysis[field] = source[field]
+
+        analysis["reasoning"] = f"Fallback analysis with {len(completed)} completed agent reports"
+        analysis["agent_reports"] = completed
+        return analysis
+
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,64 @@
+"""
+Checkpointing for multi-agent product analysis
+Each agent's result is written to product_analysis_steps as soon as it completes,
+and every write refreshes the product's updated_at as a lease heartbeat so the
+reaper can tell a live analysis from one whose worker died.
+"""
+from datetime import datetime
+from typing import Dict, Any
+
+from models.database import Product, ProductAnalysisStep
+
+
+# Agent results that should be re-run on resume rather than reused
+UNUSABLE_STATUSES = ("fallback", "failed", "parse_failed")
+
+
+class AnalysisCheckpoint:
+    """Persisted agent results for one product's analysis"""
+
+    def __init__(self, db, product_id: int):
+        self.db = db
+        self.product_id = product_id
+
+    def completed(self) -> Dict[str, Dict[str, Any]]:
+        """Results of agents that already completed successfully"""
+        steps = self.db.query(ProductAnalysisStep).filter(
+            ProductAnalysisStep.product_id == self.product_id,
+            ProductAnalysisStep.status == "completed"
+        ).all()
+        return {step.agent: step.result for step in steps}
+
+    def save(self, agent: str, result: Dict[str, Any]) -> None:
+        """Persist one agent's result and heartbeat the product lease"""
+        status = result.get("status") if isinstance(result, dict) else "failed"
+        status = status if status in UNUSABLE_STATUSES else "completed"
+
+        try:
+            step = self.db.query(ProductAnalysisStep).filter(
+                ProductAnalysisStep.product_id == self.product_id,
+                ProductAnalysisStep.agent == agent
+            ).first()
+            if step:
+                step.status = status
+                step.result = result
+            else:
+                self.db.add(ProductAnalysisStep(
+                    product_id=self.product_id, agent=agent, status=status, result=result
+                ))
+
+            self.db.query(Product).filter(Product.id == self.product_id).update(
+                {Product.updated_at: datetime.utcnow()}, synchronize_session=False
+            )
+            self.db.commit()
+        except Exception as e:
+            # A failed checkpoint only costs a re-run on resume - never the analysis
+            self.db.rollback()
+            print(f"   ⚠️  Could not checkpoint {agent} result: {str(e)[:80]}")
+
+    def clear(self) -> None:
+        """Drop checkpoints once the analysis has been stored on the product"""
+        self.db.query(ProductAnalysisStep).filter(
+            ProductAnalysisStep.product_id == self.product_id
+        ).delete(synchronize_session=False)
+        self.db.commit()
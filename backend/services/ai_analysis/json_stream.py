@@ -0,0 +1,232 @@
+"""
+Incremental JSON parsing for agent responses
+- IncrementalJSONParser: consumes streamed chunks and tracks which top-level
+  fields are complete, so generation can be stopped once the agent has
+  produced everything we need
+- repair_json: single lightweight repair pass for near-valid model output
+  (code fences, <think> blocks, trailing commas, truncated documents)
+"""
+import json
+import re
+from typing import Dict, Any, Iterable, Optional, Set
+
+
+THINK_BLOCK_RE = re.compile(r"<think>.*?</think>", re.DOTALL | re.IGNORECASE)
+CODE_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.DOTALL | re.IGNORECASE)
+DANGLING_KEY_RE = re.compile(r',?\s*"(?:[^"\\]|\\.)*"\s*:\s*$')
+
+CLOSERS = {"{": "}", "[": "]"}
+
+
+class IncrementalJSONParser:
+    """
+    Tracks the first top-level JSON object in a stream of text chunks
+
+    A top-level field counts as complete once the delimiter after its value
+    (',' or the closing '}') has been seen, so scalars are never cut short.
+    """
+
+    def __init__(self, required_fields: Iterable[str] = None):
+        self.required_fields: Set[str] = set(required_fields or [])
+        self.completed_fields: Set[str] = set()
+        self.buffer = ""
+
+        self._pos = 0
+        self._start = -1          # index of the opening '{'
+        self._end = -1            # index just past the closing '}'
+        self._last_value_end = -1  # index of the delimiter after the last complete field
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._expect_key = False
+        self._current_key: Optional[str] = None
+
+    def feed(self, chunk: str) -> None:
+        """Append a chunk of streamed text and advance the scanner"""
+        if not chunk or self.is_complete():
+            self.buffer += chunk or ""
+            return
+
+        self.buffer += chunk
+
+        if self._start == -1 and not self._skip_preamble():
+            return
+
+        buf = self.buffer
+        i = self._pos
+        while i < len(buf):
+            ch = buf[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect_key:
+                        self._current_key = buf[self._string_start + 1:i]
+                        self._expect_key = False
+                i += 1
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._expect_key = True
+            elif ch in "}]":
+                if self._depth == 1:
+                    self._complete_current(i)
+                    self._depth = 0
+                    self._end = i + 1
+                    self._pos = i + 1
+                    return
+                self._depth -= 1
+            elif ch == "," and self._depth == 1:
+                self._complete_current(i)
+                self._expect_key = True
+            i += 1
+
+        self._pos = i
+
+    def _skip_preamble(self) -> bool:
+        """Locate the opening brace, ignoring reasoning (<think>) blocks"""
+        text = self.buffer
+        search_from = self._pos
+
+        stripped = text.lstrip()
+        if len(stripped) < 7 and "<think>".startswith(stripped.lower()):
+            return False  # Could still be the start of a reasoning block
+        if stripped[:7].lower() == "<think>":
+            close = text.lower().find("</think>")
+            if close == -1:
+                return False
+            search_from = max(search_from, close + len("</think>"))
+
+        start = text.find("{", search_from)
+        if start == -1:
+            self._pos = len(text)
+            return False
+
+        self._start = start
+        self._pos = start
+        return True
+
+    def _complete_current(self, delimiter_index: int) -> None:
+        if self._current_key is not None:
+            self.completed_fields.add(self._current_key)
+            self._current_key = None
+        self._last_value_end = delimiter_index
+
+    def is_complete(self) -> bool:
+        """True once the top-level object has been closed"""
+        return self._end != -1
+
+    def is_satisfied(self) -> bool:
+        """True when generation can stop: object closed or all required fields complete"""
+        if self.is_complete():
+            return True
+        return bool(self.required_fields) and self.required_fields <= self.completed_fields
+
+    def document(self) -> str:
+        """
+        Best JSON text available so far
+        Closed object if complete, otherwise the object truncated after the last
+        complete field; falls back to the raw buffer when nothing was tracked
+        """
+        if self.is_complete():
+            return self.buffer[self._start:self._end]
+        if self._start != -1 and self._last_value_end > self._start:
+            return self.buffer[self._start:self._last_value_end] + "}"
+        return self.buffer
+
+
+def repair_json(text: str) -> str:
+    """
+    Single lightweight repair pass for near-valid model output
+    Strips reasoning blocks and code fences, drops surrounding prose,
+    removes trailing commas and closes truncated strings/objects/arrays
+    """
+    text = THINK_BLOCK_RE.sub("", text)
+
+    fence = CODE_FENCE_RE.search(text)
+    if fence and "{" in fence.group(1):
+        text = fence.group(1)
+
+    start = text.find("{")
+    if start == -1:
+        return text.strip()
+    text = text[start:]
+
+    out = []
+    stack = []
+    in_string = False
+    escape = False
+
+    for ch in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            elif ch == "\n":
+                out.append("\\n")
+                continue
+            out.append(ch)
+            continue
+
+        if ch == '"':
+            in_string = True
+        elif ch in CLOSERS:
+            stack.append(CLOSERS[ch])
+        elif ch in "}]":
+            # Drop trailing comma before a closer
+            while out and out[-1] in " \t\r\n":
+                out.pop()
+            if out and out[-1] == ",":
+                out.pop()
+            if stack and stack[-1] == ch:
+                stack.pop()
+            out.append(ch)
+            if not stack:
+                break
+            continue
+        out.append(ch)
+
+    repaired = "".join(out)
+
+    if in_string:
+        if escape:
+            repaired = repaired[:-1]
+        repaired += '"'
+
+    if stack:
+        repaired = DANGLING_KEY_RE.sub("", repaired).rstrip(", \t\r\n")
+        repaired += "".join(reversed(stack))
+
+    return repaired
+
+
+def parse_json_response(text: str) -> Dict[str, Any]:
+    """
+    Parse a JSON object from model output
+    Tries the text as-is first, then a single repair pass; raises ValueError on failure
+    """
+    candidate = text.strip()
+    try:
+        parsed = json.loads(candidate)
+    except (json.JSONDecodeError, TypeError):
+        try:
+            parsed = json.loads(repair_json(text))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Unrepairable JSON: {e}") from e
+
+    if not isinstance(parsed, dict):
+        raise ValueError(f"Expected JSON object, got {type(parsed).__name__}")
+    return parsed
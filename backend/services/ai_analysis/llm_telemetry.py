@@ -0,0 +1,214 @@
+"""
+LLM call telemetry for the multi-agent system
+Records latency, tokens, cost and failure counts per agent and model:
+- Prometheus metrics (process-wide, scraped from /metrics)
+- Rolling latency windows for in-process p50/p95/p99
+- AnalysisTelemetry: per-analysis breakdown stored with each product analysis
+"""
+import math
+import threading
+from collections import defaultdict, deque
+from typing import Dict, Any, List, Optional, Tuple
+
+from monitoring.prometheus_metrics import (
+    LLM_REQUEST_LATENCY, LLM_REQUESTS, LLM_TOKENS, LLM_COST, LLM_RATE_LIMITED,
+    LLM_RETRIES, LLM_PARSE_FAILURES, LLM_CACHE_HITS, LLM_HEDGED_REQUESTS
+)
+
+
+# Published list prices, USD per 1M tokens (input, output)
+MODEL_PRICING_USD_PER_MTOKEN = {
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+    "llama-3.1-8b-instant": (0.05, 0.08),
+    "qwen/qwen3-32b": (0.29, 0.59),
+    "sonar": (1.00, 1.00),
+}
+
+LATENCY_WINDOW_SIZE = 200
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 chars/token) when the provider reports no usage"""
+    return max(1, len(text or "") // 4)
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimated USD cost of a call from the pricing table"""
+    input_price, output_price = MODEL_PRICING_USD_PER_MTOKEN.get(model, (0.0, 0.0))
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """p50/p95/p99 of a list of values (nearest-rank)"""
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    ordered = sorted(values)
+
+    def rank(p: float) -> float:
+        index = min(len(ordered) - 1, max(0, math.ceil(p * len(ordered)) - 1))
+        return round(ordered[index], 3)
+
+    return {"p50": rank(0.50), "p95": rank(0.95), "p99": rank(0.99)}
+
+
+class AnalysisTelemetry:
+    """Calls made while analysing a single product"""
+
+    def __init__(self):
+        self.calls: List[Dict[str, Any]] = []
+        self.cache_hits: List[str] = []
+
+    def add(self, call: Dict[str, Any]) -> None:
+        self.calls.append(call)
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-agent breakdown, sorted by time spent (slowest agent first)"""
+        by_agent: Dict[str, Dict[str, Any]] = {}
+        for call in self.calls:
+            stats = by_agent.setdefault(call["agent"], {
+                "calls": 0, "latency_seconds": 0.0, "prompt_tokens": 0, "completion_tokens": 0,
+                "cost_usd": 0.0, "rate_limited": 0, "retries": 0, "parse_failures": 0, "models": []
+            })
+            stats["calls"] += 1
+            stats["latency_seconds"] = round(stats["latency_seconds"] + call["latency_seconds"], 3)
+            stats["prompt_tokens"] += call["prompt_tokens"]
+            stats["completion_tokens"] += call["completion_tokens"]
+            stats["cost_usd"] = round(stats["cost_usd"] + call["cost_usd"], 6)
+            stats["rate_limited"] += 1 if call["status_code"] == 429 else 0
+            stats["retries"] += call["retries"]
+            stats["parse_failures"] += 1 if call.get("parse_failed") else 0
+            if call["model"] not in stats["models"]:
+                stats["models"].append(call["model"])
+
+        total_latency = sum(s["latency_seconds"] for s in by_agent.values())
+        for stats in by_agent.values():
+            stats["share_of_time"] = round(stats["latency_seconds"] / total_latency, 3) if total_latency else 0.0
+
+        ordered = dict(sorted(by_agent.items(), key=lambda item: item[1]["latency_seconds"], reverse=True))
+
+        return {
+            "total_calls": len(self.calls),
+            "total_latency_seconds": round(total_latency, 3),
+            "total_prompt_tokens": sum(c["prompt_tokens"] for c in self.calls),
+            "total_completion_tokens": sum(c["completion_tokens"] for c in self.calls),
+            "total_cost_usd": round(sum(c["cost_usd"] for c in self.calls), 6),
+            "cache_hits": list(self.cache_hits),
+            "slowest_agent": next(iter(ordered), None),
+            "agents": ordered
+        }
+
+
+class LLMTelemetry:
+    """Process-wide recorder shared by all AgenticAISystem instances"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies: Dict[Tuple[str, str], deque] = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW_SIZE))
+        self._outcomes: Dict[str, deque] = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW_SIZE))
+
+    def record_call(
+        self,
+        agent: str,
+        model: str,
+        provider: str,
+        latency_seconds: float,
+        status: str,
+        status_code: Optional[int] = None,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        retries: int = 0,
+        analysis: Optional[AnalysisTelemetry] = None
+    ) -> Dict[str, Any]:
+        """Record one LLM API call (after retries) and return the call record"""
+        agent = agent or "unknown"
+        cost = estimate_cost(model, prompt_tokens, completion_tokens)
+
+        LLM_REQUEST_LATENCY.labels(agent, model, provider).observe(latency_seconds)
+        LLM_REQUESTS.labels(agent, model, provider, status).inc()
+        LLM_TOKENS.labels(agent, model, "prompt").inc(prompt_tokens)
+        LLM_TOKENS.labels(agent, model, "completion").inc(completion_tokens)
+        LLM_COST.labels(agent, model).inc(cost)
+        if status_code == 429:
+            LLM_RATE_LIMITED.labels(agent, model, provider).inc()
+
+        with self._lock:
+            if status == "success":
+                self._latencies[(agent, model)].append(latency_seconds)
+            self._outcomes[model].append(status == "success")
+
+        call = {
+            "agent": agent,
+            "model": model,
+            "provider": provider,
+            "latency_seconds": round(latency_seconds, 3),
+            "status": status,
+            "status_code": status_code,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cost_usd": round(cost, 6),
+            "retries": retries
+        }
+        if analysis is not None:
+            analysis.add(call)
+        return call
+
+    def record_retry(self, agent: str, model: str, provider: str, status_code: Optional[int] = None) -> None:
+        """Record a retried attempt (throttled attempts also count as 429s)"""
+        LLM_RETRIES.labels(agent or "unknown", model, provider).inc()
+        if status_code == 429:
+            LLM_RATE_LIMITED.labels(agent or "unknown", model, provider).inc()
+
+    def record_parse_failure(self, agent: str, model: str, analysis: Optional[AnalysisTelemetry] = None) -> None:
+        LLM_PARSE_FAILURES.labels(agent or "unknown", model or "unknown").inc()
+        if analysis is not None and analysis.calls:
+            analysis.calls[-1]["parse_failed"] = True
+
+    def record_hedge(self, agent: str, model: str, won: bool) -> None:
+        """Record a hedged backup request and whether it beat the original call"""
+        LLM_HEDGED_REQUESTS.labels(agent or "unknown", model, "won" if won else "lost").inc()
+
+    def record_cache_hit(self, agent: str, analysis: Optional[AnalysisTelemetry] = None) -> None:
+        LLM_CACHE_HITS.labels(agent or "unknown").inc()
+        if analysis is not None:
+            analysis.cache_hits.append(agent)
+
+    def latency_percentiles(self, agent: str = None, model: str = None) -> Dict[str, float]:
+        """Rolling p50/p95/p99 latency, optionally filtered by agent and/or model"""
+        with self._lock:
+            values = [
+                latency
+                for (a, m), window in self._latencies.items()
+                if (agent is None or a == agent) and (model is None or m == model)
+                for latency in window
+            ]
+        return percentiles(values)
+
+    def latency_samples(self, agent: str = None, model: str = None) -> int:
+        """Number of successful calls in the rolling latency window"""
+        with self._lock:
+            return sum(
+                len(window)
+                for (a, m), window in self._latencies.items()
+                if (agent is None or a == agent) and (model is None or m == model)
+            )
+
+    def error_rate(self, model: str) -> float:
+        """Share of recent calls to a model that failed"""
+        with self._lock:
+            outcomes = list(self._outcomes.get(model, []))
+        if not outcomes:
+            return 0.0
+        return 1 - (sum(outcomes) / len(outcomes))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Rolling latency percentiles for every agent/model pair seen by this process"""
+        with self._lock:
+            keys = list(self._latencies.keys())
+        return {
+            f"{agent}/{model}": dict(self.latency_percentiles(agent, model), samples=len(self._latencies[(agent, model)]))
+            for agent, model in keys
+        }
+
+
+# Global instance
+llm_telemetry = LLMTelemetry()
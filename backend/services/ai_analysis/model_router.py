@@ -0,0 +1,105 @@
+"""
+Model router for the multi-agent system
+Maps each agent role to an ordered list of candidate Groq models and ranks
+them by health (recent error rate and p95 latency from llm_telemetry):
+- Automatic failover to the next healthy candidate
+- Cooldowns for throttled or decommissioned models
+- p95 deadlines for optional hedged requests
+"""
+import threading
+import time
+from typing import Dict, List, Optional
+
+from services.ai_analysis.llm_telemetry import llm_telemetry, LLMTelemetry
+
+
+REASONING_MODELS = ["qwen/qwen3-32b", "llama-3.3-70b-versatile", "llama-3.1-8b-instant"]
+FAST_MODELS = ["llama-3.1-8b-instant", "llama-3.3-70b-versatile"]
+
+# Candidates per agent role, best first (the agent's configured model is always tried first)
+AGENT_MODEL_CANDIDATES = {
+    "coordinator": REASONING_MODELS,
+    "trend": REASONING_MODELS,
+    "research": REASONING_MODELS,
+    "scanner": ["llama-3.3-70b-versatile", "llama-3.1-8b-instant"],
+    "quality": FAST_MODELS,
+    "pricing": FAST_MODELS,
+    "viral": FAST_MODELS,
+    "competition": FAST_MODELS,
+    "supply_chain": FAST_MODELS,
+    "psychology": FAST_MODELS,
+    "data_science": FAST_MODELS,
+}
+
+RATE_LIMIT_COOLDOWN_SECONDS = 60
+DECOMMISSIONED_COOLDOWN_SECONDS = 6 * 3600
+
+# Each step down the candidate list costs 15% of health, so a healthy
+# primary is kept and a fallback only wins when the primary degrades
+PREFERENCE_DECAY = 0.85
+
+# Latency above which a model starts losing health (seconds, p95)
+LATENCY_REFERENCE_SECONDS = 10.0
+
+# Rolling samples needed before p95 is trusted as a hedging deadline
+MIN_HEDGE_SAMPLES = 20
+MIN_HEDGE_DEADLINE_SECONDS = 2.0
+
+
+class ModelRouter:
+    """Ranks candidate models per agent role and tracks unavailable models"""
+
+    def __init__(self, candidates: Dict[str, List[str]] = None, telemetry: LLMTelemetry = None):
+        self.candidates = candidates or AGENT_MODEL_CANDIDATES
+        self.telemetry = telemetry or llm_telemetry
+        self._cooldowns: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def health_score(self, model: str) -> float:
+        """0..1 health from recent error rate and p95 latency (1.0 when no data)"""
+        if self.in_cooldown(model):
+            return 0.0
+        success_rate = 1 - self.telemetry.error_rate(model)
+        p95 = self.telemetry.latency_percentiles(model=model)["p95"]
+        latency_factor = 1.0 if p95 <= LATENCY_REFERENCE_SECONDS else LATENCY_REFERENCE_SECONDS / p95
+        return round(success_rate * latency_factor, 3)
+
+    def route(self, agent: str, preferred_model: str) -> List[str]:
+        """
+        Candidate models for an agent, most suitable first
+        The configured model keeps priority while healthy; models in cooldown go last
+        """
+        ordered = [preferred_model] + [m for m in self.candidates.get(agent, []) if m != preferred_model]
+        scored = [
+            (self.in_cooldown(model), -self.health_score(model) * (PREFERENCE_DECAY ** index), index, model)
+            for index, model in enumerate(ordered)
+        ]
+        return [model for _, _, _, model in sorted(scored)]
+
+    def hedge_deadline(self, agent: str, model: str) -> Optional[float]:
+        """p95 latency for this agent/model, or None until enough samples exist"""
+        if self.telemetry.latency_samples(agent, model) < MIN_HEDGE_SAMPLES:
+            return None
+        p95 = self.telemetry.latency_percentiles(agent, model)["p95"]
+        return max(MIN_HEDGE_DEADLINE_SECONDS, p95)
+
+    def report_failure(self, model: str, status_code: Optional[int], error_text: str = "") -> None:
+        """Put a model in cooldown when it is throttled or no longer served"""
+        error_text = (error_text or "").lower()
+        if status_code == 404 or "decommissioned" in error_text or "model_not_found" in error_text:
+            print(f"      🚫 Model {model} unavailable - routing around it for {DECOMMISSIONED_COOLDOWN_SECONDS // 3600}h")
+            self._set_cooldown(model, DECOMMISSIONED_COOLDOWN_SECONDS)
+        elif status_code == 429:
+            self._set_cooldown(model, RATE_LIMIT_COOLDOWN_SECONDS)
+
+    def in_cooldown(self, model: str) -> bool:
+        with self._lock:
+            return self._cooldowns.get(model, 0) > time.time()
+
+    def _set_cooldown(self, model: str, seconds: float) -> None:
+        with self._lock:
+            self._cooldowns[model] = max(self._cooldowns.get(model, 0), time.time() + seconds)
+
+
+# Global instance
+model_router = ModelRouter()
@@ -9,6 +9,7 @@ import json
 from config.settings import settings
 from services.ml.approval_predictor import ml_predictor
 from models.database import ProductStatus
+from services.ai_analysis.analysis_checkpoint import AnalysisCheckpoint
 
 
 class ProductAnalyzer:
@@ -99,7 +100,8 @@ class ProductAnalyzer:
             # STEP 1: Multi-Agent AI Analysis
             if self.agentic_enabled:
                 print("\n🚀 Using Multi-Agent AI System for analysis...")
-                analysis = await self.agentic_system.analyze_product_multi_agent(product)
+                checkpoint = AnalysisCheckpoint(db, product.id) if db is not None and getattr(product, "id", None) else None
+                analysis = await self.agentic_system.analyze_product_multi_agent(product, checkpoint)
                 print("✓ Multi-Agent analysis complete\n")
 
             # FALLBACK: Single AI services
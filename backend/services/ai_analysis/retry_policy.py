@@ -0,0 +1,188 @@
+"""
+Shared retry policy for LLM provider calls (Groq, Perplexity)
+- Honors Retry-After and x-ratelimit-* headers
+- Jittered exponential backoff for transient errors
+- Paces subsequent calls when the provider reports an exhausted quota
+"""
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional, Tuple
+
+import requests
+
+
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+# Groq reset headers look like "2m59.56s", "7.66s" or "120ms"
+DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+def parse_duration(value: str) -> Optional[float]:
+    """Parse a rate-limit duration header into seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = DURATION_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    seconds = parse_duration(value)
+    if seconds is not None:
+        return max(0.0, seconds)
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Retry policy shared by all calls to one provider
+    Thread-safe: the pacing window is shared so one throttled call slows the rest
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        max_attempts: int = 4,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0
+    ):
+        self.provider = provider
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._not_before = 0.0
+        self._lock = threading.Lock()
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Equal-jitter exponential backoff for the given (1-based) attempt"""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+    def header_delay(self, response: requests.Response) -> Optional[float]:
+        """Delay the provider asked for, if any"""
+        headers = response.headers
+        retry_after = parse_retry_after(headers.get("retry-after"))
+        if retry_after is not None:
+            return retry_after
+
+        # No Retry-After: wait for whichever exhausted quota resets last
+        delays = []
+        for quota in ("requests", "tokens"):
+            remaining = headers.get(f"x-ratelimit-remaining-{quota}")
+            reset = parse_duration(headers.get(f"x-ratelimit-reset-{quota}"))
+            if reset is not None and remaining is not None and remaining.strip() in ("0", "0.0"):
+                delays.append(reset)
+        if delays:
+            return max(delays)
+
+        if response.status_code == 429:
+            # Throttled without an exhausted quota reported - use the shortest reset hint
+            resets = [parse_duration(headers.get(f"x-ratelimit-reset-{q}")) for q in ("requests", "tokens")]
+            resets = [r for r in resets if r is not None]
+            if resets:
+                return min(resets)
+        return None
+
+    def retry_delay(self, attempt: int, response: Optional[requests.Response] = None) -> Optional[float]:
+        """
+        Seconds to wait before the next attempt, or None to give up
+        Provider hints win over backoff; hints beyond max_delay (e.g. daily quotas) are not retried
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if response is not None:
+            hinted = self.header_delay(response)
+            if hinted is not None:
+                if hinted > self.max_delay:
+                    return None
+                return hinted + random.uniform(0, 0.25)
+        return self.backoff_delay(attempt)
+
+    def _observe(self, response: requests.Response) -> None:
+        """Pace later calls when a successful response reports an exhausted quota"""
+        if response.status_code in RETRYABLE_STATUS_CODES:
+            return
+        delay = self.header_delay(response)
+        if delay:
+            with self._lock:
+                self._not_before = max(self._not_before, time.time() + min(delay, self.max_delay))
+
+    def _wait_for_window(self) -> None:
+        with self._lock:
+            wait = self._not_before - time.time()
+        if wait > 0:
+            print(f"      ⏸️  {self.provider} quota exhausted - pacing {wait:.1f}s")
+            time.sleep(wait)
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        on_retry: Callable[[int, float, Optional[int]], None] = None,
+        **kwargs
+    ) -> Tuple[requests.Response, int]:
+        """
+        Send a request, retrying throttled/transient failures
+        Returns (response, retries); the final response is returned as-is so callers
+        keep their own status handling
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            self._wait_for_window()
+
+            try:
+                response = requests.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                delay = self.retry_delay(attempt)
+                if delay is None:
+                    raise
+                print(f"      🔁 {self.provider} {type(e).__name__} - retry {attempt}/{self.max_attempts - 1} in {delay:.1f}s")
+                if on_retry:
+                    on_retry(attempt, delay, None)
+                time.sleep(delay)
+                continue
+
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                self._observe(response)
+                return response, attempt - 1
+
+            delay = self.retry_delay(attempt, response)
+            if delay is None:
+                return response, attempt - 1
+
+            print(f"      🔁 {self.provider} HTTP {response.status_code} - retry {attempt}/{self.max_attempts - 1} in {delay:.1f}s")
+            if response.status_code == 429:
+                # Hold every caller of this provider until the window reopens
+                with self._lock:
+                    self._not_before = max(self._not_before, time.time() + delay)
+            if on_retry:
+                on_retry(attempt, delay, response.status_code)
+            response.close()
+            time.sleep(delay)
+
+    def post(self, url: str, on_retry: Callable = None, **kwargs) -> Tuple[requests.Response, int]:
+        return self.send("POST", url, on_retry=on_retry, **kwargs)
+
+
+# Shared per-provider policies
+groq_retry_policy = RetryPolicy("Groq")
+perplexity_retry_policy = RetryPolicy("Perplexity", max_attempts=3, base_delay=2.0, max_delay=60.0)
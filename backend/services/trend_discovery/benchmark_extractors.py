@@ -0,0 +1,120 @@
+"""
+HTML extraction benchmark
+Parses saved Amazon Best Sellers pages with the selector-driven lxml extractor
+and with the previous BeautifulSoup(html.parser) + item.find() code, and checks
+both extract the same products. The lxml selectors also match the hashed price
+classes (_cDEzb_p13n-sc-price_*) the old code missed, so on fixture pages every
+card must have a price.
+
+Save fixture pages (from backend/):
+    mkdir -p services/trend_discovery/fixtures
+    curl -s -A "Mozilla/5.0" https://www.amazon.com/Best-Sellers-Beauty/zgbs/beauty \\
+        -o services/trend_discovery/fixtures/amazon_beauty.html
+
+Usage (from backend/):
+    python -m services.trend_discovery.benchmark_extractors
+    python -m services.trend_discovery.benchmark_extractors --fixtures path/to/pages --rounds 50
+Without fixture pages a synthetic best-seller grid is generated instead.
+"""
+import argparse
+import glob
+import os
+import random
+import time
+
+from bs4 import BeautifulSoup
+
+from services.trend_discovery.html_extractor import get_extractor
+
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def synthetic_page(items: int = 50, filler: int = 400, seed: int = 7) -> bytes:
+    """Best-seller grid wrapped in unrelated markup, roughly the size of a real page"""
+    rng = random.Random(seed)
+    noise = "".join(f'<div class="nav-item n{i}"><a href="/x/{i}"><span>Link {i}</span></a></div>' for i in range(filler))
+    cards = []
+    for i in range(items):
+        price = f'<span class="a-price-whole">{rng.randint(5, 300)}.</span>' if i % 3 else \
+            f'<span class="_p13n-zg-list-grid-desktop_price">${rng.randint(5, 300)}.99</span>'
+        cards.append(
+            f'<div class="a-column zg-grid-general-faceout"><div class="p13n-sc-uncoverable-faceout">'
+            f'<img src="https://images.example.com/{i}.jpg" alt="">'
+            f'<div class="_cDEzb_p13n-sc-css-line-clamp-3_g3dy1">Best Seller Product {i} - Portable Gadget</div>'
+            f'<div class="a-row">{price}</div></div></div>'
+        )
+    return f"<html><head><title>Best Sellers</title></head><body>{noise}{''.join(cards)}{noise}</body></html>".encode()
+
+
+def legacy_extract(content: bytes):
+    """Previous implementation: html.parser soup and per-item find() calls"""
+    soup = BeautifulSoup(content, 'html.parser')
+    rows = []
+    for item in soup.find_all('div', {'class': 'zg-grid-general-faceout'})[:5]:
+        title_elem = item.find('div', {'class': '_cDEzb_p13n-sc-css-line-clamp-3_g3dy1'})
+        if not title_elem:
+            title_elem = item.find('div', {'class': 'p13n-sc-truncate'})
+        img_elem = item.find('img')
+        price_elem = None
+        for tag, attrs in [
+            ('span', {'class': 'a-price-whole'}),
+            ('span', {'class': 'p13n-sc-price'}),
+            ('span', {'class': 'a-offscreen'}),
+            ('span', {'class': '_p13n-zg-list-grid-desktop_price'}),
+        ]:
+            price_elem = item.find(tag, attrs)
+            if price_elem:
+                break
+        rows.append({
+            "title": title_elem.text.strip() if title_elem else "",
+            "image_url": img_elem.get('src', '') if img_elem else "",
+            "price_text": price_elem.text.strip() if price_elem else ""
+        })
+    return rows
+
+
+def agrees(new: dict, old: dict) -> bool:
+    """Same product, allowing a price where the legacy class lookup found none"""
+    return all(new[field] == value for field, value in old.items() if value or field != "price_text")
+
+
+def run(label: str, func, pages, rounds: int):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        results = [func(page) for page in pages]
+    elapsed = time.perf_counter() - start
+    total = len(pages) * rounds
+    print(f"  {label:<10} {elapsed:>8.2f}s  {total / elapsed:>10,.1f} pages/sec  ({elapsed / total * 1000:.2f} ms/page)")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark best-seller HTML extraction")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES, help="Directory of saved .html pages")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.fixtures, "*.html")))
+    if paths:
+        pages = [open(path, "rb").read() for path in paths]
+        print(f"Loaded {len(pages)} fixture pages from {args.fixtures}")
+    else:
+        pages = [synthetic_page(seed=seed) for seed in range(5)]
+        print(f"No fixture pages in {args.fixtures} - using {len(pages)} synthetic pages")
+    print(f"  {sum(len(p) for p in pages) / len(pages) / 1024:,.0f} KB per page, {args.rounds} rounds\n")
+
+    extractor = get_extractor("amazon_best_sellers")
+    lxml_results = run("lxml", extractor.extract, pages, args.rounds)
+    legacy_results = run("bs4", legacy_extract, pages, args.rounds)
+
+    if any(len(new) != len(old) or not all(map(agrees, new, old)) for new, old in zip(lxml_results, legacy_results)):
+        print("\n  ⚠️  Extracted products differ between lxml and bs4")
+
+    missing = [row["title"][:60] for page in lxml_results for row in page if not row["price_text"]]
+    if paths and missing:
+        raise SystemExit(f"\n  ❌ {len(missing)} fixture products without a price: {missing}")
+
+
+if __name__ == "__main__":
+    main()
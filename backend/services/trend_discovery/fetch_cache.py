@@ -0,0 +1,84 @@
+"""
+Conditional-GET fetch cache for scanned pages
+Stores ETag / Last-Modified and a hash of the body per URL, together with what
+was extracted from it:
+- Conditional request headers let the server answer 304 Not Modified
+- If the server returns the full page anyway, an unchanged body hash skips parsing
+Either way the previously extracted result is reused, so an unchanged source costs
+one request and no parse CPU. State lives in /app/logs/fetch_cache.json.
+"""
+import fcntl
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+import requests
+
+
+class FetchCache:
+    """Per-URL validators, body hash and extracted result"""
+
+    def __init__(self, state_dir: str = "/app/logs"):
+        self.state_file = os.path.join(state_dir, "fetch_cache.json")
+        self.lock_file = os.path.join(state_dir, "fetch_cache.lock")
+        os.makedirs(state_dir, exist_ok=True)
+
+    def fetch(self, url: str, parse: Callable[[requests.Response], Any], headers: Dict = None,
+              timeout: float = 10) -> Optional[Any]:
+        """
+        GET a URL and return parse(response), reusing the cached result when unchanged
+        Returns None for responses other than 200/304, like an uncached fetch would.
+        """
+        entry = self._load().get(url)
+        request_headers = dict(headers or {})
+        if entry:
+            if entry.get("etag"):
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = requests.get(url, headers=request_headers, timeout=timeout)
+
+        if response.status_code == 304 and entry:
+            print(f"   ♻️  Not modified: {url}")
+            return entry["result"]
+        if response.status_code != 200:
+            return None
+
+        body_hash = hashlib.sha256(response.content).hexdigest()
+        if entry and entry.get("body_hash") == body_hash:
+            print(f"   ♻️  Unchanged content: {url}")
+            result = entry["result"]
+        else:
+            result = parse(response)
+
+        self._store(url, {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "body_hash": body_hash,
+            "result": result,
+            "fetched_at": datetime.utcnow().isoformat()
+        })
+        return result
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.state_file, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _store(self, url: str, entry: Dict) -> None:
+        with open(self.lock_file, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                state = self._load()
+                state[url] = entry
+                tmp_path = f"{self.state_file}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(state, f)
+                os.replace(tmp_path, self.state_file)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
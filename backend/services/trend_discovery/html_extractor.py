@@ -0,0 +1,65 @@
+"""
+Selector-driven HTML extraction with lxml
+Each scraped source is described in selectors.json: an XPath for the repeating
+item and, per field, a list of fallback XPaths tried in order (first non-empty
+wins). The expressions are compiled once per process, and pages are parsed with
+lxml's C parser, so a site's markup change is a data edit, not a scanner change.
+"""
+import json
+import os
+from typing import Dict, List, Optional
+
+from lxml import etree, html
+
+
+SELECTORS_FILE = os.path.join(os.path.dirname(__file__), "selectors.json")
+
+
+class SelectorExtractor:
+    """Compiled item/field XPaths for one source"""
+
+    def __init__(self, name: str, spec: Dict):
+        self.name = name
+        self.limit = spec.get("limit")
+        self.item_xpath = etree.XPath(spec["item"])
+        self.field_xpaths = {
+            field: [etree.XPath(expression) for expression in expressions]
+            for field, expressions in spec["fields"].items()
+        }
+
+    @staticmethod
+    def _first_value(item, xpaths: List[etree.XPath]) -> str:
+        for xpath in xpaths:
+            for result in xpath(item):
+                # Elements give their text content; attribute/text results are strings already
+                value = result.text_content() if hasattr(result, "text_content") else str(result)
+                value = value.strip()
+                if value:
+                    return value
+        return ""
+
+    def extract(self, content: bytes) -> List[Dict[str, str]]:
+        """One dict of field -> text per item found in the page"""
+        if not content:
+            return []
+        tree = html.fromstring(content)
+        items = self.item_xpath(tree)
+        if self.limit:
+            items = items[:self.limit]
+        return [
+            {field: self._first_value(item, xpaths) for field, xpaths in self.field_xpaths.items()}
+            for item in items
+        ]
+
+
+_extractors: Optional[Dict[str, SelectorExtractor]] = None
+
+
+def get_extractor(name: str) -> SelectorExtractor:
+    """Extractor for a source declared in selectors.json (compiled on first use)"""
+    global _extractors
+    if _extractors is None:
+        with open(SELECTORS_FILE, "r") as f:
+            specs = json.load(f)
+        _extractors = {source: SelectorExtractor(source, spec) for source, spec in specs.items()}
+    return _extractors[name]
@@ -0,0 +1,94 @@
+"""
+Multi-keyword matcher for trending-keyword boosting
+An Aho-Corasick automaton over word tokens, built once per scan from every
+active TrendingKeyword. Matching a product's text is a single pass over its
+tokens, however many keywords are loaded, and only whole-token sequences match
+("led" matches "LED strip lights" but not "sledding").
+"""
+import math
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Weight of a keyword match by how strongly it is trending
+STRENGTH_WEIGHTS = {
+    "explosive": 1.0,
+    "strong": 0.75,
+    "emerging": 0.5,
+    "fading": 0.25,
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.casefold())
+
+
+def keyword_weight(trend_strength: str, search_count: int) -> float:
+    """Strength weight, nudged up for keywords discovered repeatedly"""
+    base = STRENGTH_WEIGHTS.get((trend_strength or "").lower(), 0.5)
+    return round(base * (1 + 0.25 * math.log10(max(search_count or 1, 1))), 3)
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton; keywords and text are compared as token sequences"""
+
+    def __init__(self, keywords: Iterable[Tuple[str, float]] = ()):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[int]] = [[]]
+        self.keywords: List[str] = []
+        self.weights: List[float] = []
+
+        for keyword, weight in keywords:
+            self._add(keyword, weight)
+        self._build_failure_links()
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def _add(self, keyword: str, weight: float) -> None:
+        tokens = tokenize(keyword)
+        if not tokens:
+            return
+        node = 0
+        for token in tokens:
+            next_node = self._goto[node].get(token)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][token] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            node = next_node
+        self._outputs[node].append(len(self.keywords))
+        self.keywords.append(keyword)
+        self.weights.append(weight)
+
+    def _build_failure_links(self) -> None:
+        """BFS; each node also inherits its failure node's outputs so matching never walks the chain"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(token, 0)
+                self._fail[child] = target if target != child else 0  # Root's children fail to root
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+    def match(self, text: str) -> Dict[str, float]:
+        """Keywords found in the text, with their weights"""
+        matches = {}
+        node = 0
+        for token in tokenize(text):
+            while node and token not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(token, 0)
+            for index in self._outputs[node]:
+                matches[self.keywords[index]] = self.weights[index]
+        return matches
@@ -0,0 +1,102 @@
+"""
+Substring search over active trending keywords
+Enrichment lookups are served from an in-process trigram index of the active
+keywords, refreshed from the database at most once a minute. A query's trigrams
+narrow the candidates to a handful before the substring check, so lookups stay
+sub-millisecond as the keyword table grows. If the cache cannot be loaded the
+search goes to the database, where the pg_trgm / FTS5 index serves it
+(see models.database.create_keyword_search_index).
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Set, Tuple
+
+from sqlalchemy import text
+
+from models.database import TrendingKeyword
+
+
+CACHE_TTL_SECONDS = 60
+
+
+def trigrams(value: str) -> Set[str]:
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+class KeywordSearchIndex:
+    """Active keywords ranked by search_count, with a trigram -> keyword posting index"""
+
+    def __init__(self, ttl_seconds: float = CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._keywords: List[Tuple[str, str]] = []  # (keyword, casefolded), best first
+        self._postings: Dict[str, List[int]] = {}
+        self._expires_at: List[datetime] = []
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _refresh(self, db) -> None:
+        rows = db.query(TrendingKeyword.keyword, TrendingKeyword.expires_at).filter(
+            TrendingKeyword.expires_at > datetime.utcnow()
+        ).order_by(TrendingKeyword.search_count.desc()).all()
+
+        keywords, postings, expires_at = [], {}, []
+        for i, (keyword, expires) in enumerate(rows):
+            folded = keyword.casefold()
+            keywords.append((keyword, folded))
+            expires_at.append(expires)
+            for gram in trigrams(folded):
+                postings.setdefault(gram, []).append(i)
+
+        self._keywords, self._postings, self._expires_at = keywords, postings, expires_at
+        self._loaded_at = time.monotonic()
+
+    def search(self, db, query: str, limit: int = 10) -> List[str]:
+        """Active keywords containing `query` (case-insensitive), most searched first"""
+        folded = query.casefold()
+        with self._lock:
+            if time.monotonic() - self._loaded_at > self.ttl_seconds:
+                self._refresh(db)
+            keywords, postings, expires_at = self._keywords, self._postings, self._expires_at
+
+        grams = trigrams(folded)
+        if grams:
+            lists = sorted((postings.get(gram, []) for gram in grams), key=len)
+            candidates = lists[0]  # Rarest trigram; its postings are already in rank order
+        else:
+            candidates = range(len(keywords))  # 1-2 character query: scan (the list is small)
+
+        now = datetime.utcnow()
+        results = []
+        for i in candidates:
+            keyword, folded_keyword = keywords[i]
+            if folded in folded_keyword and expires_at[i] > now:
+                results.append(keyword)
+                if len(results) >= limit:
+                    break
+        return results
+
+
+def search_keywords_db(db, query: str, limit: int = 10) -> List[str]:
+    """Same search straight against the database (uses the FTS5 table on SQLite)"""
+    if db.bind.dialect.name == "sqlite" and len(query) >= 3:
+        rows = db.execute(text(
+            "SELECT k.keyword FROM trending_keywords_fts f "
+            "JOIN trending_keywords k ON k.id = f.rowid "
+            "WHERE trending_keywords_fts MATCH :query AND k.expires_at > :now "
+            "ORDER BY k.search_count DESC LIMIT :limit"
+        ), {"query": '"' + query.replace('"', '""') + '"', "now": datetime.utcnow(), "limit": limit})
+        return [row[0] for row in rows]
+
+    # PostgreSQL: ILIKE '%q%' is served by the pg_trgm GIN index
+    keywords = db.query(TrendingKeyword).filter(
+        TrendingKeyword.keyword.ilike(f"%{query}%"),
+        TrendingKeyword.expires_at > datetime.utcnow()
+    ).order_by(
+        TrendingKeyword.search_count.desc()
+    ).limit(limit).all()
+    return [kw.keyword for kw in keywords]
+
+
+# Shared by every discovery instance in the process
+keyword_search_index = KeywordSearchIndex()
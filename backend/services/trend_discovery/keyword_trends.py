@@ -0,0 +1,131 @@
+"""
+Trend momentum for discovered keywords
+Each TrendingKeyword keeps:
+- daily_counts: observations per UTC day for the last HISTORY_DAYS ({"2025-10-01": 2, ...})
+- decayed_score: observation count with exponential decay (half-life HALF_LIFE_DAYS),
+  updated incrementally: score = score * 0.5 ** (days since score_updated_at / half-life) + 1
+- velocity: observations/day over the last RECENT_DAYS minus the rate over the rest of the history
+
+A keyword seen 50 times a month ago decays to almost nothing, while one seen a few
+times this week has both a higher score and a positive velocity, so it ranks first.
+
+observe() computes a new keyword's first values; observe_sql() is the same update as
+SQL expressions over the stored row, for the SET clause of the discovery upsert.
+"""
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import Integer, Text, case, cast, func, literal, select, union_all
+
+
+HALF_LIFE_DAYS = 3.0
+HISTORY_DAYS = 28
+RECENT_DAYS = 3
+VELOCITY_WEIGHT = 2.0  # Priority bonus per extra observation/day over the baseline
+
+
+def decay(score: float, since: Optional[datetime], now: datetime) -> float:
+    if not score or since is None:
+        return score or 0.0
+    elapsed_days = max((now - since).total_seconds(), 0) / 86400
+    return score * 0.5 ** (elapsed_days / HALF_LIFE_DAYS)
+
+
+def prune(daily_counts: Optional[Dict[str, int]], today: date) -> Dict[str, int]:
+    oldest = (today - timedelta(days=HISTORY_DAYS - 1)).isoformat()
+    return {day: count for day, count in (daily_counts or {}).items() if day >= oldest}
+
+
+def velocity(daily_counts: Optional[Dict[str, int]], today: date) -> float:
+    """Recent observations/day minus the baseline observations/day"""
+    recent_start = (today - timedelta(days=RECENT_DAYS - 1)).isoformat()
+    recent = baseline = 0
+    for day, count in prune(daily_counts, today).items():
+        if day >= recent_start:
+            recent += count
+        else:
+            baseline += count
+    return round(recent / RECENT_DAYS - baseline / (HISTORY_DAYS - RECENT_DAYS), 3)
+
+
+def observe(daily_counts: Optional[Dict[str, int]], score: Optional[float], score_updated_at: Optional[datetime],
+            now: datetime, count: int = 1) -> Tuple[Dict[str, int], float, float]:
+    """Record `count` new observations; returns (daily_counts, decayed_score, velocity)"""
+    today = now.date()
+    counts = prune(daily_counts, today)
+    counts[today.isoformat()] = counts.get(today.isoformat(), 0) + count
+    new_score = round(decay(score or 0.0, score_updated_at, now) + count, 4)
+    return counts, new_score, velocity(counts, today)
+
+
+def observe_sql(model, dialect: str, now: datetime) -> Dict[str, Any]:
+    """
+    observe() + strength() for one new observation, as ON CONFLICT DO UPDATE expressions
+    over the stored row (model = TrendingKeyword, dialect "postgresql" or "sqlite"), so
+    concurrent discovery runs each add their observation without a read-modify-write
+    """
+    today = now.date()
+    oldest = (today - timedelta(days=HISTORY_DAYS - 1)).isoformat()
+    recent_start = (today - timedelta(days=RECENT_DAYS - 1)).isoformat()
+    table = model.__table__
+
+    # Stored days still inside the history window
+    days = func.json_each(model.daily_counts).table_valued("key", "value").alias("days")
+    count = cast(cast(days.c.value, Text), Integer)
+    kept = select(days.c.key.label("day"), count.label("n")).where(days.c.key >= oldest)
+
+    entries = union_all(kept, select(literal(today.isoformat()).label("day"), literal(1).label("n"))).subquery()
+    per_day = select(entries.c.day, func.sum(entries.c.n).label("n")).group_by(entries.c.day).subquery()
+    build_object = func.json_object_agg if dialect == "postgresql" else func.json_group_object
+    daily_counts = select(build_object(per_day.c.day, per_day.c.n)).correlate(table).scalar_subquery()
+
+    recent = select(func.coalesce(func.sum(case((days.c.key >= recent_start, count), else_=0)), 0) + 1) \
+        .where(days.c.key >= oldest).correlate(table).scalar_subquery()
+    baseline = select(func.coalesce(func.sum(case((days.c.key < recent_start, count), else_=0)), 0)) \
+        .where(days.c.key >= oldest).correlate(table).scalar_subquery()
+    velocity = cast(recent, model.velocity.type) / RECENT_DAYS - cast(baseline, model.velocity.type) / (HISTORY_DAYS - RECENT_DAYS)
+
+    # decay(): days since score_updated_at, never negative
+    if dialect == "postgresql":
+        elapsed_days = func.greatest((now - datetime(1970, 1, 1)).total_seconds() - func.extract("epoch", model.score_updated_at), 0) / 86400
+    else:
+        elapsed_days = func.max(func.julianday(now.isoformat(sep=" ")) - func.julianday(model.score_updated_at), 0)
+    score = func.coalesce(model.decayed_score * func.power(0.5, elapsed_days / HALF_LIFE_DAYS), 0) + 1
+
+    return {
+        "daily_counts": daily_counts,
+        "decayed_score": score,
+        "score_updated_at": now,
+        "velocity": velocity,
+        "trend_strength": case(
+            (velocity >= 1.0, "explosive"),
+            (velocity >= 0.5, "strong"),
+            ((velocity < -0.25) | (score < 0.25), "fading"),
+            else_="emerging"
+        ),
+    }
+
+
+def current_score(keyword, now: datetime) -> float:
+    """Decayed score as of now; rows from before the history existed decay their search_count"""
+    if keyword.decayed_score is not None:
+        return decay(keyword.decayed_score, keyword.score_updated_at, now)
+    return decay(float(keyword.search_count or 1), keyword.last_seen, now)
+
+
+def strength(score: float, keyword_velocity: float) -> str:
+    """trend_strength label from momentum"""
+    if keyword_velocity >= 1.0:
+        return "explosive"
+    if keyword_velocity >= 0.5:
+        return "strong"
+    if keyword_velocity < -0.25 or score < 0.25:
+        return "fading"
+    return "emerging"
+
+
+def priority(keyword, now: datetime) -> Tuple[float, float, str]:
+    """(priority, velocity, strength) used to order keywords for the scanner"""
+    score = current_score(keyword, now)
+    keyword_velocity = velocity(keyword.daily_counts, now.date())
+    return score + VELOCITY_WEIGHT * max(keyword_velocity, 0.0), keyword_velocity, strength(score, keyword_velocity)
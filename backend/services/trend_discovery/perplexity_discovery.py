@@ -5,13 +5,57 @@ This service uses Perplexity's real-time web search to:
 1. Discover NEW trending products and keywords from the web
 2. Feed intelligence back to the trend scanner
 3. Create a self-improving trend detection system
+
+Discovery is sharded: one smaller request per configured category
+(PERPLEXITY_DISCOVERY_CATEGORIES), run concurrently within a request budget,
+then merged and deduplicated before the keywords are stored.
 """
+import asyncio
 import os
-import requests
 import json
+import re
+import threading
+import time
 from datetime import datetime
 from typing import Dict, List, Any
 
+from config.settings import settings
+from services.ai_analysis.json_stream import parse_json_response
+from services.ai_analysis.llm_telemetry import llm_telemetry
+from services.ai_analysis.retry_policy import perplexity_retry_policy
+
+
+STRENGTH_RANK = {"explosive": 3, "strong": 2, "emerging": 1}
+
+
+def discovery_categories() -> List[str]:
+    return [c.strip() for c in settings.PERPLEXITY_DISCOVERY_CATEGORIES.split(",") if c.strip()]
+
+
+def _dedupe_key(value: str) -> str:
+    return re.sub(r"\s+", " ", (value or "").strip().casefold())
+
+
+class RateBudget:
+    """Spaces request starts so no more than `per_minute` begin in any minute (thread-safe)"""
+
+    def __init__(self, per_minute: int):
+        self.interval = 60.0 / max(per_minute, 1)
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            start = max(time.monotonic(), self._next_start)
+            self._next_start = start + self.interval
+        wait = start - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+
+
+# Shared by every discovery instance in the process
+discovery_rate_budget = RateBudget(settings.PERPLEXITY_REQUESTS_PER_MINUTE)
+
 
 class PerplexityTrendDiscovery:
     """
@@ -23,22 +67,108 @@ class PerplexityTrendDiscovery:
         self.api_url = "https://api.perplexity.ai/chat/completions"
         self.model = "sonar"  # Updated to valid Perplexity model
 
-    async def discover_trending_products(self, category: str = None) -> Dict[str, Any]:
+    async def discover_categories(self, categories: List[str] = None) -> Dict[str, Any]:
+        """
+        Discover trends for each category concurrently and merge the results
+
+        Args:
+            categories: Categories to search (default: PERPLEXITY_DISCOVERY_CATEGORIES)
+
+        Returns:
+            Merged discovery dict, with per-category status under "shards"
+        """
+        categories = categories or discovery_categories()
+        semaphore = asyncio.Semaphore(settings.PERPLEXITY_MAX_CONCURRENCY)
+
+        async def discover_shard(category: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.discover_trending_products(category, max_tokens=settings.PERPLEXITY_SHARD_MAX_TOKENS)
+
+        print(f"\n🌐 [PERPLEXITY DISCOVERY] {len(categories)} categories, "
+              f"{settings.PERPLEXITY_MAX_CONCURRENCY} at a time")
+        started = time.perf_counter()
+        results = await asyncio.gather(*(discover_shard(category) for category in categories))
+
+        merged = self.merge_discoveries(dict(zip(categories, results)))
+        failed = [category for category, status in merged["shards"].items() if status != "ok"]
+        print(f"   ⏱️  {len(categories)} categories in {time.perf_counter() - started:.1f}s"
+              + (f" ({len(failed)} failed: {', '.join(failed)})" if failed else ""))
+        return merged
+
+    @staticmethod
+    def merge_discoveries(results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine per-category discoveries, deduplicating products and keywords by name"""
+        products: Dict[str, Dict[str, Any]] = {}
+        keywords: Dict[str, Dict[str, Any]] = {}
+        insights = {"hot_categories": [], "emerging_niches": [], "fading_trends": []}
+        observations = []
+        shards = {}
+
+        for category, discovered in results.items():
+            shards[category] = discovered.get("status", "ok") if discovered else "empty"
+
+            for product in discovered.get("discovered_products", []) or []:
+                key = _dedupe_key(product.get("product_name"))
+                if not key:
+                    continue
+                product = {**product, "category": product.get("category") or category}
+                existing = products.get(key)
+                if existing is None:
+                    products[key] = product
+                    continue
+                # Same product from two categories: union the lists, keep the stronger trend
+                for field in ("keywords", "platforms", "source_urls"):
+                    merged = existing.get(field) or []
+                    merged = merged + [v for v in product.get(field) or [] if v not in merged]
+                    existing[field] = merged
+                if STRENGTH_RANK.get(product.get("trend_strength"), 0) > STRENGTH_RANK.get(existing.get("trend_strength"), 0):
+                    existing["trend_strength"] = product["trend_strength"]
+
+            for kw_data in discovered.get("trending_keywords", []) or []:
+                key = _dedupe_key(kw_data.get("keyword"))
+                if key and key not in keywords:
+                    keywords[key] = {**kw_data, "category": kw_data.get("category") or category}
+
+            market = discovered.get("market_insights", {}) or {}
+            for field, values in insights.items():
+                for value in market.get(field, []) or []:
+                    if value not in values:
+                        values.append(value)
+            if market.get("key_observations"):
+                observations.append(f"[{category}] {market['key_observations']}")
+
+        insights["key_observations"] = "\n".join(observations)
+        return {
+            "discovered_products": list(products.values()),
+            "trending_keywords": list(keywords.values()),
+            "market_insights": insights,
+            "shards": shards
+        }
+
+    async def discover_trending_products(self, category: str = None, max_tokens: int = 3000) -> Dict[str, Any]:
         """
         Use Perplexity to discover what's actually trending RIGHT NOW on the web
 
         Args:
             category: Optional category to focus on (e.g., "beauty", "electronics")
+            max_tokens: Response budget (category shards use a smaller one)
 
         Returns:
             Dict with discovered trends, keywords, and products
         """
+        # The HTTP call blocks, so shards run in threads
+        return await asyncio.to_thread(self._discover, category, max_tokens)
 
+    def _discover(self, category: str, max_tokens: int) -> Dict[str, Any]:
         # Build search query based on category
         if category:
             search_focus = f"trending {category} products"
+            subject = f"{category} products"
+            product_target = "3-6"
         else:
             search_focus = "viral products trending"
+            subject = "products"
+            product_target = "5-10"
 
         prompt = f"""You are a Trend Discovery AI with real-time web access. Your job is to find what's ACTUALLY trending RIGHT NOW (not predictions).
 
@@ -47,10 +177,10 @@ class PerplexityTrendDiscovery:
 Use your web search capability to find:
 
 **STEP 1: Search Social Media Trends**
-- Search: "viral products TikTok 2025"
-- Search: "trending on Amazon right now"
-- Search: "what's selling on eBay today"
-- Search: "Instagram viral products"
+- Search: "viral {subject} TikTok 2025"
+- Search: "trending {subject} on Amazon right now"
+- Search: "{subject} selling on eBay today"
+- Search: "Instagram viral {subject}"
 - Find products with HIGH recent engagement (last 7-30 days)
 
 **STEP 2: Search E-commerce Trends**
@@ -111,7 +241,7 @@ For each trending product found:
 - ✅ Focus on products that can be sourced and sold (not unicorns)
 - ✅ Extract actual search keywords people are using
 
-Find 5-10 high-quality trending products with strong evidence. Be specific with data, not vague."""
+Find {product_target} high-quality trending products with strong evidence. Be specific with data, not vague."""
 
         try:
             headers = {
@@ -132,14 +262,18 @@ Find 5-10 high-quality trending products with strong evidence. Be specific with
                     }
                 ],
                 "temperature": 0.3,
-                "max_tokens": 3000
+                "max_tokens": max_tokens
             }
 
             print(f"\n🌐 [PERPLEXITY DISCOVERY] Searching web for trending products...")
             print(f"   Focus: {search_focus}")
 
-            response = requests.post(
+            discovery_rate_budget.acquire()
+            response, _ = perplexity_retry_policy.post(
                 self.api_url,
+                on_retry=lambda attempt, delay, status_code: llm_telemetry.record_retry(
+                    "discovery", self.model, "perplexity", status_code
+                ),
                 headers=headers,
                 json=payload,
                 timeout=60
@@ -172,15 +306,9 @@ Find 5-10 high-quality trending products with strong evidence. Be specific with
             return self._fallback_discovery()
 
     def _parse_json_response(self, content: str) -> Dict[str, Any]:
-        """Parse JSON from Perplexity response"""
+        """Parse JSON from Perplexity response (with a single repair pass)"""
         try:
-            # Try to find JSON in the response
-            start = content.find('{')
-            end = content.rfind('}') + 1
-            if start >= 0 and end > start:
-                json_str = content[start:end]
-                return json.loads(json_str)
-            return {}
+            return parse_json_response(content)
         except:
             return {}
 
@@ -214,8 +342,12 @@ Find 5-10 high-quality trending products with strong evidence. Be specific with
             for kw_data in discovered_data.get('trending_keywords', []):
                 keywords.append(kw_data.get('keyword'))
 
-            # Remove duplicates
-            keywords = list(set(keywords))
+            # Remove duplicates (case/spacing variants count as one)
+            unique = {}
+            for kw in keywords:
+                if isinstance(kw, str) and _dedupe_key(kw):
+                    unique.setdefault(_dedupe_key(kw), kw.strip())
+            keywords = list(unique.values())
 
             if keywords:
                 print(f"   📝 Extracted {len(keywords)} trending keywords:")
@@ -246,55 +378,92 @@ Find 5-10 high-quality trending products with strong evidence. Be specific with
         """
         try:
             from models.database import TrendingKeyword
+            from services.trend_discovery import keyword_trends
             from datetime import datetime, timedelta
 
-            # Store each keyword with metadata
+            keywords = [kw for kw in keywords if isinstance(kw, str) and kw.strip()]
+            if not keywords:
+                return
+
+            products = discovered_data.get('discovered_products', [])
+            index = self._build_keyword_index(products)
+            now = datetime.utcnow()
+
+            dialect = db.bind.dialect.name
+            if dialect == "sqlite":
+                from sqlalchemy.dialects.sqlite import insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert
+
+            rows = []
             for keyword in keywords:
-                # Find related products for this keyword
-                related_products = []
-                for product in discovered_data.get('discovered_products', []):
-                    if keyword.lower() in ' '.join(product.get('keywords', [])).lower():
-                        related_products.append(product.get('product_name'))
-
-                # Check if keyword already exists
-                existing = db.query(TrendingKeyword).filter(
-                    TrendingKeyword.keyword == keyword
-                ).first()
-
-                if existing:
-                    # Update existing
-                    existing.search_count += 1
-                    existing.last_seen = datetime.utcnow()
-                    existing.related_products = related_products[:5]  # Top 5
-                else:
-                    # Create new
-                    new_keyword = TrendingKeyword(
-                        keyword=keyword,
-                        category=self._infer_category(keyword, discovered_data),
-                        search_count=1,
-                        trend_strength="emerging",
-                        last_seen=datetime.utcnow(),
-                        expires_at=datetime.utcnow() + timedelta(days=30),
-                        related_products=related_products[:5]
-                    )
-                    db.add(new_keyword)
+                # Products whose keywords contain every token of this keyword, in discovery order
+                matches = self._matching_products(index, keyword)
+                daily_counts, decayed_score, velocity = keyword_trends.observe(None, None, None, now)
+                rows.append({
+                    "keyword": keyword,
+                    "category": products[matches[0]].get('category', 'General') if matches else 'General',
+                    "search_count": 1,
+                    "trend_strength": keyword_trends.strength(decayed_score, velocity),
+                    "daily_counts": daily_counts,
+                    "decayed_score": decayed_score,
+                    "score_updated_at": now,
+                    "velocity": velocity,
+                    "last_seen": now,
+                    "first_discovered": now,
+                    "expires_at": now + timedelta(days=30),
+                    "related_products": [products[i].get('product_name') for i in matches[:5]],  # Top 5
+                    "created_at": now,
+                    "updated_at": now
+                })
+
+            # One INSERT ... ON CONFLICT (keyword) DO UPDATE ... RETURNING for the whole batch.
+            # New keywords get the values above; known ones add this observation to their stored
+            # momentum in the SET clause, so concurrent discovery runs never lose an observation
+            statement = insert(TrendingKeyword).values(rows)
+            statement = statement.on_conflict_do_update(
+                index_elements=[TrendingKeyword.keyword],
+                set_={
+                    "search_count": TrendingKeyword.search_count + 1,
+                    **keyword_trends.observe_sql(TrendingKeyword, dialect, now),
+                    "last_seen": statement.excluded.last_seen,
+                    "expires_at": statement.excluded.expires_at,  # Still trending: keep it 30 more days
+                    "related_products": statement.excluded.related_products,
+                    "updated_at": statement.excluded.updated_at
+                }
+            ).returning(TrendingKeyword.search_count, TrendingKeyword.trend_strength)
+            stored = db.execute(statement).all()
 
             db.commit()
-            print(f"   💾 Stored {len(keywords)} keywords in database")
+            new_keywords = sum(1 for row in stored if row.search_count == 1)
+            rising = sum(1 for row in stored if row.trend_strength in ("explosive", "strong"))
+            print(f"   💾 Stored {len(stored)} keywords in database ({new_keywords} new, {rising} rising)")
 
         except Exception as e:
             print(f"   ⚠️ Could not store keywords (table may not exist): {str(e)[:100]}")
             db.rollback()
 
-    def _infer_category(self, keyword: str, discovered_data: Dict[str, Any]) -> str:
-        """Infer category from keyword and discovered data"""
-        # Check if keyword is in any product's category
-        for product in discovered_data.get('discovered_products', []):
-            if keyword.lower() in ' '.join(product.get('keywords', [])).lower():
-                return product.get('category', 'General')
-
-        # Default
-        return 'General'
+    @staticmethod
+    def _build_keyword_index(products: List[Dict[str, Any]]) -> Dict[str, set]:
+        """Inverted index: token -> indexes of products whose keywords contain it"""
+        index: Dict[str, set] = {}
+        for i, product in enumerate(products):
+            for token in ' '.join(product.get('keywords', [])).lower().split():
+                index.setdefault(token, set()).add(i)
+        return index
+
+    @staticmethod
+    def _matching_products(index: Dict[str, set], keyword: str) -> List[int]:
+        """
+        Products whose keywords contain every token of `keyword` (whole words, any order)
+        Unlike the old substring test, "led mask" also matches "led face mask", and
+        "ring" no longer matches inside "earring".
+        """
+        tokens = keyword.lower().split()
+        if not tokens:
+            return []
+        postings = sorted((index.get(token, set()) for token in tokens), key=len)
+        return sorted(set.intersection(*postings))
 
     async def enrich_product_search(self, db, search_query: str) -> List[str]:
         """
@@ -303,19 +472,15 @@ Find 5-10 high-quality trending products with strong evidence. Be specific with
         Example: User searches "beauty" → Returns ["heated eyelash curler", "viral mascara", etc.]
         """
         try:
-            from models.database import TrendingKeyword
-            from datetime import datetime
-
-            # Get related trending keywords from DB
-            keywords = db.query(TrendingKeyword).filter(
-                TrendingKeyword.keyword.ilike(f"%{search_query}%"),
-                TrendingKeyword.expires_at > datetime.utcnow()
-            ).order_by(
-                TrendingKeyword.search_count.desc()
-            ).limit(10).all()
-
-            # Return keyword strings
-            return [kw.keyword for kw in keywords]
+            from services.trend_discovery.keyword_search import keyword_search_index, search_keywords_db
+
+            # Related trending keywords from the in-process index, or the database if it can't load
+            try:
+                return keyword_search_index.search(db, search_query, limit=10)
+            except Exception as e:
+                print(f"   ⚠️ Keyword cache unavailable, querying database: {str(e)[:100]}")
+                db.rollback()
+                return search_keywords_db(db, search_query, limit=10)
 
         except Exception as e:
             print(f"   ⚠️ Could not enrich search: {str(e)[:100]}")
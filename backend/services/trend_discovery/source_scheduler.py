@@ -0,0 +1,112 @@
+"""
+Per-source scan scheduling from the trend_sources table
+Each TrendSource row sets how often its source plugin (see sources.py) is
+scanned (scan_interval_minutes) and whether it is scanned at all (enabled).
+A dispatcher runs every few minutes and queues one scan task per source that is due. Sources that keep returning nothing
+new back off exponentially, so static sources stop using bandwidth while
+fast-moving ones keep their short interval; the first new product resets them.
+Backoff state is kept in TrendSource.config:
+    {"empty_scans": 3, "last_result": {...}}
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from models.database import TrendSource
+from services.trend_discovery.sources import SOURCE_REGISTRY
+
+
+DEFAULT_INTERVAL_MINUTES = 60
+MAX_BACKOFF_STEPS = 4           # Interval doubles per empty scan, up to 16x
+MAX_INTERVAL_MINUTES = 24 * 60  # Even a static source is rechecked daily
+
+
+def empty_scans(source: TrendSource) -> int:
+    return int((source.config or {}).get("empty_scans", 0))
+
+
+def effective_interval(source: TrendSource) -> timedelta:
+    """Configured interval, doubled for each consecutive scan that found nothing new"""
+    base = source.scan_interval_minutes or DEFAULT_INTERVAL_MINUTES
+    minutes = base * (2 ** min(empty_scans(source), MAX_BACKOFF_STEPS))
+    return timedelta(minutes=min(minutes, max(base, MAX_INTERVAL_MINUTES)))
+
+
+def next_scan_at(source: TrendSource) -> datetime:
+    if source.last_scan is None:
+        return datetime.min
+    return source.last_scan + effective_interval(source)
+
+
+def ensure_sources(db) -> None:
+    """Create a trend_sources row for every registered source plugin that has none yet"""
+    existing = {name for (name,) in db.query(TrendSource.name).all()}
+    missing = [name for name in SOURCE_REGISTRY if name not in existing]
+    for name in missing:
+        plugin = SOURCE_REGISTRY[name]
+        db.add(TrendSource(
+            name=name,
+            source_type=plugin.source_type,
+            enabled=True,
+            products_found=0,
+            scan_interval_minutes=plugin.scan_interval_minutes,
+            config={}
+        ))
+    if missing:
+        db.commit()
+        print(f"📋 Registered {len(missing)} trend sources: {', '.join(missing)}")
+
+
+def due_sources(db, now: datetime = None) -> List[TrendSource]:
+    """Enabled, registered sources whose next scan time has passed"""
+    now = now or datetime.utcnow()
+    sources = db.query(TrendSource).filter(
+        TrendSource.enabled == True,
+        TrendSource.name.in_(list(SOURCE_REGISTRY))
+    ).all()
+    return [source for source in sources if next_scan_at(source) <= now]
+
+
+def claim(db, source: TrendSource, now: datetime = None) -> None:
+    """Stamp last_scan when a scan is queued so the next dispatch does not queue it again"""
+    source.last_scan = now or datetime.utcnow()
+    db.commit()
+
+
+def record_scan(db, name: str, result: Dict) -> None:
+    """Update a source's counters and backoff from a finished scan"""
+    source = db.query(TrendSource).filter(TrendSource.name == name).first()
+    if source is None:
+        return
+
+    new_products = result.get("products_created", 0) + result.get("products_updated", 0)
+    config = dict(source.config or {})  # New dict so SQLAlchemy sees the JSON change
+    previous = config.get("empty_scans", 0)
+    config["empty_scans"] = 0 if new_products else previous + 1
+    config["last_result"] = {
+        "products_created": result.get("products_created", 0),
+        "products_updated": result.get("products_updated", 0),
+        "products_filtered": result.get("products_filtered", 0),
+        "finished_at": datetime.utcnow().isoformat()
+    }
+
+    source.config = config
+    source.products_found = (source.products_found or 0) + result.get("products_created", 0)
+    source.last_scan = datetime.utcnow()
+    db.commit()
+
+    if new_products:
+        if previous:
+            print(f"   ⏱️  {name}: new products again, back to every {source.scan_interval_minutes} min")
+    else:
+        print(f"   ⏱️  {name}: nothing new ({config['empty_scans']} in a row), "
+              f"next scan in {int(effective_interval(source).total_seconds() // 60)} min")
+
+
+def describe(source: TrendSource) -> Dict:
+    """Schedule fields for the sources API"""
+    return {
+        "scan_interval_minutes": source.scan_interval_minutes,
+        "effective_interval_minutes": int(effective_interval(source).total_seconds() // 60),
+        "empty_scans": empty_scans(source),
+        "next_scan": next_scan_at(source).isoformat() if source.last_scan else None
+    }
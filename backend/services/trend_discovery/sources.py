@@ -0,0 +1,156 @@
+"""
+Trend source plugins
+A source is a class registered under its TrendSource.name. Scanning it is
+    fetch() -> parse(raw) -> normalize(product)
+and every source's products then go through the same ingest stage
+(TrendScanner.ingest_products: keyword boost, adaptive threshold, save).
+
+Each source also declares how it is run as a Celery task:
+- queue: its own queue (scan.<name>), so a slow source never sits in front of the others
+- concurrency: how many scans of it may run at once across all workers
+- timeout_seconds: soft time limit for one scan
+- scan_interval_minutes / source_type: defaults for its trend_sources row
+
+Adding a source = subclass SourcePlugin, implement fetch (and parse if the raw
+data is not already product dicts) and decorate it with @register_source.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Type
+
+
+SOURCE_REGISTRY: Dict[str, Type["SourcePlugin"]] = {}
+
+
+def register_source(cls: Type["SourcePlugin"]) -> Type["SourcePlugin"]:
+    SOURCE_REGISTRY[cls.name] = cls
+    return cls
+
+
+def get_source_plugin(name: str, scanner) -> "SourcePlugin":
+    """Plugin instance for a TrendSource name (KeyError if none is registered)"""
+    return SOURCE_REGISTRY[name](scanner)
+
+
+def source_queue(name: str) -> str:
+    return f"scan.{name}"
+
+
+class SourcePlugin(ABC):
+    """Base class for a trend source"""
+
+    name: str = ""
+    source_type: str = ""
+    concurrency: int = 1
+    timeout_seconds: int = 120
+    scan_interval_minutes: int = 60
+
+    def __init__(self, scanner):
+        # The scanner provides shared HTTP headers and the conditional-GET fetch cache
+        self.scanner = scanner
+
+    @property
+    def queue(self) -> str:
+        return source_queue(self.name)
+
+    @abstractmethod
+    async def fetch(self) -> Any:
+        """Retrieve raw data from the source"""
+
+    def parse(self, raw: Any) -> List[Dict[str, Any]]:
+        """Turn raw data into product dicts"""
+        return list(raw or [])
+
+    def normalize(self, product: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Common product shape for ingest; None drops the product"""
+        title = (product.get("title") or "").strip()
+        if not title:
+            return None
+        return {
+            **product,
+            "title": title,
+            "description": product.get("description") or "",
+            "category": product.get("category") or "",
+            "image_url": product.get("image_url") or "",
+            "source_url": product.get("source_url") or "",
+            "trend_score": max(0.0, min(100.0, float(product.get("trend_score") or 0))),
+            "trend_source": product.get("trend_source") or self.name,
+            "search_volume": int(product.get("search_volume") or 0),
+            "social_mentions": int(product.get("social_mentions") or 0),
+            "price": float(product.get("price") or 0),
+        }
+
+    async def collect(self) -> List[Dict[str, Any]]:
+        raw = await self.fetch()
+        products = (self.normalize(product) for product in self.parse(raw))
+        return [product for product in products if product]
+
+
+class ScannerMethodSource(SourcePlugin):
+    """Source whose fetch+parse is still a TrendScanner._scan_* method"""
+
+    method: str = ""
+
+    async def fetch(self) -> Any:
+        return await getattr(self.scanner, self.method)()
+
+
+# Registration order is the order scan_all_sources visits them
+
+@register_source
+class AmazonBestSellersSource(ScannerMethodSource):
+    name = "amazon_best_sellers"
+    source_type = "marketplace"
+    method = "_scan_amazon_best_sellers"
+    timeout_seconds = 180  # Three category pages, 10s timeout each plus rate limiting
+
+
+@register_source
+class AmazonDealsSource(ScannerMethodSource):
+    name = "amazon_deals"
+    source_type = "marketplace"
+    method = "_scan_amazon_deals"
+    scan_interval_minutes = 30
+    timeout_seconds = 60
+
+
+@register_source
+class TikTokTrendsSource(ScannerMethodSource):
+    name = "tiktok_trends"
+    source_type = "social_media"
+    method = "_scan_tiktok_trends"
+    timeout_seconds = 60
+
+
+@register_source
+class GoogleTrendsSource(ScannerMethodSource):
+    name = "google_trends"
+    source_type = "google_trends"
+    method = "_scan_google_trends"
+    timeout_seconds = 90
+
+
+@register_source
+class InstagramTrendsSource(ScannerMethodSource):
+    name = "instagram_trends"
+    source_type = "social_media"
+    method = "_scan_instagram_trends"
+    scan_interval_minutes = 120
+    timeout_seconds = 60
+
+
+@register_source
+class PinterestTrendsSource(ScannerMethodSource):
+    name = "pinterest_trends"
+    source_type = "social_media"
+    method = "_scan_pinterest_trends"
+    scan_interval_minutes = 240
+    timeout_seconds = 60
+
+
+@register_source
+class RedditTrendsSource(ScannerMethodSource):
+    name = "reddit_trends"
+    source_type = "social_media"
+    method = "_scan_reddit_trends"
+    scan_interval_minutes = 30
+    timeout_seconds = 60
@@ -2,7 +2,6 @@
 Trend discovery and scanning service - REAL PRODUCTS
 """
 import requests
-from bs4 import BeautifulSoup
 from typing import List, Dict, Any
 from datetime import datetime, timedelta
 import json
@@ -12,39 +11,35 @@ import time
 from models.database import Product, TrendSource, ProductStatus, TrendingKeyword
 from config.settings import settings
 from services.ai_analysis.adaptive_scoring import AdaptiveScoring
+from services.trend_discovery.fetch_cache import FetchCache
+from services.trend_discovery.html_extractor import get_extractor
+from services.trend_discovery.sources import SOURCE_REGISTRY, get_source_plugin
+from services.trend_discovery.keyword_matcher import KeywordMatcher, keyword_weight
+from services.trend_discovery import keyword_trends
+from tasks.analysis_stream import publish_products
+from monitoring.prometheus_metrics import SCANNER_FETCH_DURATION, SCANNER_SOURCE_ERRORS, PRODUCTS_INGESTED
+
+
+# Trend score boost for matching discovered keywords (per unit of keyword weight, capped)
+KEYWORD_BOOST_PER_WEIGHT = 5
+KEYWORD_BOOST_MAX = 15
 
 
 class TrendScanner:
     """Scans multiple sources for REAL trending products"""
 
     def __init__(self):
-        self.sources = [
-            self._scan_amazon_best_sellers,
-            self._scan_amazon_deals,
-            self._scan_tiktok_trends,
-            self._scan_google_trends,
-            self._scan_instagram_trends,
-            self._scan_pinterest_trends,
-            self._scan_reddit_trends,
-        ]
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         self.adaptive_scorer = None
         self.discovered_keywords = []  # Keywords from Perplexity discovery
+        self.keyword_matcher = KeywordMatcher()
+        self.fetch_cache = FetchCache()
+        self._created_products = []  # Added this transaction; published to the analysis stream on commit
 
-    async def scan_all_sources(self, db) -> Dict[str, Any]:
-        """Scan all enabled trend sources"""
-        products_found = 0
-        products_created = 0
-        products_updated = 0
-        products_filtered = 0
-        sources_scanned = 0
-
-        print("\n" + "="*80)
-        print("🔍 TREND SCANNER - Starting Multi-Source Scan")
-        print("="*80)
-
+    def _prepare_scan(self, db) -> None:
+        """Adaptive thresholds and discovered keywords used to filter/boost every source"""
         # Initialize adaptive scoring system
         self.adaptive_scorer = AdaptiveScoring(db)
 
@@ -62,40 +57,112 @@ class TrendScanner:
         # Load discovered keywords from Perplexity (feedback loop)
         self._load_discovered_keywords(db)
 
+    async def collect_source(self, name: str) -> List[Dict[str, Any]]:
+        """Fetch, parse and normalize one source's products (no database access)"""
+        plugin = get_source_plugin(name, self)
+
+        print(f"\n📡 Scanning source: {name}")
+        fetch_start = time.perf_counter()
+        try:
+            products = await plugin.collect()
+        except Exception:
+            SCANNER_SOURCE_ERRORS.labels(source=name).inc()
+            raise
+        SCANNER_FETCH_DURATION.labels(source=name).observe(time.perf_counter() - fetch_start)
+        print(f"   Found {len(products)} products from this source")
+        return products
+
+    def _ingest(self, db, source: str, products: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Save the products that pass the adaptive threshold (after _prepare_scan)"""
+        counts = {"found": 0, "created": 0, "updated": 0, "filtered": 0}
+
+        for i, product_data in enumerate(products, 1):
+            print(f"   → Product {i}/{len(products)}: {product_data.get('title', 'Unknown')[:50]}...")
+
+            # Boost products matching keywords Perplexity found trending
+            keyword_matches = self.match_trending_keywords(
+                product_data.get('title', ''), product_data.get('description', '')
+            )
+            if keyword_matches:
+                boost = min(KEYWORD_BOOST_MAX, round(sum(keyword_matches.values()) * KEYWORD_BOOST_PER_WEIGHT))
+                product_data['trend_score'] = min(100, product_data.get('trend_score', 0) + boost)
+                print(f"      🔑 Trending keywords {list(keyword_matches)[:3]} (+{boost})")
+
+            # Apply adaptive filtering before saving
+            base_score = product_data.get('trend_score', 0)
+            min_score = self.adaptive_scorer.thresholds.get('min_trend_score', 70)
+
+            # Check if product meets minimum threshold
+            if base_score < min_score:
+                print(f"      ⊘ Filtered (score {base_score} < min threshold {min_score})")
+                counts["filtered"] += 1
+                PRODUCTS_INGESTED.labels(source=source, result="filtered").inc()
+                continue
+
+            result = self._save_product(db, product_data)
+            PRODUCTS_INGESTED.labels(source=source, result=result).inc()
+            counts["found"] += 1
+            if result in ("created", "updated"):
+                counts[result] += 1
+
+        print(f"   ✓ Source complete!")
+        return counts
+
+    def ingest_products(self, db, source: str, products: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Common ingest stage for one source's collected products"""
+        self._prepare_scan(db)
+        try:
+            counts = self._ingest(db, source, products)
+        except Exception:
+            db.rollback()
+            self._created_products = []
+            raise
+        self._commit_and_publish(db)
+
+        return {
+            "source": source,
+            "products_found": counts["found"],
+            "products_created": counts["created"],
+            "products_updated": counts["updated"],
+            "products_filtered": counts["filtered"]
+        }
+
+    async def scan_source(self, db, name: str) -> Dict[str, Any]:
+        """Collect and ingest a single source by its TrendSource name"""
+        products = await self.collect_source(name)
+        return self.ingest_products(db, name, products)
+
+    async def scan_all_sources(self, db) -> Dict[str, Any]:
+        """Scan all enabled trend sources"""
+        products_found = 0
+        products_created = 0
+        products_updated = 0
+        products_filtered = 0
+        sources_scanned = 0
+
+        print("\n" + "="*80)
+        print("🔍 TREND SCANNER - Starting Multi-Source Scan")
+        print("="*80)
+
+        self._prepare_scan(db)
+
         print()
 
-        for scan_func in self.sources:
+        for name in SOURCE_REGISTRY:
             try:
-                print(f"\n📡 Scanning source: {scan_func.__name__}")
-                products = await scan_func()
-                print(f"   Found {len(products)} products from this source")
-
-                for i, product_data in enumerate(products, 1):
-                    print(f"   → Product {i}/{len(products)}: {product_data.get('title', 'Unknown')[:50]}...")
-
-                    # Apply adaptive filtering before saving
-                    base_score = product_data.get('trend_score', 0)
-                    min_score = self.adaptive_scorer.thresholds.get('min_trend_score', 70)
-
-                    # Check if product meets minimum threshold
-                    if base_score < min_score:
-                        print(f"      ⊘ Filtered (score {base_score} < min threshold {min_score})")
-                        products_filtered += 1
-                        continue
-
-                    result = self._save_product(db, product_data)
-                    products_found += 1
-                    if result == "created":
-                        products_created += 1
-                    elif result == "updated":
-                        products_updated += 1
+                products = await self.collect_source(name)
+                counts = self._ingest(db, name, products)
+                products_found += counts["found"]
+                products_created += counts["created"]
+                products_updated += counts["updated"]
+                products_filtered += counts["filtered"]
+                self._commit_and_publish(db)
 
                 sources_scanned += 1
-                print(f"   ✓ Source complete!")
                 time.sleep(2)  # Be respectful with rate limiting
 
             except Exception as e:
-                print(f"   ✗ Error scanning {scan_func.__name__}: {str(e)}")
+                print(f"   ✗ Error scanning {name}: {str(e)}")
                 import traceback
                 print(f"   Traceback: {traceback.format_exc()}")
 
@@ -120,6 +187,14 @@ class TrendScanner:
             "sources_scanned": sources_scanned
         }
 
+    def _commit_and_publish(self, db) -> None:
+        """Commit, then hand new products to the analysis stream so analysis starts right away"""
+        db.commit()
+        published = publish_products(product.id for product in self._created_products)
+        if published:
+            print(f"   📤 {published} new products queued for analysis")
+        self._created_products = []
+
     def _save_product(self, db, product_data: Dict[str, Any]) -> str:
         """Save discovered product to database"""
         # Check if product already exists (by title similarity)
@@ -154,6 +229,7 @@ class TrendScanner:
                 status=ProductStatus.DISCOVERED
             )
             db.add(product)
+            self._created_products.append(product)
             return "created"
 
     # ==================== REAL SOURCE SCANNERS ====================
@@ -177,82 +253,13 @@ class TrendScanner:
 
             for category_name, url in categories[:3]:  # Scan top 3 categories to start
                 try:
-                    response = requests.get(url, headers=self.headers, timeout=10)
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
-
-                        # Find product listings
-                        product_items = soup.find_all('div', {'class': 'zg-grid-general-faceout'})[:5]
-
-                        for item in product_items:
-                            try:
-                                # Extract product title
-                                title_elem = item.find('div', {'class': '_cDEzb_p13n-sc-css-line-clamp-3_g3dy1'})
-                                if not title_elem:
-                                    title_elem = item.find('div', {'class': 'p13n-sc-truncate'})
-
-                                # Extract image
-                                img_elem = item.find('img')
-
-                                # Extract price - try multiple selectors
-                                price = 0
-                                price_elem = None
-
-                                # Try different price selectors
-                                price_selectors = [
-                                    ('span', {'class': 'a-price-whole'}),
-                                    ('span', {'class': 'p13n-sc-price'}),
-                                    ('span', {'class': 'a-offscreen'}),
-                                    ('span', {'class': '_p13n-zg-list-grid-desktop_price'}),
-                                ]
-
-                                for tag, attrs in price_selectors:
-                                    price_elem = item.find(tag, attrs)
-                                    if price_elem:
-                                        break
-
-                                if title_elem:
-                                    title = title_elem.text.strip()
-                                    image_url = img_elem.get('src', '') if img_elem else ''
-
-                                    if price_elem:
-                                        try:
-                                            price_text = price_elem.text.replace('$', '').replace(',', '').strip()
-                                            # Remove any decimal point notation (e.g., "99." becomes "99")
-                                            if '.' in price_text:
-                                                price = float(price_text)
-                                            else:
-                                                price = float(price_text)
-                                        except Exception as e:
-                                            print(f"Price parsing error: {str(e)} for text: {price_elem.text if price_elem else 'None'}")
-                                            price = 0
-
-                                    # If no price found, estimate based on category
-                                    if price == 0:
-                                        category_price_map = {
-                                            "Beauty & Personal Care": 24.99,
-                                            "Electronics": 79.99,
-                                            "Home & Kitchen": 49.99,
-                                            "Sports & Outdoors": 39.99,
-                                            "Health & Household": 29.99,
-                                            "Kitchen & Dining": 34.99
-                                        }
-                                        price = category_price_map.get(category_name, 49.99)
-
-                                    products.append({
-                                        "title": title,
-                                        "description": f"Amazon Best Seller in {category_name}",
-                                        "category": category_name,
-                                        "image_url": image_url,
-                                        "source_url": url,
-                                        "trend_score": 85.0,
-                                        "trend_source": f"Amazon Best Sellers - {category_name}",
-                                        "search_volume": 5000,
-                                        "price": price
-                                    })
-                            except Exception as e:
-                                print(f"Error parsing Amazon product: {str(e)}")
-                                continue
+                    page_products = self.fetch_cache.fetch(
+                        url,
+                        lambda response: self._parse_amazon_best_sellers(response, category_name, url),
+                        headers=self.headers,
+                        timeout=10
+                    )
+                    products.extend(page_products or [])
 
                     time.sleep(1)  # Rate limiting
                 except Exception as e:
@@ -394,6 +401,48 @@ class TrendScanner:
 
         return products[:15]  # Return top 15 (increased from 10)
 
+    def _parse_amazon_best_sellers(self, response, category_name: str, url: str) -> List[Dict[str, Any]]:
+        """Extract up to 5 products from one Amazon Best Sellers page (selectors in selectors.json)"""
+        products = []
+
+        for item in get_extractor("amazon_best_sellers").extract(response.content):
+            if not item["title"]:
+                continue
+
+            price = 0
+            if item["price_text"]:
+                try:
+                    price = float(item["price_text"].replace('$', '').replace(',', '').strip())
+                except ValueError as e:
+                    print(f"Price parsing error: {str(e)} for text: {item['price_text']}")
+                    price = 0
+
+            # If no price found, estimate based on category
+            if price == 0:
+                category_price_map = {
+                    "Beauty & Personal Care": 24.99,
+                    "Electronics": 79.99,
+                    "Home & Kitchen": 49.99,
+                    "Sports & Outdoors": 39.99,
+                    "Health & Household": 29.99,
+                    "Kitchen & Dining": 34.99
+                }
+                price = category_price_map.get(category_name, 49.99)
+
+            products.append({
+                "title": item["title"],
+                "description": f"Amazon Best Seller in {category_name}",
+                "category": category_name,
+                "image_url": item["image_url"],
+                "source_url": url,
+                "trend_score": 85.0,
+                "trend_source": f"Amazon Best Sellers - {category_name}",
+                "search_volume": 5000,
+                "price": price
+            })
+
+        return products
+
     async def _scan_google_trends(self) -> List[Dict[str, Any]]:
         """
         Scan Google Trends for REAL trending product searches
@@ -488,56 +537,12 @@ class TrendScanner:
                     headers = {
                         'User-Agent': 'TrendScanner/1.0'
                     }
-                    response = requests.get(url, headers=headers, timeout=10)
-
-                    if response.status_code == 200:
-                        data = response.json()
-                        posts = data['data']['children']
-
-                        for post in posts[:10]:  # Get more to filter
-                            post_data = post['data']
-                            title = post_data.get('title', '')
-                            url = post_data.get('url', '')
-                            score = post_data.get('score', 0)
-                            is_self = post_data.get('is_self', False)
-
-                            # Filter out meta posts, mod announcements, and non-product posts
-                            skip_keywords = [
-                                'meta', 'mod', 'announcement', 'rule', 'sticky', 'megathread',
-                                'discussion', 'weekly', 'monthly', 'looking for', 'wtb', 'iso',
-                                'help', 'question', 'advice', 'recommend', 'suggestion'
-                            ]
-
-                            title_lower = title.lower()
-                            if any(keyword in title_lower for keyword in skip_keywords):
-                                continue
-
-                            # Skip text/self posts (usually discussions, not products)
-                            if is_self:
-                                continue
-
-                            # Skip if score too low (likely not interesting)
-                            if score < 10:
-                                continue
-
-                            # Only add products with meaningful titles
-                            if len(title) < 15:  # Too short to be a real product
-                                continue
-
-                            products.append({
-                                "title": title,
-                                "description": f"Trending on r/{subreddit} ({score} upvotes)",
-                                "category": "Reddit Finds",
-                                "source_url": url,
-                                "trend_score": min(95, 70 + (score / 100)),
-                                "trend_source": f"Reddit - r/{subreddit}",
-                                "social_mentions": score,
-                                "price": 0  # Will be estimated by fallback logic
-                            })
-
-                            # Limit to 5 good products per subreddit
-                            if len(products) >= 5:
-                                break
+                    products.extend(self.fetch_cache.fetch(
+                        url,
+                        lambda response: self._parse_reddit_listing(response, subreddit),
+                        headers=headers,
+                        timeout=10
+                    ) or [])
 
                     time.sleep(2)  # Reddit rate limiting
                 except Exception as e:
@@ -571,6 +576,58 @@ class TrendScanner:
 
         return products[:5]
 
+    def _parse_reddit_listing(self, response, subreddit: str) -> List[Dict[str, Any]]:
+        """Extract up to 5 product posts from a subreddit's hot.json listing"""
+        products = []
+        posts = response.json()['data']['children']
+
+        for post in posts[:10]:  # Get more to filter
+            post_data = post['data']
+            title = post_data.get('title', '')
+            url = post_data.get('url', '')
+            score = post_data.get('score', 0)
+            is_self = post_data.get('is_self', False)
+
+            # Filter out meta posts, mod announcements, and non-product posts
+            skip_keywords = [
+                'meta', 'mod', 'announcement', 'rule', 'sticky', 'megathread',
+                'discussion', 'weekly', 'monthly', 'looking for', 'wtb', 'iso',
+                'help', 'question', 'advice', 'recommend', 'suggestion'
+            ]
+
+            title_lower = title.lower()
+            if any(keyword in title_lower for keyword in skip_keywords):
+                continue
+
+            # Skip text/self posts (usually discussions, not products)
+            if is_self:
+                continue
+
+            # Skip if score too low (likely not interesting)
+            if score < 10:
+                continue
+
+            # Only add products with meaningful titles
+            if len(title) < 15:  # Too short to be a real product
+                continue
+
+            products.append({
+                "title": title,
+                "description": f"Trending on r/{subreddit} ({score} upvotes)",
+                "category": "Reddit Finds",
+                "source_url": url,
+                "trend_score": min(95, 70 + (score / 100)),
+                "trend_source": f"Reddit - r/{subreddit}",
+                "social_mentions": score,
+                "price": 0  # Will be estimated by fallback logic
+            })
+
+            # Limit to 5 good products per subreddit
+            if len(products) >= 5:
+                break
+
+        return products
+
     async def _scan_tiktok_trends(self) -> List[Dict[str, Any]]:
         """
         Scan TikTok trending products and hashtags
@@ -930,18 +987,27 @@ class TrendScanner:
         try:
             from datetime import datetime
 
-            # Get active trending keywords (not expired)
+            # All active trending keywords (not expired) - the matcher handles thousands
+            now = datetime.utcnow()
             trending = db.query(TrendingKeyword).filter(
-                TrendingKeyword.expires_at > datetime.utcnow()
-            ).order_by(
-                TrendingKeyword.search_count.desc()
-            ).limit(20).all()
+                TrendingKeyword.expires_at > now
+            ).all()
+
+            # Rising keywords first: decayed score plus positive velocity, as of now
+            ranked = sorted(
+                ((kw, *keyword_trends.priority(kw, now)) for kw in trending),
+                key=lambda entry: entry[1], reverse=True
+            )
 
-            if trending:
-                self.discovered_keywords = [kw.keyword for kw in trending]
+            self.keyword_matcher = KeywordMatcher(
+                (kw.keyword, keyword_weight(strength, kw.search_count)) for kw, _, _, strength in ranked
+            )
+
+            if ranked:
+                self.discovered_keywords = [kw.keyword for kw, _, _, _ in ranked]
                 print(f"\n🔄 [FEEDBACK LOOP] Loaded {len(self.discovered_keywords)} trending keywords from Perplexity:")
-                for i, keyword in enumerate(self.discovered_keywords[:10], 1):
-                    print(f"   {i}. {keyword}")
+                for i, (kw, score, velocity, strength) in enumerate(ranked[:10], 1):
+                    print(f"   {i}. {kw.keyword} ({strength}, score {score:.2f}, velocity {velocity:+.2f}/day)")
                 if len(self.discovered_keywords) > 10:
                     print(f"   ... and {len(self.discovered_keywords) - 10} more")
                 print(f"   💡 Scanner will prioritize products matching these keywords")
@@ -955,14 +1021,15 @@ class TrendScanner:
             else:
                 print(f"\n⚠️ Could not load discovered keywords: {str(e)[:100]}")
             self.discovered_keywords = []
+            self.keyword_matcher = KeywordMatcher()
+
+    def match_trending_keywords(self, product_title: str, product_description: str = "") -> Dict[str, float]:
+        """Discovered trending keywords found in a product's text, with their weights"""
+        return self.keyword_matcher.match(product_title + " " + product_description)
 
     def has_trending_keywords(self, product_title: str, product_description: str = "") -> bool:
         """
         Check if a product matches any discovered trending keywords
         Used to boost products that match Perplexity discoveries
         """
-        if not self.discovered_keywords:
-            return False
-
-        text = (product_title + " " + product_description).lower()
-        return any(keyword.lower() in text for keyword in self.discovered_keywords)
+        return bool(self.match_trending_keywords(product_title, product_description))
@@ -0,0 +1,164 @@
+"""
+Streaming hand-off from trend scanning to AI analysis
+Every product the scanner creates is appended to a Redis stream once its
+transaction commits. Analyzer consumers read the stream through a consumer
+group and start on a product within seconds of discovery instead of waiting
+for the 15-minute batch:
+- Each entry goes to one consumer of the group; it is acked once the product is
+  analyzed, or once it turns out not to need analysis any more
+- Entries left pending by a consumer that died are claimed by another consumer
+  after ANALYSIS_LEASE_MINUTES
+- The batch task keeps running as a backstop; both claim a product with the
+  same conditional DISCOVERED -> ANALYZING update, so none is analyzed twice
+
+Run a consumer (from backend/):
+    python -m tasks.analysis_stream
+It serves its own Prometheus exporter on ANALYSIS_CONSUMER_METRICS_PORT (LLM
+metrics of its analyses, plus per-message run time in celery_task_duration_seconds)
+"""
+import asyncio
+import os
+import socket
+import time
+from datetime import datetime
+from typing import Iterable, List, Tuple
+
+from config.settings import settings
+from monitoring.prometheus_metrics import CELERY_TASK_DURATION, start_exporter
+
+
+STREAM_KEY = "products:discovered"
+CONSUMER_GROUP = "analyzers"
+STREAM_MAX_LENGTH = 10000     # Approximate cap; entries are tiny and acked within minutes
+READ_BLOCK_MS = 5000
+COOLDOWN_SECONDS = 5          # Same spacing as the batch task, for LLM rate limits
+STREAM_TASK_NAME = "tasks.analysis_stream.analyze_streamed_product"  # Task label for run-time metrics
+
+
+def _client(block_ms: int = 0):
+    import redis
+    # A blocking read has to outlive its own block time
+    return redis.Redis.from_url(settings.REDIS_URL, socket_timeout=2 + block_ms / 1000, decode_responses=True)
+
+
+def publish_products(product_ids: Iterable[int]) -> int:
+    """
+    Append committed product ids to the stream; returns how many were published
+    Never raises - if Redis is unavailable the batch task still finds the products.
+    """
+    product_ids = list(product_ids)
+    if not product_ids:
+        return 0
+    try:
+        pipe = _client().pipeline(transaction=False)
+        for product_id in product_ids:
+            pipe.xadd(STREAM_KEY, {"product_id": str(product_id)}, maxlen=STREAM_MAX_LENGTH, approximate=True)
+        pipe.execute()
+        return len(product_ids)
+    except Exception as e:
+        print(f"⚠️  Analysis stream unavailable, products wait for the batch task: {str(e)[:80]}")
+        return 0
+
+
+class AnalysisStreamConsumer:
+    """One member of the analyzers consumer group"""
+
+    def __init__(self, name: str = None):
+        self.name = name or f"{socket.gethostname()}-{os.getpid()}"
+        self.redis = _client(READ_BLOCK_MS)
+        self.lease_ms = settings.ANALYSIS_LEASE_MINUTES * 60 * 1000
+        self._ensure_group()
+
+    def _ensure_group(self) -> None:
+        import redis
+        try:
+            self.redis.xgroup_create(STREAM_KEY, CONSUMER_GROUP, id="0", mkstream=True)
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def claim_abandoned(self, count: int = 10) -> List[Tuple[str, dict]]:
+        """Entries another consumer read but never acked within the analysis lease"""
+        result = self.redis.xautoclaim(
+            STREAM_KEY, CONSUMER_GROUP, self.name, min_idle_time=self.lease_ms, start_id="0-0", count=count
+        )
+        return [(entry_id, fields) for entry_id, fields in result[1] if fields]
+
+    def read(self, count: int = 1) -> List[Tuple[str, dict]]:
+        """New entries for this consumer, blocking up to READ_BLOCK_MS"""
+        response = self.redis.xreadgroup(
+            CONSUMER_GROUP, self.name, {STREAM_KEY: ">"}, count=count, block=READ_BLOCK_MS
+        )
+        return [entry for _, entries in response or [] for entry in entries]
+
+    def ack(self, entry_id: str) -> None:
+        self.redis.xack(STREAM_KEY, CONSUMER_GROUP, entry_id)
+
+    def run(self) -> None:
+        print(f"📥 Analysis stream consumer {self.name} listening on {STREAM_KEY}")
+        while True:
+            try:
+                entries = self.claim_abandoned() or self.read()
+            except Exception as e:
+                print(f"⚠️  Stream read failed: {str(e)[:100]}")
+                time.sleep(READ_BLOCK_MS / 1000)
+                continue
+
+            for entry_id, fields in entries:
+                try:
+                    analyzed = analyze_streamed_product(int(fields["product_id"]))
+                    self.ack(entry_id)
+                except Exception as e:
+                    # Left pending: claimed again once the lease runs out
+                    print(f"⚠️  Stream entry {entry_id} not processed: {str(e)[:100]}")
+                    continue
+                if analyzed:
+                    time.sleep(COOLDOWN_SECONDS)
+
+
+def analyze_streamed_product(product_id: int) -> bool:
+    """
+    Analyze one product from the stream; True if it was analyzed here
+    A product that is no longer DISCOVERED (batch task took it, already reviewed,
+    deleted) is skipped. A failed analysis goes back to DISCOVERED for the batch task.
+    """
+    from models.database import SessionLocal, Product, ProductStatus
+    from services.ai_analysis.product_analyzer import ProductAnalyzer
+    from tasks.analysis_tasks import claim_for_analysis, store_analysis
+
+    started = time.perf_counter()
+    state = "FAILURE"  # Same final states as the Celery task signals
+    db = SessionLocal()
+    try:
+        if not claim_for_analysis(db, product_id):
+            state = "IGNORED"
+            return False
+        product = db.query(Product).filter(Product.id == product_id).first()
+
+        print(f"📦 [STREAM] Analyzing product {product_id}: {product.title[:60]}...")
+        try:
+            analysis = asyncio.run(ProductAnalyzer().analyze_product(product, db))
+            store_analysis(db, product, analysis)
+        except Exception as e:
+            print(f"    ❌ Error analyzing product {product_id}: {str(e)}")
+            db.rollback()
+            product.status = ProductStatus.DISCOVERED  # Reset status
+            db.commit()
+            return False
+
+        state = "SUCCESS"
+        latency = (datetime.utcnow() - product.created_at).total_seconds() if product.created_at else None
+        print(f"    ✅ PENDING_REVIEW in {time.perf_counter() - started:.1f}s"
+              + (f" ({latency:.0f}s after discovery)" if latency is not None else ""))
+        return True
+    finally:
+        db.close()
+        CELERY_TASK_DURATION.labels(task=STREAM_TASK_NAME, state=state).observe(time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    try:
+        start_exporter(settings.ANALYSIS_CONSUMER_METRICS_PORT)
+    except Exception as e:
+        print(f"⚠️  Metrics exporter not started: {str(e)}")
+    AnalysisStreamConsumer().run()
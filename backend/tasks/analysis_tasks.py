@@ -2,9 +2,11 @@
 Celery tasks for AI product analysis
 """
 from tasks.celery_app import celery_app
-from models.database import SessionLocal, Product, ProductStatus
+from models.database import SessionLocal, Product, ProductStatus, AuditLog
 from services.ai_analysis.product_analyzer import ProductAnalyzer
-from datetime import datetime
+from services.ai_analysis.analysis_checkpoint import AnalysisCheckpoint
+from config.settings import settings
+from datetime import datetime, timedelta
 
 
 @celery_app.task(name='tasks.analysis_tasks.analyze_pending_products_task')
@@ -49,54 +51,22 @@ def analyze_pending_products_task():
                 print(f"📦 [{idx}/{total_products}] Analyzing: {product.title[:60]}...")
                 print(f"    Status: DISCOVERED → ANALYZING")
 
-                # Update status to analyzing
-                product.status = ProductStatus.ANALYZING
-                db.commit()
+                # Update status to analyzing (skipped if a stream consumer already took it)
+                if not claim_for_analysis(db, product.id):
+                    print(f"    ⏭️  Already claimed by another analyzer")
+                    continue
+                db.refresh(product)
 
                 # Run analysis (with db for ML integration)
                 print(f"    🤖 Deploying 11-agent AI system...")
                 analysis = asyncio.run(analyzer.analyze_product(product, db))
 
-                # Update product with analysis results
-                product.ai_category = analysis.get("ai_category")
-                product.ai_keywords = analysis.get("ai_keywords")
-                product.ai_description = analysis.get("ai_description")
-                product.profit_potential_score = analysis.get("profit_potential_score")
-                product.competition_level = analysis.get("competition_level")
-
-                # Store ML prediction if available
-                if analysis.get("ml_prediction"):
-                    product.ml_prediction_data = analysis.get("ml_prediction")
-
-                # Calculate suggested_price from estimated_cost
-                if product.estimated_cost and product.estimated_cost > 0:
-                    # Apply 2.5x markup for suggested retail price
-                    product.suggested_price = round(product.estimated_cost * 2.5, 2)
-                    product.potential_margin = round(product.suggested_price - product.estimated_cost, 2)
-                elif analysis.get("suggested_price"):
-                    # Parse price range from AI like "$20-$50"
-                    price_str = analysis.get("suggested_price")
-                    try:
-                        if "-" in price_str:
-                            # Get average of range
-                            low = float(price_str.split("$")[1].split("-")[0])
-                            high = float(price_str.split("-")[1].replace("$", ""))
-                            product.suggested_price = round((low + high) / 2, 2)
-                            if product.estimated_cost:
-                                product.potential_margin = round(product.suggested_price - product.estimated_cost, 2)
-                    except:
-                        pass
-
-                # Move to pending review
-                product.status = ProductStatus.PENDING_REVIEW
-                product.analyzed_at = datetime.utcnow()
-
+                store_analysis(db, product, analysis)
                 analyzed_count += 1
-                db.commit()
 
                 print(f"    ✅ Analysis complete! Status: ANALYZING → PENDING_REVIEW")
                 print(f"    📊 Profit Score: {product.profit_potential_score}/100")
-                print(f"    💰 Suggested Price: ${product.suggested_price:.2f}")
+                print(f"    💰 Suggested Price: ${product.suggested_price or 0:.2f}")
 
                 # Add delay between products to avoid rate limiting
                 if idx < total_products:
@@ -144,25 +114,118 @@ def analyze_single_product_task(product_id: int):
         import asyncio
         analysis = asyncio.run(analyzer.analyze_product(product, db))
 
-        # Update product
-        product.ai_category = analysis.get("ai_category")
-        product.ai_keywords = analysis.get("ai_keywords")
-        product.ai_description = analysis.get("ai_description")
-        product.profit_potential_score = analysis.get("profit_potential_score")
-        product.competition_level = analysis.get("competition_level")
+        store_analysis(db, product, analysis)
 
-        # Store ML prediction if available
-        if analysis.get("ml_prediction"):
-            product.ml_prediction_data = analysis.get("ml_prediction")
+        return {"status": "completed", "product_id": product_id}
 
-        product.status = ProductStatus.PENDING_REVIEW
-        product.analyzed_at = datetime.utcnow()
+    except Exception as e:
+        return {"status": "failed", "error": str(e)}
+    finally:
+        db.close()
 
-        db.commit()
 
-        return {"status": "completed", "product_id": product_id}
+@celery_app.task(name='tasks.analysis_tasks.reclaim_stale_analyses_task')
+def reclaim_stale_analyses_task():
+    """
+    Reclaim products stuck in ANALYZING
+    Runs every 5 minutes
+
+    Each checkpointed agent result refreshes the product's updated_at, so a product
+    with no heartbeat for ANALYSIS_LEASE_MINUTES lost its worker. It goes back to
+    DISCOVERED and the next batch resumes from its checkpointed agent results.
+    """
+    db = SessionLocal()
+    try:
+        lease_expired = datetime.utcnow() - timedelta(minutes=settings.ANALYSIS_LEASE_MINUTES)
+        stale = db.query(Product).filter(
+            Product.status == ProductStatus.ANALYZING,
+            Product.updated_at < lease_expired
+        ).all()
+
+        for product in stale:
+            print(f"♻️  Reclaiming stale analysis: product {product.id} ({product.title[:50]})")
+            product.status = ProductStatus.DISCOVERED
+
+        db.commit()
+        return {"status": "completed", "reclaimed_count": len(stale)}
 
     except Exception as e:
+        db.rollback()
         return {"status": "failed", "error": str(e)}
     finally:
         db.close()
+
+
+def claim_for_analysis(db, product_id: int) -> bool:
+    """
+    DISCOVERED -> ANALYZING as one conditional UPDATE
+    Returns False if another worker (batch task or stream consumer) claimed it first.
+    """
+    claimed = db.query(Product).filter(
+        Product.id == product_id,
+        Product.status == ProductStatus.DISCOVERED
+    ).update({
+        Product.status: ProductStatus.ANALYZING,
+        Product.updated_at: datetime.utcnow()
+    }, synchronize_session=False)
+    db.commit()
+    return claimed == 1
+
+
+def store_analysis(db, product, analysis: dict):
+    """Copy analysis results onto the product and move it to PENDING_REVIEW"""
+    product.ai_category = analysis.get("ai_category")
+    product.ai_keywords = analysis.get("ai_keywords")
+    product.ai_description = analysis.get("ai_description")
+    product.profit_potential_score = analysis.get("profit_potential_score")
+    product.competition_level = analysis.get("competition_level")
+
+    # Store ML prediction if available
+    if analysis.get("ml_prediction"):
+        product.ml_prediction_data = analysis.get("ml_prediction")
+
+    # Calculate suggested_price from estimated_cost
+    if product.estimated_cost and product.estimated_cost > 0:
+        # Apply 2.5x markup for suggested retail price
+        product.suggested_price = round(product.estimated_cost * 2.5, 2)
+        product.potential_margin = round(product.suggested_price - product.estimated_cost, 2)
+    elif analysis.get("suggested_price"):
+        # Parse price range from AI like "$20-$50"
+        price_str = analysis.get("suggested_price")
+        try:
+            if "-" in price_str:
+                # Get average of range
+                low = float(price_str.split("$")[1].split("-")[0])
+                high = float(price_str.split("-")[1].replace("$", ""))
+                product.suggested_price = round((low + high) / 2, 2)
+                if product.estimated_cost:
+                    product.potential_margin = round(product.suggested_price - product.estimated_cost, 2)
+        except:
+            pass
+
+    # Move to pending review
+    product.status = ProductStatus.PENDING_REVIEW
+    product.analyzed_at = datetime.utcnow()
+    store_analysis_metrics(db, product, analysis)
+
+    db.commit()
+    AnalysisCheckpoint(db, product.id).clear()
+
+
+def store_analysis_metrics(db, product, analysis: dict):
+    """Persist per-agent latency/token/cost breakdown of an analysis to the audit log"""
+    metrics = analysis.get("agent_metrics")
+    if not metrics:
+        return
+
+    db.add(AuditLog(
+        action="product_analysis_metrics",
+        entity_type="product",
+        entity_id=product.id,
+        details=metrics
+    ))
+
+    if metrics.get("slowest_agent"):
+        slowest = metrics["agents"][metrics["slowest_agent"]]
+        print(f"    ⏱️  LLM time {metrics['total_latency_seconds']:.1f}s - slowest agent: "
+              f"{metrics['slowest_agent']} ({slowest['latency_seconds']:.1f}s)")
@@ -1,9 +1,17 @@
 """
 Celery configuration for background tasks
 """
+import os
+import time
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_init, worker_process_shutdown, task_prerun, task_postrun
+from kombu import Queue
 from config.settings import settings
+from services.trend_discovery.sources import SOURCE_REGISTRY, source_queue
+from monitoring.prometheus_metrics import (
+    reset_multiprocess_dir, start_exporter, mark_process_dead, CELERY_TASK_DURATION
+)
 
 # Initialize Celery
 celery_app = Celery(
@@ -21,16 +29,30 @@ celery_app.conf.update(
     enable_utc=True,
 )
 
+# Queues: default, the common ingest stage, and one per trend source plugin
+# (a worker without -Q consumes all of them; a source can get its own worker with -Q scan.<name>)
+celery_app.conf.task_default_queue = 'celery'
+celery_app.conf.task_queues = [Queue('celery'), Queue('trend_ingest')] + [
+    Queue(source_queue(name)) for name in SOURCE_REGISTRY
+]
+celery_app.conf.task_routes = {
+    'tasks.trend_tasks.ingest_source_products': {'queue': 'trend_ingest'},
+}
+
 # Periodic task schedule
 celery_app.conf.beat_schedule = {
-    'scan-trends-hourly': {
-        'task': 'tasks.trend_tasks.scan_trends_task',
-        'schedule': crontab(minute=0),  # Every hour
+    'dispatch-due-sources': {
+        'task': 'tasks.trend_tasks.dispatch_due_sources_task',
+        'schedule': crontab(minute='*/5'),  # Every 5 minutes - Scan each trend source on its own interval
     },
     'analyze-pending-products': {
         'task': 'tasks.analysis_tasks.analyze_pending_products_task',
         'schedule': crontab(minute='*/15'),  # Every 15 minutes
     },
+    'reclaim-stale-analyses': {
+        'task': 'tasks.analysis_tasks.reclaim_stale_analyses_task',
+        'schedule': crontab(minute='*/5'),  # Every 5 minutes - Requeue analyses whose worker died
+    },
     'sync-platform-listings': {
         'task': 'tasks.platform_tasks.sync_listings_task',
         'schedule': crontab(minute='*/30'),  # Every 30 minutes
@@ -45,6 +67,40 @@ celery_app.conf.beat_schedule = {
     },
 }
 
+
+
+@worker_init.connect
+def start_metrics_exporter(**kwargs):
+    """Expose worker metrics (LLM calls, task timings) for Prometheus"""
+    try:
+        reset_multiprocess_dir()
+        start_exporter(settings.CELERY_METRICS_PORT)
+    except Exception as e:
+        print(f"⚠️  Metrics exporter not started: {str(e)}")
+
+
+@worker_process_shutdown.connect
+def release_metrics_process(pid=None, **kwargs):
+    """Drop live samples of an exited pool process"""
+    mark_process_dead(pid or os.getpid())
+
+
+_task_started = {}
+
+
+@task_prerun.connect
+def record_task_start(task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def record_task_duration(task_id=None, task=None, state=None, **kwargs):
+    """Task run time by final state (SUCCESS, FAILURE, RETRY...)"""
+    started = _task_started.pop(task_id, None)
+    if started is not None and task is not None:
+        CELERY_TASK_DURATION.labels(task=task.name, state=state or "UNKNOWN").observe(time.perf_counter() - started)
+
+
 # Auto-discover tasks
 celery_app.autodiscover_tasks([
     'tasks'
@@ -0,0 +1,48 @@
+"""
+Distributed locks for tasks that must not overlap across workers
+Backed by the Celery Redis broker.
+"""
+from contextlib import contextmanager
+
+from config.settings import settings
+
+
+@contextmanager
+def distributed_lock(name: str, timeout: int = 600):
+    """
+    Try to take a Redis lock without waiting; yields True if it was acquired
+    The lock expires after `timeout` seconds so a dead worker cannot hold it forever.
+    If Redis is unreachable the caller proceeds unlocked rather than not at all.
+    """
+    lock = None
+    try:
+        import redis
+        client = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=2)
+        lock = client.lock(f"lock:{name}", timeout=timeout, blocking=False)
+        acquired = lock.acquire()
+    except Exception as e:
+        print(f"⚠️  Lock {name} unavailable, continuing without it: {str(e)[:80]}")
+        lock, acquired = None, True
+
+    try:
+        yield acquired
+    finally:
+        if lock is not None and acquired:
+            try:
+                lock.release()
+            except Exception:
+                pass  # Expired or Redis went away - the timeout frees it either way
+
+
+@contextmanager
+def distributed_slot(name: str, slots: int, timeout: int = 600):
+    """
+    Take one of `slots` locks named name:0..name:N-1; yields True if any was free
+    Caps how many copies of a task run at once across all workers.
+    """
+    for slot in range(max(slots, 1)):
+        with distributed_lock(f"{name}:{slot}", timeout=timeout) as acquired:
+            if acquired:
+                yield True
+                return
+    yield False
@@ -4,6 +4,7 @@ Runs every 5 minutes to detect and fix issues automatically
 """
 from tasks.celery_app import celery_app
 from agents.devops.autonomous_coordinator import AutonomousCoordinator
+from agents.devops.learning_engine import LearningEngine
 from datetime import datetime
 import json
 
@@ -33,6 +34,29 @@ def autonomous_health_check():
         }
 
 
+@celery_app.task(name='tasks.monitoring_tasks.validate_fix_task')
+def validate_fix_task(fix: dict, apply_result: dict):
+    """
+    Validate an applied fix
+    Scheduled by the coordinator with a countdown, so no worker sleeps while the system settles
+    """
+    try:
+        coordinator = AutonomousCoordinator()
+        validation = coordinator.validate_fix(fix, apply_result)
+
+        LearningEngine().record_fix_result(fix, apply_result, validation)
+
+        return validation
+
+    except Exception as e:
+        print(f"❌ Fix validation failed: {str(e)}\n")
+        return {
+            "status": "failed",
+            "error": str(e),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+
 def log_monitoring_report(report: dict):
     """Log monitoring report to file for review"""
     try:
@@ -95,6 +119,10 @@ def log_monitoring_report(report: dict):
                     f.write(f"\n   🎉 AUTONOMOUS FIXES APPLIED!\n")
                     f.write(f"   Check logs above for detailed fix information.\n")
 
+            elif status == "skipped":
+                f.write(f"⏭️  RESULT: Skipped\n")
+                f.write(f"   • {report.get('reason', 'Another healing run is in progress')}\n")
+
             elif status == "failed":
                 error = report.get("error", "Unknown error")
                 f.write(f"❌ RESULT: Health Check Failed\n")
@@ -1,16 +1,27 @@
 """
 Celery tasks for trend discovery
 """
+from celery.exceptions import MaxRetriesExceededError, SoftTimeLimitExceeded
+
 from tasks.celery_app import celery_app
 from models.database import SessionLocal, Product, ProductStatus
 from services.trend_discovery.trend_scanner import TrendScanner
+from services.trend_discovery import source_scheduler
+from services.trend_discovery.sources import SOURCE_REGISTRY, source_queue
+from monitoring.prometheus_metrics import SCANNER_SOURCE_ERRORS
+from tasks.locks import distributed_lock, distributed_slot
+
+
+DISPATCH_LOCK_TIMEOUT_SECONDS = 120
+HARD_TIME_LIMIT_GRACE_SECONDS = 30  # Soft limit lets the task clean up; the hard limit kills it
+SLOT_RETRY_SECONDS = 30  # Wait before retrying a scan whose source is at its concurrency limit
 
 
 @celery_app.task(name='tasks.trend_tasks.scan_trends_task')
 def scan_trends_task():
     """
-    Periodic task to scan all trend sources
-    Runs every hour by default
+    Scan all trend sources in one pass
+    Not scheduled - beat runs dispatch_due_sources_task, which scans each source on its own interval
     """
     db = SessionLocal()
     try:
@@ -34,28 +45,112 @@ def scan_trends_task():
         db.close()
 
 
-@celery_app.task(name='tasks.trend_tasks.scan_specific_source')
-def scan_specific_source_task(source_name: str):
-    """Scan a specific trend source"""
+def queue_source_scan(source_name: str):
+    """Send a source's scan to its own queue with its own time limit"""
+    plugin = SOURCE_REGISTRY[source_name]
+    return scan_specific_source_task.apply_async(
+        args=[source_name],
+        queue=source_queue(source_name),
+        soft_time_limit=plugin.timeout_seconds,
+        time_limit=plugin.timeout_seconds + HARD_TIME_LIMIT_GRACE_SECONDS
+    )
+
+
+@celery_app.task(name='tasks.trend_tasks.dispatch_due_sources_task')
+def dispatch_due_sources_task():
+    """
+    Queue a scan for every enabled trend source whose interval has elapsed
+    Runs every 5 minutes; intervals and backoff come from the trend_sources table
+    """
     db = SessionLocal()
     try:
-        scanner = TrendScanner()
-        # Implement source-specific scanning
-        return {"status": "completed", "source": source_name}
+        with distributed_lock("dispatch_due_sources", timeout=DISPATCH_LOCK_TIMEOUT_SECONDS) as acquired:
+            if not acquired:
+                return {"status": "skipped", "reason": "dispatch already running"}
+
+            source_scheduler.ensure_sources(db)
+
+            dispatched = []
+            for source in source_scheduler.due_sources(db):
+                source_scheduler.claim(db, source)
+                queue_source_scan(source.name)
+                dispatched.append(source.name)
+
+            if dispatched:
+                print(f"📡 Dispatched scans: {', '.join(dispatched)}")
+            return {"status": "completed", "dispatched": dispatched}
+
     except Exception as e:
         return {"status": "failed", "error": str(e)}
     finally:
         db.close()
 
 
+@celery_app.task(name='tasks.trend_tasks.scan_specific_source', bind=True)
+def scan_specific_source_task(self, source_name: str):
+    """
+    Fetch one trend source (runs in the source's own queue)
+    The collected products are handed to ingest_source_products_task, so this task
+    never touches the database and a failing source only affects itself.
+    A scan that finds the source at its concurrency limit is retried once a running
+    scan has had time to finish, instead of being dropped until the next dispatch.
+    """
+    plugin = SOURCE_REGISTRY.get(source_name)
+    if plugin is None:
+        return {"status": "failed", "source": source_name, "error": "unknown source"}
+
+    lock_timeout = plugin.timeout_seconds + HARD_TIME_LIMIT_GRACE_SECONDS
+    try:
+        with distributed_slot(f"scan_source:{source_name}", plugin.concurrency, timeout=lock_timeout) as acquired:
+            if acquired:
+                scanner = TrendScanner()
+                import asyncio
+                products = asyncio.run(scanner.collect_source(source_name))
+
+        if acquired:
+            ingest_source_products_task.delay(source_name, products)
+            return {"status": "collected", "source": source_name, "products": len(products)}
+
+    except SoftTimeLimitExceeded:
+        SCANNER_SOURCE_ERRORS.labels(source=source_name).inc()
+        print(f"⏱️  {source_name} scan exceeded {plugin.timeout_seconds}s, abandoned")
+        return {"status": "timeout", "source": source_name}
+    except Exception as e:
+        return {"status": "failed", "source": source_name, "error": str(e)}
+
+    # Outside the try: Retry is an Exception and must reach Celery. The retry keeps
+    # this request's queue and time limits; by the last attempt every slot holder has expired
+    try:
+        raise self.retry(countdown=SLOT_RETRY_SECONDS, max_retries=lock_timeout // SLOT_RETRY_SECONDS + 1)
+    except MaxRetriesExceededError:
+        return {"status": "skipped", "source": source_name, "reason": "concurrency limit reached"}
+
+
+@celery_app.task(name='tasks.trend_tasks.ingest_source_products')
+def ingest_source_products_task(source_name: str, products: list):
+    """Common ingest stage: filter and save a source's products, then update its schedule"""
+    db = SessionLocal()
+    try:
+        scanner = TrendScanner()
+        results = scanner.ingest_products(db, source_name, products)
+        source_scheduler.record_scan(db, source_name, results)
+        return {"status": "completed", **results}
+
+    except Exception as e:
+        return {"status": "failed", "source": source_name, "error": str(e)}
+    finally:
+        db.close()
+
+
 @celery_app.task(name='tasks.trend_tasks.perplexity_discovery_task')
 def perplexity_discovery_task(category: str = None):
     """
     Perplexity-powered trend discovery task
 
     This task:
-    1. Uses Perplexity to discover what's trending RIGHT NOW on the web
-    2. Extracts trending keywords and products
+    1. Uses Perplexity to discover what's trending RIGHT NOW on the web,
+       one concurrent request per configured category (or only `category`)
+    2. Extracts and deduplicates trending keywords and products
     3. Feeds intelligence back to the trend scanner (feedback loop)
     4. Stores discovered keywords in database for future use
 
@@ -72,8 +167,8 @@ def perplexity_discovery_task(category: str = None):
 
         discovery = PerplexityTrendDiscovery()
 
-        # Run async discovery
-        discovered = asyncio.run(discovery.discover_trending_products(category))
+        # Run async discovery - every configured category, or just the one asked for
+        discovered = asyncio.run(discovery.discover_categories([category] if category else None))
 
         # Feed intelligence back to system (feedback loop)
         keywords = discovery.update_trend_scanner_intel(db, discovered)
@@ -89,6 +184,7 @@ def perplexity_discovery_task(category: str = None):
             "status": "completed",
             "products_discovered": len(discovered.get('discovered_products', [])),
             "keywords_extracted": len(keywords),
+            "categories": discovered.get('shards', {}),
             "hot_categories": discovered.get('market_insights', {}).get('hot_categories', [])
         }
 
@@ -0,0 +1,7 @@
+"""
+Tests run from backend/ (python -m pytest tests); modules import as they do in the app
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,37 @@
+"""
+Spike detection of the windowed error-rate counters
+"""
+from datetime import datetime, timedelta
+
+from monitoring.error_rates import SPIKE_MIN_BASELINE_BUCKETS, ErrorRateTracker
+
+
+NOW = datetime(2025, 10, 1, 12, 0, 30)
+NOW_MINUTE = int((NOW - datetime(1970, 1, 1)).total_seconds() // 60)
+
+
+def _errors(error_type: str, minutes_ago: int, count: int):
+    timestamp = (NOW - timedelta(minutes=minutes_ago)).isoformat()
+    return [{"type": error_type, "source": "celery", "timestamp": timestamp}] * count
+
+
+def _burst():
+    return [error for minute in range(5) for error in _errors("KeyError", minute, 4)]
+
+
+def test_cold_start_burst_is_not_a_spike():
+    # Fresh tracker (e.g. a restarted worker): the first busy minutes have nothing to compare against
+    tracker = ErrorRateTracker()
+    tracker.record(_burst())
+    assert tracker.rates("KeyError", "celery", NOW_MINUTE)["last_5_minutes"] == 20
+    assert tracker.detect_spikes(NOW_MINUTE) == []
+
+
+def test_burst_over_a_populated_baseline_is_a_spike():
+    tracker = ErrorRateTracker()
+    for minute in range(10, 10 + SPIKE_MIN_BASELINE_BUCKETS):
+        tracker.record(_errors("TimeoutError", minute, 1))
+    tracker.record(_burst())
+
+    spikes = tracker.detect_spikes(NOW_MINUTE)
+    assert [(s["error_type"], s["source"]) for s in spikes] == [("KeyError", "celery")]
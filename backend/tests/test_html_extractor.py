@@ -0,0 +1,32 @@
+"""
+Selector-driven extraction against the saved best-seller page
+"""
+import os
+
+import pytest
+
+pytest.importorskip("bs4")
+
+from services.trend_discovery.benchmark_extractors import DEFAULT_FIXTURES, legacy_extract, agrees  # noqa: E402
+from services.trend_discovery.html_extractor import get_extractor  # noqa: E402
+
+
+@pytest.fixture
+def beauty_page():
+    with open(os.path.join(DEFAULT_FIXTURES, "amazon_beauty.html"), "rb") as f:
+        return f.read()
+
+
+def test_fixture_cards_have_title_image_and_price(beauty_page):
+    rows = get_extractor("amazon_best_sellers").extract(beauty_page)
+    assert len(rows) == 5
+    for row in rows:
+        assert row["title"]
+        assert row["image_url"].startswith("https://")
+        assert row["price_text"].startswith("$")
+
+
+def test_matches_legacy_extractor(beauty_page):
+    new, old = get_extractor("amazon_best_sellers").extract(beauty_page), legacy_extract(beauty_page)
+    assert len(new) == len(old)
+    assert all(map(agrees, new, old))
@@ -0,0 +1,69 @@
+"""
+Probe snapshots stay within the shared deadline however slow a probe is
+"""
+import threading
+import time
+
+import pytest
+
+from monitoring.probes import PROBE_DEADLINE_SECONDS, ProbeRunner
+
+
+SLACK_SECONDS = 0.3  # Thread scheduling on a loaded CI box
+
+
+def test_slow_probe_returns_pending_then_stale():
+    runner = ProbeRunner(ttl_seconds=0)
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return {"status": "healthy", "total": 3}
+
+    probes = {"fast": lambda: {"status": "healthy"}, "slow": slow}
+
+    start = time.monotonic()
+    results = runner.run(probes)
+    assert time.monotonic() - start < PROBE_DEADLINE_SECONDS + SLACK_SECONDS
+    assert results["fast"] == {"status": "healthy"}
+    assert results["slow"]["status"] == "unknown" and results["slow"]["pending"]
+
+    release.set()
+    for _ in range(50):
+        if "slow" in runner._results:
+            break
+        time.sleep(0.02)
+
+    # Cache expired (ttl 0), probe now hangs again: the last result comes back marked stale
+    release.clear()
+    start = time.monotonic()
+    results = runner.run(probes)
+    assert time.monotonic() - start < PROBE_DEADLINE_SECONDS + SLACK_SECONDS
+    assert results["slow"] == {"status": "healthy", "total": 3, "stale": True}
+    release.set()
+
+
+def test_slow_docker_probe_does_not_delay_check_all(monkeypatch):
+    health_checker = pytest.importorskip("monitoring.health_checker")  # Needs the app's settings and DB drivers
+    HealthChecker = health_checker.HealthChecker
+
+    release = threading.Event()
+
+    def slow_docker(self):
+        release.wait(5)
+        return {"status": "healthy", "containers": {}, "total": 0}
+
+    monkeypatch.setattr(health_checker, "probe_runner", ProbeRunner())
+    monkeypatch.setattr(HealthChecker, "check_database", lambda self: {"status": "healthy"})
+    monkeypatch.setattr(HealthChecker, "check_redis", lambda self: {"status": "healthy"})
+    monkeypatch.setattr(HealthChecker, "check_endpoint", lambda self, endpoint: {"status": "healthy"})
+    monkeypatch.setattr(HealthChecker, "check_docker_containers", slow_docker)
+
+    try:
+        start = time.monotonic()
+        results = HealthChecker().check_all()
+        assert time.monotonic() - start < PROBE_DEADLINE_SECONDS + SLACK_SECONDS
+        assert results["checks"]["docker"]["pending"]
+        assert results["checks"]["database"]["status"] == "healthy"
+    finally:
+        release.set()
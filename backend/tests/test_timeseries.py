@@ -0,0 +1,38 @@
+"""
+Per-series files of the metrics time-series store
+"""
+import os
+
+from monitoring.timeseries import MetricsTimeSeries
+
+
+def _snapshot(store: MetricsTimeSeries, name: str):
+    path = store._path(name)
+    with open(path, "rb") as f:
+        return os.stat(path).st_mtime_ns, f.read()
+
+
+def test_recording_one_series_leaves_the_others_untouched(tmp_path):
+    store = MetricsTimeSeries(state_dir=str(tmp_path))
+    now = 1_700_000_000.0
+    store.record({"system": {"cpu_percent": 10.0, "memory_percent": 40.0}}, timestamp=now)
+    before = _snapshot(store, "system.memory_percent")
+
+    store.record({"system": {"cpu_percent": 30.0}}, timestamp=now + 30)
+
+    assert _snapshot(store, "system.memory_percent") == before
+    assert store.names() == ["system.cpu_percent", "system.memory_percent"]
+
+
+def test_query_reads_aggregated_buckets(tmp_path):
+    store = MetricsTimeSeries(state_dir=str(tmp_path))
+    start = 1_700_000_040.0  # Start of a minute
+    for offset, value in ((0, 10.0), (30, 30.0), (60, 50.0)):
+        store.record({"docker": {"product-trend-celery": {"cpu_percent": str(value)}}}, timestamp=start + offset)
+
+    result = store.query("docker.product-trend-celery.cpu_percent", minutes=5, end=start + 90)
+    assert result["resolution"] == "1m"
+    assert [(p["avg"], p["min"], p["max"], p["count"]) for p in result["points"]] == [
+        (20.0, 10.0, 30.0, 2), (50.0, 50.0, 50.0, 1)
+    ]
+    assert MetricsTimeSeries(state_dir=str(tmp_path)).query("missing")["points"] == []